@@ -0,0 +1,94 @@
+import copy
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from pptx import Presentation
+
+from backend.config import BASE_DECK_CACHE_SIZE
+from backend.format_ppt import DEFAULT_USER_PREFERENCES, apply_formatting
+
+# ---------------------- 🗂️ BASE DECK CACHE ----------------------
+# `Presentation()` unzips and parses the whole template package, and applying the deck theme
+# rewrites every master and layout; both are the same for every deck with the same template and
+# theme. Prepared decks are parsed once and kept pristine; each request gets a deep copy.
+# Copying the parsed objects is what makes this cheap: re-parsing in-memory .pptx bytes costs
+# about as much as reading the file again.
+
+
+def theme_key(preferences):
+    """The preferences that shape the deck theme (what `apply_formatting` writes into the masters)."""
+    preferences = preferences or DEFAULT_USER_PREFERENCES
+    return (
+        preferences.get("font_choice", "Arial"),
+        str(preferences.get("header_color", DEFAULT_USER_PREFERENCES["header_color"])),
+        str(preferences.get("primary_color", DEFAULT_USER_PREFERENCES["primary_color"])),
+    )
+
+
+class BaseDeckCache:
+    """
+    Pristine prepared decks, handed out as isolated deep copies.
+    - Keyed by template file (path, mtime, size; None = python-pptx default) and theme, so an
+      edited template is picked up on its next use.
+    - LRU-bounded to `max_entries` (0 disables caching). Each render process has its own cache.
+    - The pristine decks are never modified, so copies can be taken from several threads.
+    """
+
+    def __init__(self, max_entries=BASE_DECK_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def presentation(self, template_path=None, preferences=None, themed=True):
+        """A new, independent deck from the template (with the deck theme applied if `themed`)."""
+        key = (_template_key(template_path), theme_key(preferences) if themed else None)
+        with self._lock:
+            pristine = self._entries.get(key)
+            if pristine is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if pristine is None:
+            pristine = _prepare(template_path, preferences, themed)
+            if self.max_entries <= 0:
+                return pristine  # Nothing keeps it, so it's already the caller's own copy.
+            with self._lock:
+                self._entries[key] = pristine
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return copy.deepcopy(pristine)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _template_key(template_path):
+    if template_path is None:
+        return None
+    stat = os.stat(template_path)
+    return (os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _prepare(template_path, preferences, themed):
+    prs = Presentation(template_path)
+    if not themed:
+        return prs
+    apply_formatting(prs, preferences, slides=[])  # theme & master background only
+    # Reload the themed deck: python-pptx caches proxy objects (fills, ...) on first access and
+    # those can't be deep-copied; a freshly loaded deck holds only parts and XML.
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return Presentation(buffer)
+
+
+base_decks = BaseDeckCache()
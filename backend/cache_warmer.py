@@ -0,0 +1,179 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from backend.config import (
+    MAX_SLIDES,
+    WARM_INTERVAL_HOURS,
+    WARM_LOOKBACK_DAYS,
+    WARM_MAX_LLM_CALLS,
+    WARM_MAX_TOKENS,
+    WARM_ON_STARTUP,
+    WARM_TOP_REQUESTS,
+)
+from backend.db_handler import retrieve_top_feedback_topics, retrieve_top_requests
+from backend.fair_scheduler import BULK, scheduled_job
+from backend.generation_cache import WARMER
+from backend.llm_usage import usage_tracker
+from backend.request_context import start_request
+from backend.retry import RetryBudget
+
+
+WARMER_TENANT = "cache-warmer"
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+# ---------------------- 🔥 CACHE WARMING ----------------------
+class CacheWarmer:
+    """
+    Generates the titles, enrichment and slides of the most requested decks into the
+    generation cache ahead of time, so the first request after a deploy is served warm
+    (each warmed entry serves one request; the next run replenishes it).
+    - Candidates: the most frequent request briefs in `user_preferences`, topped up with the
+      most generated topics in `ai_feedback` (with the default brief).
+    - One LLM call at a time, scheduled as bulk work of its own tenant, so a run never takes
+      much capacity from live traffic; stages that are already cached cost nothing.
+    - Budget: a run stops before the next stage once it used `max_llm_calls` calls or `max_tokens` tokens.
+    - A deck whose titles call failed (retries spent) is skipped: a live request would fall back to
+      generic titles, which are never cached, so slides warmed for them would never be served.
+    `stages` are the cached stage functions of the API: titles(topic, num_slides, retry_budget, source),
+    enrichment(topic, audience, duration, purpose, num_slides, retry_budget, source) and
+    slide(index, title, outline, num_slides, retry_budget, source).
+    """
+
+    def __init__(self, cache, stages, defaults, top_requests=WARM_TOP_REQUESTS, lookback_days=WARM_LOOKBACK_DAYS,
+                 max_llm_calls=WARM_MAX_LLM_CALLS, max_tokens=WARM_MAX_TOKENS, interval_hours=WARM_INTERVAL_HOURS,
+                 on_startup=WARM_ON_STARTUP):
+        self.cache = cache
+        self.stages = stages
+        self.defaults = defaults
+        self.top_requests = top_requests
+        self.lookback_days = lookback_days
+        self.max_llm_calls = max_llm_calls
+        self.max_tokens = max_tokens
+        self.interval_hours = interval_hours
+        self.on_startup = on_startup
+        self.runs = 0
+        self.last_report = None
+        self._running = threading.Lock()
+        self._stopped = threading.Event()
+        self._scheduler = None
+
+    def candidates(self):
+        """Request briefs to warm, most requested first."""
+        specs = retrieve_top_requests(self.top_requests, self.lookback_days)
+        known_topics = {spec["topic"] for spec in specs}
+        for topic in retrieve_top_feedback_topics(self.top_requests, self.lookback_days):
+            if topic["topic"] not in known_topics:
+                specs.append({**self.defaults, **topic})
+        specs = [spec for spec in specs if spec["topic"].strip() and 1 <= spec["num_slides"] <= MAX_SLIDES]
+        return sorted(specs, key=lambda spec: spec["requests"], reverse=True)[:self.top_requests]
+
+    def run(self):
+        """Runs one warming pass (skipped if one is already running); returns its report."""
+        if not self._running.acquire(blocking=False):
+            return {"skipped": "a warming run is already in progress"}
+        try:
+            with scheduled_job(WARMER_TENANT, BULK):
+                return self._run()
+        finally:
+            self._running.release()
+
+    def run_in_background(self):
+        """Starts a warming pass on its own thread; returns False if one is already running."""
+        if self._running.locked():
+            return False
+        threading.Thread(target=self.run, name="cache-warmer-run", daemon=True).start()
+        return True
+
+    def _run(self):
+        request_id = start_request()  # LLM usage of the run is accounted under its own ID
+        start = time.perf_counter()
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "pruned_entries": self.cache.prune(),
+            "decks": [],
+            "budget_exhausted": False,
+        }
+        retry_budget = RetryBudget()
+        try:
+            for spec in self.candidates():
+                calls_before = usage_tracker.summary(request_id)["calls"]
+                deck = {"topic": spec["topic"], "num_slides": spec["num_slides"], "requests": spec["requests"]}
+                report["decks"].append(deck)
+                try:
+                    deck["complete"] = self._warm_deck(spec, request_id, retry_budget)
+                    if not deck["complete"]:
+                        deck["skipped"] = "titles call failed"
+                finally:
+                    deck["llm_calls"] = usage_tracker.summary(request_id)["calls"] - calls_before
+        except _BudgetExhausted:
+            report["budget_exhausted"] = True
+        except Exception as e:
+            report["error"] = f"{type(e).__name__}: {str(e)}"
+            print(f"⚠️ Cache warming stopped: {report['error']}")
+
+        usage = usage_tracker.pop_summary(request_id)
+        report.update({
+            "llm_calls": usage["calls"],
+            "tokens": usage["prompt_tokens"] + usage["completion_tokens"],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+        self.runs += 1
+        self.last_report = report
+        print(f"🔥 Cache warming: {len(report['decks'])} deck(s), {report['llm_calls']} LLM calls, "
+              f"{report['tokens']} tokens{' (budget exhausted)' if report['budget_exhausted'] else ''}")
+        return report
+
+    def _warm_deck(self, spec, request_id, retry_budget):
+        """Warms titles, enrichment and every slide of one deck; returns False if it was skipped."""
+        topic, num_slides = spec["topic"], spec["num_slides"]
+        self._check_budget(request_id)
+        try:
+            titles = self.stages["titles"](topic, num_slides, retry_budget, WARMER)
+        except Exception as e:
+            print(f"⚠️ Cache warming skipped '{topic}': titles call failed ({str(e)})")
+            return False
+        self._check_budget(request_id)
+        outline = self.stages["enrichment"](
+            topic, spec["audience"], spec["duration"], spec["purpose"], num_slides, retry_budget, WARMER
+        )
+        for i in range(num_slides):
+            self._check_budget(request_id)
+            self.stages["slide"](i, titles[i], outline, num_slides, retry_budget, WARMER)
+        return True
+
+    def _check_budget(self, request_id):
+        used = usage_tracker.summary(request_id)
+        if used["calls"] >= self.max_llm_calls or used["prompt_tokens"] + used["completion_tokens"] >= self.max_tokens:
+            raise _BudgetExhausted()
+
+    # ---------------------- ⏰ SCHEDULE ----------------------
+    def start(self):
+        """Starts the background schedule: a run at startup and/or every `interval_hours`."""
+        if self._scheduler is None and (self.on_startup or self.interval_hours > 0):
+            self._stopped.clear()
+            self._scheduler = threading.Thread(target=self._run_scheduled, name="cache-warmer", daemon=True)
+            self._scheduler.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run_scheduled(self):
+        if self.on_startup:
+            self.run()
+        while self.interval_hours > 0 and not self._stopped.wait(self.interval_hours * 3600):
+            self.run()
+        self._scheduler = None
+
+    def metrics(self):
+        """The last run's report and the hit rate live requests get from the cache."""
+        return {
+            "runs": self.runs,
+            "running": self._running.locked(),
+            "last_run": self.last_report,
+            "cache": self.cache.metrics(),
+        }
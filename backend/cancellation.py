@@ -0,0 +1,182 @@
+import contextvars
+import threading
+import time
+
+# ---------------------- 🛑 CANCELLATION & DEADLINES ----------------------
+# The cancellation scope of the work being done. Pipeline stages copy the caller's context into
+# their worker threads, so every stage can check it before starting an LLM call or a render, and
+# LLM calls in flight poll it to abort.
+current_cancellation = contextvars.ContextVar("current_cancellation", default=None)
+
+CLIENT_DISCONNECTED = "client disconnected"
+DEADLINE_EXCEEDED = "deadline exceeded"
+PIPELINE_FAILED = "pipeline failed"
+
+
+class RequestCancelled(Exception):
+    """Raised inside the pipeline once nobody is waiting for its result any more."""
+
+    def __init__(self, reason):
+        super().__init__(f"Request cancelled: {reason}")
+        self.reason = reason
+
+
+class CancelToken:
+    """
+    Cancellation signal of one client request: cancelled explicitly (e.g. the client
+    disconnected) or implicitly once its deadline passes.
+    """
+
+    def __init__(self, timeout_s=None):
+        self.deadline = time.monotonic() + timeout_s if timeout_s else None
+        self._reason = None
+
+    def cancel(self, reason=CLIENT_DISCONNECTED):
+        if self._reason is None:
+            self._reason = reason
+
+    @property
+    def reason(self):
+        if self._reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self._reason = DEADLINE_EXCEEDED
+        return self._reason
+
+    def remaining(self):
+        """Seconds until the deadline (None without one)."""
+        return None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_cancelled(self):
+        reason = self.reason
+        if reason is not None:
+            raise RequestCancelled(reason)
+
+
+class SharedCancellation:
+    """
+    Cancellation of work shared by several client requests (a coalesced generation): it is
+    cancelled only once every attached client token is cancelled, so one client leaving never
+    throws away a deck others are still waiting for.
+    """
+
+    def __init__(self):
+        self._tokens = []
+        self._lock = threading.Lock()
+
+    def attach(self, token):
+        with self._lock:
+            self._tokens.append(token)
+
+    @property
+    def reason(self):
+        with self._lock:
+            tokens = list(self._tokens)
+        reasons = [token.reason for token in tokens]
+        if not tokens or not all(reasons):
+            return None
+        # Deadline wins if any waiter hit it: the work itself took too long.
+        return DEADLINE_EXCEEDED if DEADLINE_EXCEEDED in reasons else reasons[0]
+
+    def remaining(self):
+        """Seconds until the last live client's deadline (None if any client has none)."""
+        with self._lock:
+            tokens = [token for token in self._tokens if token.reason is None]
+        remaining = [token.remaining() for token in tokens]
+        if not remaining or None in remaining:
+            return None
+        return max(remaining)
+
+    def raise_if_cancelled(self):
+        reason = self.reason
+        if reason is not None:
+            raise RequestCancelled(reason)
+
+
+class PipelineCancellation:
+    """
+    Cancellation of one pipeline run: cancelled with the caller's scope (`parent`), or on its own
+    once another stage of the run failed, so stages still running stop instead of spending LLM
+    budget on a result nobody will use.
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self._reason = None
+
+    def cancel(self, reason=PIPELINE_FAILED):
+        if self._reason is None:
+            self._reason = reason
+
+    @property
+    def reason(self):
+        parent_reason = self.parent.reason if self.parent is not None else None
+        return parent_reason or self._reason
+
+    def remaining(self):
+        return None if self.parent is None else self.parent.remaining()
+
+    def raise_if_cancelled(self):
+        reason = self.reason
+        if reason is not None:
+            raise RequestCancelled(reason)
+
+
+def check_cancelled(skipped=None):
+    """
+    Raises RequestCancelled if the current work was cancelled; `skipped` names the
+    cancellation counter of the work that is skipped because of it.
+    """
+    scope = current_cancellation.get()
+    if scope is not None and scope.reason is not None:
+        if skipped:
+            cancellation_stats.record(skipped)
+        scope.raise_if_cancelled()
+
+
+def remaining_time():
+    """Seconds left for the current work (None without a deadline)."""
+    scope = current_cancellation.get()
+    return None if scope is None else scope.remaining()
+
+
+def cancellable_sleep(seconds, step_s=0.1):
+    """`time.sleep` that stops early (raising RequestCancelled) once the current work is cancelled."""
+    end = time.monotonic() + seconds
+    while True:
+        check_cancelled()
+        left = end - time.monotonic()
+        if left <= 0:
+            return
+        time.sleep(min(step_s, left))
+
+
+# ---------------------- 📊 CANCELLATION METRICS ----------------------
+class CancellationStats:
+    """Counts cancelled requests and the work that was skipped or cut short because of them."""
+
+    def __init__(self):
+        self._counts = {
+            "requests_cancelled": 0,
+            "client_disconnects": 0,
+            "deadlines_exceeded": 0,
+            "llm_calls_skipped": 0,
+            "llm_calls_aborted": 0,
+            "renders_skipped": 0,
+            "stages_checkpointed": 0,
+        }
+        self._lock = threading.Lock()
+
+    def record(self, counter, amount=1):
+        with self._lock:
+            self._counts[counter] += amount
+
+    def record_cancelled(self, reason):
+        with self._lock:
+            self._counts["requests_cancelled"] += 1
+            self._counts["deadlines_exceeded" if reason == DEADLINE_EXCEEDED else "client_disconnects"] += 1
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+cancellation_stats = CancellationStats()
@@ -0,0 +1,41 @@
+import threading
+
+from backend.config import CHECKPOINT_TTL_HOURS
+from backend.db_handler import delete_checkpoint, retrieve_checkpoint, store_checkpoint_item
+
+
+# ---------------------- 💾 GENERATION CHECKPOINT ----------------------
+class GenerationCheckpoint:
+    """
+    Slide-level checkpoint of one generation, keyed by the canonical request hash.
+    - Every finished stage (titles, enrichment, each slide) is persisted as soon as it completes.
+    - A failed or interrupted request that is submitted again resumes from what was saved,
+      so only the missing stages are paid for.
+    - The checkpoint is cleared once the deck has been saved.
+    """
+
+    def __init__(self, request_hash, max_age_hours=CHECKPOINT_TTL_HOURS):
+        self.request_hash = request_hash
+        self.saved = retrieve_checkpoint(request_hash, max_age_hours)
+        self.stored = 0  # stages finished (and saved) by this run
+        self._lock = threading.Lock()
+
+    def get(self, item):
+        return self.saved.get(item)
+
+    def resumed_items(self):
+        return sorted(self.saved)
+
+    def run(self, item, func):
+        """Returns the checkpointed result of `item`, or computes and checkpoints it."""
+        if item in self.saved:
+            return self.saved[item]
+        result = func()
+        store_checkpoint_item(self.request_hash, item, result)
+        with self._lock:
+            self.stored += 1
+        return result
+
+    def clear(self):
+        delete_checkpoint(self.request_hash)
+        self.saved = {}
@@ -0,0 +1,151 @@
+import os
+from pathlib import Path
+
+# ---------------------- ⚙️ PIPELINE CONFIGURATION ----------------------
+# Maximum number of pipeline stages (mostly LLM calls) a single request runs at once.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Worker processes that build, format and serialize decks (CPU-bound python-pptx work).
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 1)))
+
+# LLM usage rows are buffered and written to SQLite in batches of this size...
+USAGE_FLUSH_BATCH = int(os.getenv("USAGE_FLUSH_BATCH", "50"))
+# ...or at least this often (seconds), whichever comes first.
+USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", "5"))
+
+# Deflate level (0-9) used when writing generated decks.
+PPTX_COMPRESSION_LEVEL = int(os.getenv("PPTX_COMPRESSION_LEVEL", "9"))
+
+# Attempts per slide call (first try included) before a slide is reported as failed.
+SLIDE_MAX_ATTEMPTS = int(os.getenv("SLIDE_MAX_ATTEMPTS", "3"))
+# Extra LLM calls a single request may spend on retries, across all of its slides.
+SLIDE_RETRY_BUDGET = int(os.getenv("SLIDE_RETRY_BUDGET", "5"))
+# Checkpoints of failed/interrupted generations older than this are not resumed.
+CHECKPOINT_TTL_HOURS = float(os.getenv("CHECKPOINT_TTL_HOURS", "24"))
+
+# Model used by each LLM stage; MODEL_<STAGE> (e.g. MODEL_TITLES) overrides a single stage.
+STAGE_MODELS = {
+    stage: os.getenv(f"MODEL_{stage.upper()}", default)
+    for stage, default in {
+        "titles": "gpt-4o-mini",
+        "enrichment": "gpt-4o",
+        "slide": "gpt-4o",
+        "slide_revision": "gpt-4o",
+    }.items()
+}
+# Median latency (ms) a stage's model should stay under; LATENCY_TARGET_<STAGE>_MS overrides one.
+STAGE_LATENCY_TARGETS_MS = {
+    stage: float(os.getenv(f"LATENCY_TARGET_{stage.upper()}_MS", default))
+    for stage, default in {
+        "titles": "4000",
+        "enrichment": "20000",
+        "slide": "10000",
+        "slide_revision": "10000",
+    }.items()
+}
+# Faster model a stage is routed to while its own model misses the latency target.
+FALLBACK_MODEL = os.getenv("FALLBACK_MODEL", "gpt-4o-mini")
+# Recent calls per stage & model used to judge latency.
+ROUTING_WINDOW = int(os.getenv("ROUTING_WINDOW", "20"))
+# While falling back, every Nth call still goes to the stage's own model to notice recovery.
+ROUTING_PROBE_EVERY = int(os.getenv("ROUTING_PROBE_EVERY", "10"))
+
+# LLM provider: "openai", "local" (deterministic, offline), "record" (OpenAI + save to disk)
+# or "replay" (serve saved responses only).
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+# Where the record/replay provider keeps its responses.
+LLM_RECORDINGS_DIR = Path(os.getenv("LLM_RECORDINGS_DIR", Path(__file__).resolve().parents[1] / "llm_recordings"))
+# Simulated base latency (ms) and generation speed of the local provider.
+LOCAL_LLM_LATENCY_MS = float(os.getenv("LOCAL_LLM_LATENCY_MS", "300"))
+LOCAL_LLM_TOKENS_PER_SECOND = float(os.getenv("LOCAL_LLM_TOKENS_PER_SECOND", "80"))
+
+# Generated decks are written here.
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", Path(__file__).resolve().parents[1] / "output"))
+
+# Slide thumbnails: cache directory (one folder per deck content hash), render width in pixels,
+# background render workers and the time limit for one deck conversion (seconds).
+THUMBNAIL_CACHE_DIR = Path(os.getenv("THUMBNAIL_CACHE_DIR", OUTPUT_DIR / "thumbnails"))
+THUMBNAIL_WIDTH = int(os.getenv("THUMBNAIL_WIDTH", "480"))
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "1"))
+THUMBNAIL_TIMEOUT_SECONDS = float(os.getenv("THUMBNAIL_TIMEOUT_SECONDS", "120"))
+# A deck whose render failed is retried on lookup after this back-off (doubling per consecutive
+# failure, at most THUMBNAIL_RETRY_MAX_SECONDS), so transient office crashes or timeouts recover.
+THUMBNAIL_RETRY_SECONDS = float(os.getenv("THUMBNAIL_RETRY_SECONDS", "60"))
+THUMBNAIL_RETRY_MAX_SECONDS = float(os.getenv("THUMBNAIL_RETRY_MAX_SECONDS", "3600"))
+# Headless office binary used to convert decks to PDF (looked up on PATH).
+SOFFICE_BINARY = os.getenv("SOFFICE_BINARY", "soffice")
+
+# Regular decks are generated in one shot up to this many slides...
+MAX_SLIDES = int(os.getenv("MAX_SLIDES", "20"))
+# ...larger ones need `large_deck` mode, which streams slides into the renderer section by section.
+LARGE_DECK_MAX_SLIDES = int(os.getenv("LARGE_DECK_MAX_SLIDES", "500"))
+# Slides per section (titles and the slide brief are generated per section).
+LARGE_DECK_SECTION_SIZE = int(os.getenv("LARGE_DECK_SECTION_SIZE", "10"))
+# Slides generated but not yet rendered, at most; bounds memory and keeps the renderer fed.
+LARGE_DECK_WINDOW = int(os.getenv("LARGE_DECK_WINDOW", str(2 * LLM_MAX_CONCURRENCY)))
+
+# SQLite database file (feedback, preferences, usage, checkpoints, generation cache).
+DATABASE_PATH = Path(os.getenv("DATABASE_PATH", Path(__file__).resolve().parents[1] / "database" / "feedback.db"))
+# Pooled SQLite connections (and DB threads for async callers); SQLite allows one writer at a time,
+# so a few connections cover concurrent reads without piling up lock waits.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+# How long a writer waits for SQLite's lock before failing (ms).
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+
+# Opt-in request profiling (`X-Profile: 1` header or `?profile=1`): fraction of opted-in requests
+# that are actually profiled (0 disables profiling), where profiles are written, and how many are kept.
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILES_DIR = Path(os.getenv("PROFILES_DIR", Path(__file__).resolve().parents[1] / "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+
+# Trace spans are exported as "jsonl" (appended to TRACE_FILE), "otlp" (OTLP/HTTP JSON, accepted by any
+# OpenTelemetry collector at OTLP_TRACES_ENDPOINT) or not at all ("none"); buffered and flushed this often.
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")
+TRACE_FILE = Path(os.getenv("TRACE_FILE", Path(__file__).resolve().parents[1] / "traces" / "spans.jsonl"))
+OTLP_TRACES_ENDPOINT = os.getenv("OTLP_TRACES_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "ai-presentation-generator")
+TRACE_FLUSH_SECONDS = float(os.getenv("TRACE_FLUSH_SECONDS", "2"))
+
+# Time a generation may take before it is cancelled (seconds); clients may ask for less with an
+# `X-Request-Timeout` header. Large decks have their own, longer limit.
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "600"))
+LARGE_DECK_DEADLINE_SECONDS = float(os.getenv("LARGE_DECK_DEADLINE_SECONDS", "3600"))
+# How often a waiting request checks whether its client is still connected (seconds).
+DISCONNECT_POLL_SECONDS = float(os.getenv("DISCONNECT_POLL_SECONDS", "0.5"))
+
+# Prepared base decks (parsed template + deck theme) kept per render process, keyed by template
+# and theme; each new deck is a deep copy of one instead of a fresh parse. 0 disables the cache.
+BASE_DECK_CACHE_SIZE = int(os.getenv("BASE_DECK_CACHE_SIZE", "16"))
+
+# Generated decks (in OUTPUT_DIR): removed this long after their last download (or creation), and beyond
+# the size quota least recently downloaded first; checked in the background this often. 0 disables TTL / quota.
+OUTPUT_TTL_HOURS = float(os.getenv("OUTPUT_TTL_HOURS", "72"))
+OUTPUT_QUOTA_MB = float(os.getenv("OUTPUT_QUOTA_MB", "1024"))
+OUTPUT_SWEEP_SECONDS = float(os.getenv("OUTPUT_SWEEP_SECONDS", "300"))
+
+# Reusable LLM stage outputs (titles, enrichment, slides) keyed by their exact inputs. Warmed entries live
+# GENERATION_CACHE_TTL_HOURS and serve one request each; outputs of live requests are only reused for
+# GENERATION_CACHE_LIVE_TTL_HOURS (0 = never, so an identical brief gets a fresh deck). 0 disables the cache.
+GENERATION_CACHE_TTL_HOURS = float(os.getenv("GENERATION_CACHE_TTL_HOURS", "168"))
+GENERATION_CACHE_LIVE_TTL_HOURS = float(os.getenv("GENERATION_CACHE_LIVE_TTL_HOURS", "0"))
+# Cache warming: the most requested decks of the last WARM_LOOKBACK_DAYS are generated into the cache at
+# startup (WARM_ON_STARTUP, on by default) and every WARM_INTERVAL_HOURS (0 = never), within a per-run LLM budget.
+WARM_ON_STARTUP = os.getenv("WARM_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+WARM_INTERVAL_HOURS = float(os.getenv("WARM_INTERVAL_HOURS", "0"))
+WARM_TOP_REQUESTS = int(os.getenv("WARM_TOP_REQUESTS", "5"))
+WARM_LOOKBACK_DAYS = int(os.getenv("WARM_LOOKBACK_DAYS", "30"))
+WARM_MAX_LLM_CALLS = int(os.getenv("WARM_MAX_LLM_CALLS", "100"))
+WARM_MAX_TOKENS = int(os.getenv("WARM_MAX_TOKENS", "200000"))
+
+# Fair scheduling of LLM calls across tenants (the client address; `X-Tenant-ID` is only honoured from
+# SCHEDULER_TRUSTED_PROXIES, comma-separated addresses or networks such as the frontend host): at most
+# SCHEDULER_MAX_IN_FLIGHT calls in total and SCHEDULER_TENANT_MAX_IN_FLIGHT per tenant; free slots go to
+# the tenant furthest behind its weighted share (weights as "tenant=weight,..."; default 1).
+SCHEDULER_MAX_IN_FLIGHT = int(os.getenv("SCHEDULER_MAX_IN_FLIGHT", str(2 * LLM_MAX_CONCURRENCY)))
+SCHEDULER_TENANT_MAX_IN_FLIGHT = int(os.getenv("SCHEDULER_TENANT_MAX_IN_FLIGHT", str(LLM_MAX_CONCURRENCY)))
+SCHEDULER_TENANT_WEIGHTS = os.getenv("SCHEDULER_TENANT_WEIGHTS", "")
+SCHEDULER_TRUSTED_PROXIES = os.getenv("SCHEDULER_TRUSTED_PROXIES", "")
+# Decks up to this many slides are interactive and served before bulk ones; bulk work waiting longer
+# than SCHEDULER_BULK_PROMOTE_SECONDS is treated as interactive, so it is never starved.
+SCHEDULER_INTERACTIVE_MAX_SLIDES = int(os.getenv("SCHEDULER_INTERACTIVE_MAX_SLIDES", "10"))
+SCHEDULER_BULK_PROMOTE_SECONDS = float(os.getenv("SCHEDULER_BULK_PROMOTE_SECONDS", "30"))
@@ -1,116 +1,192 @@
-import sqlite3
-from pathlib import Path
+import json
+
+from backend.config import DATABASE_PATH, DB_BUSY_TIMEOUT_MS, DB_POOL_SIZE
+from backend.tracing import traced
+from database.db_connector import DEFAULT_PRAGMAS, Database
 
 # ---------------------- 📂 DATABASE CONFIGURATION ----------------------
-BASE_DIR = Path(__file__).resolve().parents[1]
-DB_PATH = BASE_DIR / "database" / "feedback.db"
+DB_PATH = DATABASE_PATH
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure DB directory exists
 
+# ✅ Shared connection pool: every query below borrows a long-lived, tuned connection
+# (async callers use `await db.run_async(func, ...)` to keep the event loop free).
+db = Database(DB_PATH, pool_size=DB_POOL_SIZE, pragmas={**DEFAULT_PRAGMAS, "busy_timeout": DB_BUSY_TIMEOUT_MS})
+
 # ---------------------- 🏗️ DATABASE INITIALIZATION ----------------------
 def initialize_db():
     """
     Creates necessary tables for storing AI feedback if they do not exist.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # ✅ Stores AI-generated content for each slide (for reuse & improvements)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ai_feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            slide_number INTEGER NOT NULL,
-            feedback TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # ✅ Stores **user preferences & past requests**
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS user_preferences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            num_slides INTEGER NOT NULL,
-            font_choice TEXT DEFAULT 'Arial',
-            color_scheme TEXT DEFAULT '#000000',
-            bullet_style TEXT DEFAULT 'Dots',
-            header_color TEXT DEFAULT '#00008B',
-            body_font_size INTEGER DEFAULT 22,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # ✅ Stores **user feedback to improve AI**
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS user_feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            feedback TEXT NOT NULL,
-            weightage INTEGER DEFAULT 1,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    conn.commit()
-    conn.close()
+    with db.connection() as conn:
+        cursor = conn.cursor()
+
+        # ✅ Stores AI-generated content for each slide (for reuse & improvements)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic TEXT NOT NULL,
+                slide_number INTEGER NOT NULL,
+                feedback TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # ✅ Stores **user preferences & past requests**
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_preferences (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic TEXT NOT NULL,
+                num_slides INTEGER NOT NULL,
+                font_choice TEXT DEFAULT 'Arial',
+                color_scheme TEXT DEFAULT '#000000',
+                bullet_style TEXT DEFAULT 'Dots',
+                header_color TEXT DEFAULT '#00008B',
+                body_font_size INTEGER DEFAULT 22,
+                audience TEXT DEFAULT 'General Public',
+                duration INTEGER DEFAULT 20,
+                purpose TEXT DEFAULT '',
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # ✅ Databases created before the request brief was stored get the new columns in place
+        existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(user_preferences)")}
+        for column, definition in (
+            ("audience", "TEXT DEFAULT 'General Public'"),
+            ("duration", "INTEGER DEFAULT 20"),
+            ("purpose", "TEXT DEFAULT ''"),
+        ):
+            if column not in existing_columns:
+                cursor.execute(f"ALTER TABLE user_preferences ADD COLUMN {column} {definition}")
+
+        # ✅ Stores **user feedback to improve AI**
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic TEXT NOT NULL,
+                feedback TEXT NOT NULL,
+                weightage INTEGER DEFAULT 1,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # ✅ Stores the generated state of each deck so slides can be regenerated individually
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS deck_state (
+                deck_id TEXT PRIMARY KEY,
+                topic TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                request_json TEXT NOT NULL,
+                titles_json TEXT NOT NULL,
+                refined_prompt TEXT NOT NULL,
+                slides_json TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # ✅ Stores token usage & latency of every LLM call (written in batches)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                request_id TEXT,
+                stage TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                cached_tokens INTEGER DEFAULT 0,
+                latency_ms REAL DEFAULT 0,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_llm_usage_timestamp ON llm_usage (timestamp)
+        """)
+
+        # ✅ Stores finished stages (titles, enrichment, slides) of in-progress generations
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS generation_checkpoints (
+                request_hash TEXT NOT NULL,
+                item TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (request_hash, item)
+            )
+        """)
+
+        # ✅ Stores reusable LLM stage outputs (titles, enrichment, slides) keyed by their inputs and
+        # who produced them, so a live request's output never replaces a warmed entry (or vice versa)
+        primary_key = {row[1] for row in cursor.execute("PRAGMA table_info(generation_cache)") if row[5]}
+        if primary_key == {"cache_key"}:
+            cursor.execute("DROP TABLE generation_cache")  # keyed on cache_key alone; cached outputs are disposable
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS generation_cache (
+                cache_key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                content TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT 'request',
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (cache_key, source)
+            )
+        """)
 
 
 # ---------------------- 🔄 STORE AI FEEDBACK ----------------------
+@traced("db.store_ai_feedback")
 def store_ai_feedback(topic, slide_number, feedback):
     """
     Stores AI-generated slide content for future optimization.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
+    db.execute("""
         INSERT INTO ai_feedback (topic, slide_number, feedback) VALUES (?, ?, ?)
     """, (topic, slide_number, feedback))
 
-    conn.commit()
-    conn.close()
+
+@traced("db.store_ai_feedback_batch")
+def store_ai_feedback_batch(topic, slide_contents):
+    """
+    Stores the content of a whole deck (slide 1..n) in a single transaction.
+    """
+    db.executemany("""
+        INSERT INTO ai_feedback (topic, slide_number, feedback) VALUES (?, ?, ?)
+    """, [(topic, i + 1, content) for i, content in enumerate(slide_contents)])
 
 
 # ---------------------- 🔄 STORE USER PREFERENCES ----------------------
-def store_user_preferences(topic, num_slides, font_choice, color_scheme, bullet_style, header_color, body_font_size):
+@traced("db.store_user_preferences")
+def store_user_preferences(topic, num_slides, font_choice, color_scheme, bullet_style="Dots", header_color="#00008B",
+                           body_font_size=22, audience="General Public", duration=20, purpose=""):
     """
-    Saves user-selected preferences (fonts, colors, styles) for future PPT generations.
+    Saves user-selected preferences (fonts, colors, styles) and the request brief for future PPT generations.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO user_preferences (topic, num_slides, font_choice, color_scheme, bullet_style, header_color, body_font_size)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (topic, num_slides, font_choice, color_scheme, bullet_style, header_color, body_font_size))
-    
-    conn.commit()
-    conn.close()
+    db.execute("""
+        INSERT INTO user_preferences (topic, num_slides, font_choice, color_scheme, bullet_style, header_color,
+                                      body_font_size, audience, duration, purpose)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (topic, num_slides, font_choice, color_scheme, bullet_style, header_color, body_font_size,
+          audience, duration, purpose))
 
 
 # ---------------------- 🔄 STORE USER FEEDBACK ----------------------
+@traced("db.store_user_feedback")
 def store_user_feedback(topic, feedback):
     """
     Stores user feedback and increases weightage if repeated feedback exists.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT id, weightage FROM user_feedback WHERE topic = ? AND feedback = ?
-    """, (topic, feedback))
-    result = cursor.fetchone()
-
-    if result:
-        feedback_id, weightage = result
+    with db.connection() as conn:
+        cursor = conn.cursor()
         cursor.execute("""
-            UPDATE user_feedback SET weightage = ? WHERE id = ?
-        """, (weightage + 1, feedback_id))
-    else:
-        cursor.execute("""
-            INSERT INTO user_feedback (topic, feedback, weightage) VALUES (?, ?, 1)
+            SELECT id, weightage FROM user_feedback WHERE topic = ? AND feedback = ?
         """, (topic, feedback))
+        result = cursor.fetchone()
 
-    conn.commit()
-    conn.close()
+        if result:
+            feedback_id, weightage = result
+            cursor.execute("""
+                UPDATE user_feedback SET weightage = ? WHERE id = ?
+            """, (weightage + 1, feedback_id))
+        else:
+            cursor.execute("""
+                INSERT INTO user_feedback (topic, feedback, weightage) VALUES (?, ?, 1)
+            """, (topic, feedback))
 
 
 # ---------------------- 📊 RETRIEVE AI FEEDBACK ----------------------
@@ -118,16 +194,10 @@ def retrieve_common_feedback(topic):
     """
     Retrieves most frequently given AI feedback for a topic.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
+    rows = db.fetchall("""
         SELECT feedback FROM ai_feedback WHERE topic = ? ORDER BY timestamp DESC LIMIT 5
     """, (topic,))
-    feedback_list = [row[0] for row in cursor.fetchall()]
-
-    conn.close()
-    return feedback_list
+    return [row[0] for row in rows]
 
 
 # ---------------------- 📊 RETRIEVE USER PREFERENCES ----------------------
@@ -135,15 +205,10 @@ def retrieve_user_preferences(topic):
     """
     Fetches stored user preferences for a given topic.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
+    result = db.fetchone("""
         SELECT num_slides, font_choice, color_scheme, bullet_style, header_color, body_font_size
         FROM user_preferences WHERE topic = ? ORDER BY timestamp DESC LIMIT 1
     """, (topic,))
-    result = cursor.fetchone()
-    conn.close()
 
     if result:
         return {
@@ -157,19 +222,242 @@ def retrieve_user_preferences(topic):
     return None
 
 
+# ---------------------- 📈 MOST REQUESTED DECKS ----------------------
+def retrieve_top_requests(limit, since_days):
+    """
+    Most frequent request briefs (topic, slide count, audience, duration, purpose) of the last
+    `since_days` days, most requested first.
+    """
+    rows = db.fetchall("""
+        SELECT topic, num_slides, audience, duration, purpose, COUNT(*) AS requests
+        FROM user_preferences WHERE timestamp >= datetime('now', ?)
+        GROUP BY topic, num_slides, audience, duration, purpose
+        ORDER BY requests DESC LIMIT ?
+    """, (f"-{since_days} days", limit))
+    return [
+        {"topic": row[0], "num_slides": row[1], "audience": row[2], "duration": row[3], "purpose": row[4],
+         "requests": row[5]}
+        for row in rows
+    ]
+
+
+def retrieve_top_feedback_topics(limit, since_days):
+    """
+    Most generated topics according to the stored slide content: every deck stores slide 1 once,
+    and its largest slide number approximates the usual deck size.
+    """
+    rows = db.fetchall("""
+        SELECT topic, SUM(slide_number = 1) AS decks, MAX(slide_number)
+        FROM ai_feedback WHERE slide_number > 0 AND timestamp >= datetime('now', ?)
+        GROUP BY topic HAVING decks > 0
+        ORDER BY decks DESC LIMIT ?
+    """, (f"-{since_days} days", limit))
+    return [{"topic": row[0], "requests": row[1], "num_slides": row[2]} for row in rows]
+
+
 # ---------------------- 🔄 RETRIEVE USER FEEDBACK ----------------------
 def retrieve_past_feedback(topic):
     """
     Retrieves user-submitted feedback to improve slide generation.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
+    rows = db.fetchall("""
         SELECT feedback FROM user_feedback WHERE topic = ? ORDER BY weightage DESC LIMIT 5
     """, (topic,))
-    feedback_list = cursor.fetchall()
-    conn.close()
-    return [fb[0] for fb in feedback_list]
+    return [fb[0] for fb in rows]
+
+
+# ---------------------- 🗂️ STORE DECK STATE ----------------------
+@traced("db.store_deck_state")
+def store_deck_state(deck_id, topic, filename, request_data, titles, refined_prompt, slides):
+    """
+    Saves everything needed to regenerate individual slides of a deck later:
+    the original request, slide titles, enriched prompt and per-slide content.
+    """
+    db.execute("""
+        INSERT OR REPLACE INTO deck_state (deck_id, topic, filename, request_json, titles_json, refined_prompt, slides_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (deck_id, topic, filename, json.dumps(request_data), json.dumps(titles), refined_prompt, json.dumps(slides)))
+
+
+# ---------------------- 🗂️ APPEND DECK SLIDES ----------------------
+@traced("db.append_deck_slides")
+def append_deck_slides(deck_id, titles, slides):
+    """
+    Appends slides (and their titles) to a stored deck state, so a large deck's state is
+    written a chunk at a time instead of being built in memory at the end.
+    """
+    paths = ", ".join("'$[#]', ?" for _ in titles)
+    db.execute(f"""
+        UPDATE deck_state
+        SET titles_json = json_insert(titles_json, {paths}), slides_json = json_insert(slides_json, {paths})
+        WHERE deck_id = ?
+    """, (*titles, *slides, deck_id))
+
+
+# ---------------------- 🗑️ DELETE DECK STATE ----------------------
+@traced("db.delete_deck_state")
+def delete_deck_state(deck_id):
+    """
+    Removes the stored state of a deck (e.g. one whose generation failed half-way).
+    """
+    db.execute("""
+        DELETE FROM deck_state WHERE deck_id = ?
+    """, (deck_id,))
+
+
+# ---------------------- 🗂️ UPDATE DECK SLIDES ----------------------
+@traced("db.update_deck_slides")
+def update_deck_slides(deck_id, slides):
+    """
+    Replaces the stored per-slide content of a deck after slides were regenerated.
+    """
+    db.execute("""
+        UPDATE deck_state SET slides_json = ?, timestamp = CURRENT_TIMESTAMP WHERE deck_id = ?
+    """, (json.dumps(slides), deck_id))
+
+
+# ---------------------- 🗂️ RETRIEVE DECK STATE ----------------------
+def retrieve_deck_state(deck_id):
+    """
+    Fetches the stored state of a deck, or None if the deck is unknown.
+    """
+    result = db.fetchone("""
+        SELECT topic, filename, request_json, titles_json, refined_prompt, slides_json
+        FROM deck_state WHERE deck_id = ?
+    """, (deck_id,))
+
+    if result:
+        return {
+            "deck_id": deck_id,
+            "topic": result[0],
+            "filename": result[1],
+            "request": json.loads(result[2]),
+            "titles": json.loads(result[3]),
+            "refined_prompt": result[4],
+            "slides": json.loads(result[5]),
+        }
+    return None
+
+
+# ---------------------- 🧾 STORE LLM USAGE (BATCH) ----------------------
+@traced("db.store_llm_usage_batch")
+def store_llm_usage_batch(rows):
+    """
+    Inserts many LLM usage rows in a single transaction.
+    Each row: (request_id, stage, model, prompt_tokens, completion_tokens, cached_tokens, latency_ms, timestamp).
+    """
+    if not rows:
+        return
+    db.executemany("""
+        INSERT INTO llm_usage (request_id, stage, model, prompt_tokens, completion_tokens, cached_tokens, latency_ms, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+
+# ---------------------- 📊 RETRIEVE LLM USAGE REPORT ----------------------
+def retrieve_usage_report(since=None):
+    """
+    Aggregates LLM usage per stage & model, optionally only rows newer than `since`
+    (an SQLite datetime string such as '2025-01-31 00:00:00').
+    """
+    rows = db.fetchall("""
+        SELECT stage, model, COUNT(*), COUNT(DISTINCT request_id),
+               SUM(prompt_tokens), SUM(completion_tokens), SUM(cached_tokens), AVG(latency_ms), MAX(latency_ms)
+        FROM llm_usage
+        WHERE ? IS NULL OR timestamp >= ?
+        GROUP BY stage, model
+        ORDER BY SUM(prompt_tokens) + SUM(completion_tokens) DESC
+    """, (since, since))
+
+    return [
+        {
+            "stage": row[0],
+            "model": row[1],
+            "calls": row[2],
+            "requests": row[3],
+            "prompt_tokens": row[4],
+            "completion_tokens": row[5],
+            "cached_tokens": row[6],
+            "avg_latency_ms": round(row[7] or 0, 1),
+            "max_latency_ms": round(row[8] or 0, 1),
+        }
+        for row in rows
+    ]
+
+
+# ---------------------- 💾 STORE CHECKPOINT ITEM ----------------------
+@traced("db.store_checkpoint_item")
+def store_checkpoint_item(request_hash, item, content):
+    """
+    Saves one finished stage of a generation (e.g. 'titles', 'enrichment', 'slide_3').
+    """
+    db.execute("""
+        INSERT OR REPLACE INTO generation_checkpoints (request_hash, item, content) VALUES (?, ?, ?)
+    """, (request_hash, item, json.dumps(content)))
+
+
+# ---------------------- 💾 RETRIEVE CHECKPOINT ----------------------
+def retrieve_checkpoint(request_hash, max_age_hours):
+    """
+    Returns {item: content} of a generation's finished stages, ignoring stale entries.
+    """
+    rows = db.fetchall("""
+        SELECT item, content FROM generation_checkpoints
+        WHERE request_hash = ? AND timestamp >= datetime('now', ?)
+    """, (request_hash, f"-{max_age_hours} hours"))
+    return {item: json.loads(content) for item, content in rows}
+
+
+# ---------------------- 🧹 DELETE CHECKPOINT ----------------------
+@traced("db.delete_checkpoint")
+def delete_checkpoint(request_hash):
+    """
+    Removes a generation's checkpoint once the deck was saved successfully.
+    """
+    db.execute("""
+        DELETE FROM generation_checkpoints WHERE request_hash = ?
+    """, (request_hash,))
+
+
+# ---------------------- 🗃️ GENERATION CACHE ----------------------
+@traced("db.store_cached_generation")
+def store_cached_generation(cache_key, stage, content, source="request"):
+    """
+    Saves one reusable stage output; `source` tells whether a request or the cache warmer produced it.
+    """
+    db.execute("""
+        INSERT OR REPLACE INTO generation_cache (cache_key, stage, content, source) VALUES (?, ?, ?, ?)
+    """, (cache_key, stage, json.dumps(content), source))
+
+
+def retrieve_cached_generation(cache_key, max_age_hours, source):
+    """
+    Returns the content of a cached stage output produced by `source`, or None if missing or stale.
+    """
+    row = db.fetchone("""
+        SELECT content FROM generation_cache
+        WHERE cache_key = ? AND source = ? AND timestamp >= datetime('now', ?)
+    """, (cache_key, source, f"-{max_age_hours} hours"))
+    return json.loads(row[0]) if row else None
+
+
+def claim_cached_generation(cache_key, source):
+    """
+    Deletes a cached stage output so only one request is served it; returns whether this call removed it.
+    """
+    return db.execute("""
+        DELETE FROM generation_cache WHERE cache_key = ? AND source = ?
+    """, (cache_key, source)) == 1
+
+
+@traced("db.prune_generation_cache")
+def prune_generation_cache(max_age_hours, source):
+    """
+    Deletes stale cache entries of `source`; returns how many were removed.
+    """
+    return db.execute("""
+        DELETE FROM generation_cache WHERE source = ? AND timestamp < datetime('now', ?)
+    """, (source, f"-{max_age_hours} hours"))
 
 
 # ---------------------- 🔥 INITIALIZE DATABASE ON IMPORT ----------------------
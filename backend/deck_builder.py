@@ -0,0 +1,53 @@
+from pptx.util import Inches
+
+# ---------------------- 📐 SLIDE LAYOUT ----------------------
+TITLE_ONLY_LAYOUT = 5
+TITLE_ONLY_LAYOUT_NAME = "Title Only"
+BODY_BOX = (Inches(1), Inches(1.5), Inches(8), Inches(4))  # left, top, width, height
+BODY_MARGIN = Inches(0.2)
+
+
+# ---------------------- ➕ ADD CONTENT SLIDE ----------------------
+def add_content_slide(prs, title, content):
+    """Adds a title-only slide with a word-wrapped text box holding the slide body."""
+    slide = prs.slides.add_slide(title_only_layout(prs))
+    title_shape = slide.shapes.title
+    if title_shape:
+        title_shape.text = title
+    else:
+        title_box = slide.shapes.add_textbox(Inches(1), Inches(0.3), Inches(8), Inches(1))
+        title_box.text_frame.text = title
+
+    text_box = slide.shapes.add_textbox(*BODY_BOX)
+    text_frame = text_box.text_frame
+    text_frame.text = content
+
+    text_frame.margin_left = BODY_MARGIN
+    text_frame.margin_right = BODY_MARGIN
+    text_frame.margin_top = BODY_MARGIN
+    text_frame.margin_bottom = BODY_MARGIN
+    text_frame.word_wrap = True
+    return slide
+
+
+def title_only_layout(prs):
+    """Finds the "Title Only" layout by name, since optimized decks keep only the layouts they use."""
+    return prs.slide_layouts.get_by_name(TITLE_ONLY_LAYOUT_NAME) or prs.slide_layouts[TITLE_ONLY_LAYOUT]
+
+
+# ---------------------- 🔁 REPLACE SLIDE BODY ----------------------
+def replace_slide_content(slide, content):
+    """
+    Swaps the body text of a slide created by `add_content_slide`, leaving the title untouched.
+    The body is the last text-bearing shape that is not the title.
+    """
+    title_shape = slide.shapes.title
+    body_shapes = [
+        shape for shape in slide.shapes
+        if shape.has_text_frame and (title_shape is None or shape.shape_id != title_shape.shape_id)
+    ]
+    if not body_shapes:
+        raise ValueError("Slide has no body text box to replace.")
+
+    body_shapes[-1].text_frame.text = content
+    return slide
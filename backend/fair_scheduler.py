@@ -0,0 +1,265 @@
+import contextvars
+import ipaddress
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from backend.cancellation import RequestCancelled, check_cancelled
+from backend.config import (
+    SCHEDULER_BULK_PROMOTE_SECONDS,
+    SCHEDULER_INTERACTIVE_MAX_SLIDES,
+    SCHEDULER_MAX_IN_FLIGHT,
+    SCHEDULER_TENANT_MAX_IN_FLIGHT,
+    SCHEDULER_TENANT_WEIGHTS,
+)
+from backend.tracing import span
+
+# ---------------------- ⚖️ SCHEDULED JOB ----------------------
+# The tenant and priority of the generation being served. Pipeline stages copy the caller's
+# context into their worker threads, so every LLM call of a deck is scheduled for its tenant.
+current_job = contextvars.ContextVar("current_job", default=None)
+
+INTERACTIVE, BULK = "interactive", "bulk"
+ANONYMOUS_TENANT = "anonymous"
+_MAX_TRACKED_TENANTS = 1000
+_WAIT_SAMPLES = 512
+
+
+def job_priority(num_slides, large_deck=False):
+    """Small decks are interactive (someone is waiting on them); large ones are bulk work."""
+    return BULK if large_deck or num_slides > SCHEDULER_INTERACTIVE_MAX_SLIDES else INTERACTIVE
+
+
+@contextmanager
+def scheduled_job(tenant, priority=INTERACTIVE):
+    """Schedules the LLM calls made inside the block (and its pipeline stages) for `tenant`."""
+    token = current_job.set((tenant, priority))
+    try:
+        yield
+    finally:
+        current_job.reset(token)
+
+
+def parse_weights(spec):
+    """'acme=4,beta=2' → {'acme': 4.0, 'beta': 2.0} (malformed entries are ignored)."""
+    weights = {}
+    for entry in spec.split(","):
+        name, _, value = entry.partition("=")
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if name.strip() and weight > 0:
+            weights[name.strip()] = weight
+    return weights
+
+
+def parse_networks(spec):
+    """'10.0.0.5,192.168.1.0/24' → [ip_network, ...] (malformed entries are ignored)."""
+    networks = []
+    for entry in spec.split(","):
+        try:
+            networks.append(ipaddress.ip_network(entry.strip(), strict=False))
+        except ValueError:
+            continue
+    return networks
+
+
+def tenant_for(client_host, tenant_header=None, trusted_proxies=()):
+    """
+    The tenant a request is scheduled for: the client's address, or the `X-Tenant-ID` it sent
+    if the client is a trusted proxy (anyone else could pick a fresh tenant per request to
+    dodge the per-tenant cap).
+    """
+    tenant = (tenant_header or "").strip()[:64]
+    if tenant and client_host and _is_trusted(client_host, trusted_proxies):
+        return tenant
+    return client_host or ANONYMOUS_TENANT
+
+
+def _is_trusted(host, networks):
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+class _Ticket:
+    def __init__(self, tenant, priority):
+        self.tenant = tenant
+        self.priority = priority
+        self.queued_at = time.monotonic()
+        self.granted = False
+        self.wait_ms = None
+
+
+class _Tenant:
+    def __init__(self, name, weight):
+        self.name = name
+        self.weight = weight
+        self.virtual_start = 0.0  # service received so far, in weighted units
+        self.waiting = []
+        self.in_flight = 0
+        self.granted = 0
+        self.waits_ms = deque(maxlen=_WAIT_SAMPLES)
+        self.last_active = time.monotonic()
+
+
+# ---------------------- 🚦 FAIR SCHEDULER ----------------------
+class FairScheduler:
+    """
+    Weighted fair queuing of LLM calls across tenants (stride scheduling).
+    - Each call takes a slot: at most `max_in_flight` in total and `tenant_max_in_flight` per tenant.
+    - A freed slot goes to the waiting tenant that received the least service relative to its
+      weight, so a tenant with weight 2 gets twice the calls of a weight-1 tenant under contention,
+      and one tenant's burst of decks cannot starve the others.
+    - Interactive calls (small decks) are served before bulk ones; bulk calls that waited longer
+      than `bulk_promote_s` count as interactive.
+    - A tenant becoming active starts at the current virtual time, so idle periods don't bank credit.
+    - Waiting is cancellable: a cancelled request leaves the queue.
+    """
+
+    def __init__(self, max_in_flight=SCHEDULER_MAX_IN_FLIGHT, tenant_max_in_flight=SCHEDULER_TENANT_MAX_IN_FLIGHT,
+                 weights=None, bulk_promote_s=SCHEDULER_BULK_PROMOTE_SECONDS):
+        self.max_in_flight = max_in_flight
+        self.tenant_max_in_flight = tenant_max_in_flight
+        self.weights = parse_weights(SCHEDULER_TENANT_WEIGHTS) if weights is None else dict(weights)
+        self.bulk_promote_s = bulk_promote_s
+        self.in_flight = 0
+        self.promoted = 0
+        self._virtual_time = 0.0
+        self._tenants = {}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Holds one LLM-call slot of the current job's tenant for the block (a no-op outside a job)."""
+        job = current_job.get()
+        if job is None:
+            yield
+            return
+        ticket = self._acquire(*job)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    def _acquire(self, tenant_name, priority):
+        with span("scheduler.wait", tenant=tenant_name, priority=priority) as wait_span, self._cond:
+            tenant = self._tenant(tenant_name)
+            if not tenant.waiting and not tenant.in_flight:
+                tenant.virtual_start = max(tenant.virtual_start, self._virtual_time)
+            ticket = _Ticket(tenant, priority)
+            tenant.waiting.append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                try:
+                    check_cancelled(skipped="llm_calls_skipped")
+                except RequestCancelled:
+                    tenant.waiting.remove(ticket)
+                    raise
+                # Bulk promotion is time-based, so waiting threads re-run dispatch now and then.
+                if not self._cond.wait(timeout=0.1):
+                    self._dispatch()
+            wait_span.set(wait_ms=round(ticket.wait_ms, 1))
+            return ticket
+
+    def _release(self, ticket):
+        with self._cond:
+            ticket.tenant.in_flight -= 1
+            self.in_flight -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Grants free slots (caller holds the lock)."""
+        granted = False
+        while self.in_flight < self.max_in_flight:
+            choice = self._next_ticket()
+            if choice is None:
+                break
+            tenant, ticket = choice
+            tenant.waiting.remove(ticket)
+            ticket.granted = True
+            tenant.in_flight += 1
+            tenant.granted += 1
+            tenant.last_active = time.monotonic()
+            ticket.wait_ms = (time.monotonic() - ticket.queued_at) * 1000
+            tenant.waits_ms.append(ticket.wait_ms)
+            self._virtual_time = tenant.virtual_start
+            tenant.virtual_start += 1.0 / tenant.weight
+            self.in_flight += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _next_ticket(self):
+        now = time.monotonic()
+        heads = []
+        for tenant in self._tenants.values():
+            if tenant.waiting and tenant.in_flight < self.tenant_max_in_flight:
+                ticket = min(tenant.waiting, key=lambda t: (self._rank(t, now), t.queued_at))
+                heads.append((self._rank(ticket, now), tenant.virtual_start, ticket.queued_at, tenant, ticket))
+        if not heads:
+            return None
+        rank, _, _, tenant, ticket = min(heads, key=lambda head: head[:3])
+        if ticket.priority == BULK and rank == 0:
+            self.promoted += 1
+        return tenant, ticket
+
+    def _rank(self, ticket, now):
+        if ticket.priority == INTERACTIVE or now - ticket.queued_at >= self.bulk_promote_s:
+            return 0
+        return 1
+
+    def _tenant(self, name):
+        tenant = self._tenants.get(name)
+        if tenant is None:
+            if len(self._tenants) >= _MAX_TRACKED_TENANTS:
+                self._forget_idle_tenants()
+            tenant = self._tenants[name] = _Tenant(name, self.weights.get(name, 1.0))
+        return tenant
+
+    def _forget_idle_tenants(self):
+        idle = sorted((t for t in self._tenants.values() if not t.waiting and not t.in_flight),
+                      key=lambda t: t.last_active)
+        for tenant in idle[:len(idle) // 2 + 1]:
+            del self._tenants[tenant.name]
+
+    # ---------------------- 📊 METRICS ----------------------
+    def metrics(self):
+        """Slot usage plus per-tenant queue length and wait times (ms, recent calls)."""
+        with self._cond:
+            tenants = {
+                tenant.name: {
+                    "weight": tenant.weight,
+                    "in_flight": tenant.in_flight,
+                    "waiting": len(tenant.waiting),
+                    "granted": tenant.granted,
+                    **_wait_stats(list(tenant.waits_ms)),
+                }
+                for tenant in self._tenants.values()
+            }
+            return {
+                "max_in_flight": self.max_in_flight,
+                "tenant_max_in_flight": self.tenant_max_in_flight,
+                "in_flight": self.in_flight,
+                "waiting": sum(len(tenant.waiting) for tenant in self._tenants.values()),
+                "bulk_promoted": self.promoted,
+                "tenants": tenants,
+            }
+
+
+def _wait_stats(waits):
+    if not waits:
+        return {"wait_ms_avg": 0.0, "wait_ms_p95": 0.0, "wait_ms_max": 0.0}
+    ordered = sorted(waits)
+    return {
+        "wait_ms_avg": round(sum(ordered) / len(ordered), 1),
+        "wait_ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "wait_ms_max": round(ordered[-1], 1),
+    }
+
+
+fair_scheduler = FairScheduler()
@@ -0,0 +1,37 @@
+import hashlib
+import os
+import threading
+
+_CHUNK_SIZE = 1024 * 1024
+_MAX_ENTRIES = 1024
+
+_hashes = {}
+_lock = threading.Lock()
+
+
+# ---------------------- #️⃣ CONTENT HASH ----------------------
+def file_content_hash(path):
+    """
+    SHA-256 of a file's bytes, memoized by (path, mtime, size): repeated lookups of an
+    unchanged file cost one `stat` call. Decks are replaced atomically, so a rewrite always
+    shows up as a new mtime.
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _hashes.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+
+    with _lock:
+        if len(_hashes) >= _MAX_ENTRIES:
+            _hashes.clear()
+        _hashes[path] = (signature, content_hash)
+    return content_hash
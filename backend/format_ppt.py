@@ -1,10 +1,12 @@
-import re
-
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
 from pptx.util import Inches, Pt
 
+from backend.style_engine import apply_deck_theme, fit_text_to_shape
+from backend import text_pipeline
+from backend.tracing import traced
+
 # ---------------------- 🎨 DEFAULT DESIGN CONFIGURATIONS ----------------------
 DEFAULT_USER_PREFERENCES = {
     "font_choice": "Arial",
@@ -15,13 +17,17 @@ DEFAULT_USER_PREFERENCES = {
 }
 
 # ---------------------- 🖌️ APPLY FORMATTING FUNCTION ----------------------
-def apply_formatting(prs, user_preferences=None):
+@traced("apply_formatting")
+def apply_formatting(prs, user_preferences=None, slides=None, use_theme_styles=True, apply_theme=True):
     """
     Applies AI-driven formatting based on user preferences & AI processing.
     - Identifies and formats subheaders automatically.
     - Implements AI-driven bulleting.
     - Cleans AI-generated conversation artifacts.
     - Summarizes overly verbose slides for better readability.
+    - `slides` limits formatting to the given slides (e.g. only regenerated ones).
+    - `use_theme_styles` writes fonts/colors/background once into the master instead of every run.
+    - `apply_theme=False` skips that master step for decks that already carry the theme (base decks).
     """
     user_preferences = user_preferences or DEFAULT_USER_PREFERENCES
 
@@ -29,16 +35,25 @@ def apply_formatting(prs, user_preferences=None):
     header_color = user_preferences.get("header_color", RGBColor(0, 0, 139))
     content_color = user_preferences.get("primary_color", RGBColor(0, 0, 0))
 
-    for slide in prs.slides:
-        set_slide_background(slide)
-        format_text_elements(slide, font_choice, header_color, content_color)
+    if use_theme_styles and apply_theme:
+        apply_deck_theme(prs, font_choice, header_color, content_color)
+        for master in prs.slide_masters:
+            set_slide_background(master)
+
+    slides = list(prs.slides if slides is None else slides)
+    if use_theme_styles:
+        format_deck_text(slides, font_choice)
+    else:
+        for slide in slides:
+            set_slide_background(slide)
+            format_text_elements(slide, font_choice, header_color, content_color)
 
     return prs
 
 
 # ---------------------- 🎨 SET SLIDE BACKGROUND ----------------------
 def set_slide_background(slide):
-    """Sets a solid **white** background for the slide."""
+    """Sets a solid **white** background for the slide (or slide master)."""
     background = slide.background
     fill = background.fill
     fill.solid()
@@ -60,10 +75,7 @@ def format_text_elements(slide, font_choice, header_color, content_color):
             text_frame = shape.text_frame
 
             for paragraph in text_frame.paragraphs:
-                cleaned_text = clean_slide_text(paragraph.text)
-                cleaned_text = summarize_text_if_needed(cleaned_text)  # ✅ AI Summarization
-                cleaned_text = apply_smart_bulleting(cleaned_text)
-
+                cleaned_text, subheader = text_pipeline.process_paragraph(paragraph.text)
                 if paragraph.text != cleaned_text:
                     paragraph.text = cleaned_text
 
@@ -75,7 +87,7 @@ def format_text_elements(slide, font_choice, header_color, content_color):
                     run.font.color.rgb = header_color if shape == slide.shapes.title else content_color
 
                     # ✅ AI-driven Sub-header Formatting
-                    if is_subheader(paragraph.text):
+                    if subheader:
                         run.font.bold = True
                         run.font.italic = True  # Emphasize sub-headers
                         run.font.underline = True
@@ -84,14 +96,52 @@ def format_text_elements(slide, font_choice, header_color, content_color):
             ensure_text_fits(shape, text_frame, font_choice)
 
 
+# ---------------------- 📝 FORMAT TEXT CONTENT (THEME MODE) ----------------------
+def format_deck_text(slides, font_choice):
+    """
+    Same text clean-up as `format_text_elements`, but fonts, sizes, colors & alignment
+    come from the deck theme. Only sub-header emphasis and the fitted size are written per shape.
+    The text of every given slide goes through the text pipeline as one batch.
+    """
+    shapes = []
+    for slide in slides:
+        title_shape = slide.shapes.title
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                is_title = title_shape is not None and shape.shape_id == title_shape.shape_id
+                shapes.append((shape, is_title, list(shape.text_frame.paragraphs)))
+
+    paragraphs = [paragraph for _, _, shape_paragraphs in shapes for paragraph in shape_paragraphs]
+    processed = text_pipeline.process_paragraphs([paragraph.text for paragraph in paragraphs])
+
+    for paragraph, (cleaned_text, subheader) in zip(paragraphs, processed):
+        if paragraph.text != cleaned_text:
+            paragraph.text = cleaned_text
+
+        # ✅ AI-driven Sub-header Formatting (the only per-run override)
+        if subheader:
+            for run in paragraph.runs:
+                run.font.bold = True
+                run.font.italic = True
+                run.font.underline = True
+
+    # ✅ Fix text overflow with a single shape-level size
+    for shape, is_title, _ in shapes:
+        fit_text_to_shape(shape, shape.text_frame, font_choice, max_size=32 if is_title else 24)
+
+
+def format_text_content(slide, font_choice):
+    """Theme-mode text formatting of a single slide."""
+    format_deck_text([slide], font_choice)
+
+
 # ---------------------- 🔎 AI DETECTION: IS SUBHEADER? ----------------------
 def is_subheader(text):
     """
     Determines if a given text is likely a sub-header.
     - Short structured text with ":" or key thematic words are treated as sub-headers.
     """
-    subheader_keywords = ["Introduction", "Overview", "Impact", "Analysis", "Examples", "Benefits", "Challenges", "Trends", "Case Studies", "Conclusion"]
-    return any(keyword in text for keyword in subheader_keywords) or (len(text) < 50 and ":" in text)
+    return text_pipeline.is_subheader(text)
 
 
 # ---------------------- 📌 AI-DRIVEN SMART BULLETING ----------------------
@@ -101,13 +151,7 @@ def apply_smart_bulleting(text):
     - Converts structured lists into readable bullet points.
     - Ensures key points are properly indented.
     """
-    text = text.strip()
-    if not text:
-        return text
-    if text.startswith("-") or text.startswith("•") or text.startswith("Numbers"):
-        return text  # Already formatted
-
-    return f"• {text}"
+    return text_pipeline.bulletize(text)
 
 
 # ---------------------- ✂️ AI-DRIVEN TEXT CLEANUP ----------------------
@@ -117,12 +161,7 @@ def clean_slide_text(text):
     - Removes redundant AI-generated words (like 'Dots', 'Numbers', 'Checkmarks').
     - Eliminates presenter notes and conversational artifacts.
     """
-    text = re.sub(r"\b(Sure! Here's your slide:|Feel free to customize|Let's proceed with|If needed, you can).*", "", text).strip()
-    text = re.sub(r"\b(Numbers|Dots|Checkmarks)\s\b", "", text).strip()
-    text = re.sub(r"(\*\*Visual Enhancements:\*\*|➤ Suggestions:).*", "", text, flags=re.IGNORECASE).strip()
-    text = text.replace("---", "──────────")  # AI section separator
-
-    return text.strip()
+    return text_pipeline.clean_text(text)
 
 
 # ---------------------- ✂️ AI-DRIVEN TEXT SUMMARIZATION ----------------------
@@ -131,20 +170,20 @@ def summarize_text_if_needed(text):
     Uses AI to summarize text if it exceeds a reasonable length.
     Ensures content is concise while maintaining key points.
     """
-    if len(text.split()) > 50:  # ✅ Summarize if text is too long
-        text = " ".join(text.split()[:50]) + "..."  # Truncate and indicate continuation
-    return text
+    return text_pipeline.summarize_text(text)
 
 
 # ---------------------- ✂️ FIX TEXT OVERFLOW ----------------------
+@traced("fit_text")
 def ensure_text_fits(shape, text_frame, font_choice):
     """Ensures text fits inside the shape by dynamically reducing font size."""
     try:
         # Let python-pptx balance the text size automatically when available.
         text_frame.fit_text(font_family=font_choice, max_size=24, bold=None, italic=None)
         return
-    except (AttributeError, TypeError):
-        # Fall back to a simple heuristic if fit_text is unavailable.
+    except (AttributeError, TypeError, OSError, KeyError):
+        # Fall back to a simple heuristic if fit_text is unavailable
+        # (font lookup raises OSError on Linux and KeyError for uninstalled fonts).
         pass
 
     for paragraph in text_frame.paragraphs:
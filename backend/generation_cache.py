@@ -0,0 +1,98 @@
+import hashlib
+import json
+import threading
+
+from backend.config import GENERATION_CACHE_LIVE_TTL_HOURS, GENERATION_CACHE_TTL_HOURS
+from backend.db_handler import (
+    claim_cached_generation,
+    prune_generation_cache,
+    retrieve_cached_generation,
+    store_cached_generation,
+)
+
+REQUEST, WARMER = "request", "warmer"
+
+
+# ---------------------- 🗃️ GENERATION CACHE ----------------------
+class GenerationCache:
+    """
+    Reusable LLM stage outputs, keyed by the stage and its exact inputs:
+    - titles by (topic, slide count), enrichment by the request brief and the past feedback
+      injected into its prompt, each slide by (index, title, outline, slide count). A hit on
+      titles & enrichment therefore also makes the slide keys of a deck match.
+    - `namespace` (the LLM backend) keeps outputs of different providers apart.
+    - Entries the cache warmer produced live `ttl_hours` and are served to one request only, so
+      submitting the same brief again still gets a fresh take.
+    - Outputs of live requests are only cached if `live_ttl_hours` > 0 (opt-in), and reused for that long.
+    - Only request lookups are counted; hits on warmed entries are also counted separately
+      (warmed hit rate).
+    """
+
+    def __init__(self, namespace, ttl_hours=GENERATION_CACHE_TTL_HOURS, live_ttl_hours=GENERATION_CACHE_LIVE_TTL_HOURS):
+        self.namespace = namespace
+        self.ttl_hours = ttl_hours
+        self.live_ttl_hours = live_ttl_hours
+        self._counts = {}  # stage -> {"lookups", "hits", "warmed_hits"}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, stage, inputs, compute, source=REQUEST, cacheable=None):
+        """
+        Returns the cached output of `stage` for `inputs`, or computes it (and caches it for
+        the warmer, or for requests if live caching is on).
+        `cacheable(result)` can veto caching (e.g. fallback output after a failed call).
+        """
+        key = self.key(stage, inputs)
+        if source == WARMER:
+            cached = self._lookup(key, WARMER, self.ttl_hours)
+        else:
+            cached, cached_source = self._take_warmed(key), WARMER
+            if cached is None:
+                cached, cached_source = self._lookup(key, REQUEST, self.live_ttl_hours), REQUEST
+            self._record(stage, cached is not None, cached_source == WARMER)
+        if cached is not None:
+            return cached
+        result = compute()
+        ttl_hours = self.ttl_hours if source == WARMER else self.live_ttl_hours
+        if ttl_hours > 0 and (cacheable is None or cacheable(result)):
+            store_cached_generation(key, stage, result, source)
+        return result
+
+    def _lookup(self, key, source, ttl_hours):
+        return retrieve_cached_generation(key, ttl_hours, source) if ttl_hours > 0 else None
+
+    def _take_warmed(self, key):
+        """A warmed entry, removed from the cache so the next identical request generates anew."""
+        cached = self._lookup(key, WARMER, self.ttl_hours)
+        if cached is not None and claim_cached_generation(key, WARMER):
+            return cached
+        return None  # Missing, stale or claimed by a concurrent request.
+
+    def key(self, stage, inputs):
+        normalized = [" ".join(value.split()) if isinstance(value, str) else value for value in inputs]
+        payload = json.dumps([self.namespace, stage, normalized], separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def prune(self):
+        """Deletes expired entries (all request entries if live caching is off); returns how many."""
+        return prune_generation_cache(self.ttl_hours, WARMER) + prune_generation_cache(self.live_ttl_hours, REQUEST)
+
+    def _record(self, stage, hit, warmed):
+        with self._lock:
+            counts = self._counts.setdefault(stage, {"lookups": 0, "hits": 0, "warmed_hits": 0})
+            counts["lookups"] += 1
+            if hit:
+                counts["hits"] += 1
+                if warmed:
+                    counts["warmed_hits"] += 1
+
+    def metrics(self):
+        with self._lock:
+            by_stage = {stage: dict(counts) for stage, counts in self._counts.items()}
+        totals = {key: sum(counts[key] for counts in by_stage.values()) for key in ("lookups", "hits", "warmed_hits")}
+        lookups = totals["lookups"]
+        return {
+            **totals,
+            "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0,
+            "warmed_hit_rate": round(totals["warmed_hits"] / lookups, 4) if lookups else 0.0,
+            "by_stage": by_stage,
+        }
@@ -0,0 +1,68 @@
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.cancellation import PipelineCancellation, current_cancellation
+from backend.config import LARGE_DECK_SECTION_SIZE, LARGE_DECK_WINDOW, LLM_MAX_CONCURRENCY
+from backend.profiling import profiled_call
+
+
+# ---------------------- 📚 LARGE-DECK SECTIONS ----------------------
+def plan_sections(num_slides, section_size=LARGE_DECK_SECTION_SIZE):
+    """
+    Splits a deck into consecutive sections; returns [(first_slide_index, slide_count)].
+    Sizes are balanced, so 25 slides with size 10 become 9 + 8 + 8 rather than 10 + 10 + 5.
+    """
+    num_sections = max(1, -(-num_slides // section_size))
+    base, extra = divmod(num_slides, num_sections)
+    sections = []
+    start = 0
+    for s in range(num_sections):
+        count = base + (1 if s < extra else 0)
+        sections.append((start, count))
+        start += count
+    return sections
+
+
+def section_overview(section_titles, sections):
+    """Short deck-wide context stored with a large deck (used when slides are regenerated)."""
+    return "\n".join(
+        f"Section {s + 1} (slides {start + 1}-{start + count}): {title}"
+        for s, (title, (start, count)) in enumerate(zip(section_titles, sections))
+    )
+
+
+# ---------------------- 🌊 WINDOWED ORDERED STREAM ----------------------
+def run_windowed(jobs, on_result, window=LARGE_DECK_WINDOW, max_workers=LLM_MAX_CONCURRENCY):
+    """
+    Runs an iterable of zero-argument `jobs` concurrently and feeds their results to
+    `on_result` in job order, as soon as each next result is available.
+    - At most `window` jobs are outstanding (running or finished but not yet consumed),
+      so memory is bounded no matter how many jobs there are.
+    - `jobs` is consumed lazily; it may block (e.g. to plan the next section) between jobs.
+    - Each job runs in a copy of the caller's context (request id, profiling, ...).
+    - The first failure is raised; queued jobs are cancelled and the LLM calls of jobs still
+      running are aborted (through the run's cancellation scope).
+    Returns the number of results consumed.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="large-deck")
+    pending = deque()
+    consumed = 0
+    cancellation = PipelineCancellation(current_cancellation.get())
+    try:
+        for job in jobs:
+            if len(pending) >= window:
+                on_result(pending.popleft().result())
+                consumed += 1
+            context = contextvars.copy_context()
+            context.run(current_cancellation.set, cancellation)
+            pending.append(pool.submit(context.run, profiled_call, job))
+        while pending:
+            on_result(pending.popleft().result())
+            consumed += 1
+        return consumed
+    except BaseException:
+        cancellation.cancel()  # Jobs still running stop at their next LLM call or poll.
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
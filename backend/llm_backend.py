@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from backend.config import (
+    LLM_BACKEND,
+    LLM_RECORDINGS_DIR,
+    LOCAL_LLM_LATENCY_MS,
+    LOCAL_LLM_TOKENS_PER_SECOND,
+)
+
+
+# ---------------------- 📨 CHAT COMPLETION ----------------------
+@dataclass
+class ChatCompletion:
+    """Provider-neutral result of one chat call: the reply text plus what usage accounting needs."""
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+
+# ---------------------- 🔌 LLM BACKENDS ----------------------
+class LLMBackend:
+    """
+    Interface every generation call goes through: `chat(model, messages, timeout, check_abort) -> ChatCompletion`.
+    - `timeout` (seconds, optional) bounds the call; backends raise TimeoutError when it runs out.
+    - `check_abort` (optional) is called repeatedly while the call is in flight and raises once
+      nobody needs the reply any more; backends then stop the call and let the exception propagate.
+    """
+    name = "base"
+
+    def chat(self, model, messages, timeout=None, check_abort=None):
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    The OpenAI chat completions API (honours OPENAI_BASE_URL, e.g. for the stub server).
+    Replies are streamed so an aborted call can close its connection between chunks, which
+    stops the generation on the provider's side.
+    """
+    name = "openai"
+
+    def __init__(self, api_key=None):
+        import openai
+
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY as an environment variable.")
+        self.client = openai.OpenAI(api_key=api_key)
+
+    def chat(self, model, messages, timeout=None, check_abort=None):
+        import httpx
+        import openai
+
+        options = {"timeout": timeout} if timeout is not None else {}
+        parts, usage, response_model = [], None, None
+        try:
+            stream = self.client.chat.completions.create(
+                model=model, messages=messages, stream=True, stream_options={"include_usage": True}, **options
+            )
+            with stream:  # Leaving early (an abort) closes the connection.
+                for chunk in stream:
+                    if check_abort:
+                        check_abort()
+                    response_model = response_model or chunk.model
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                    usage = chunk.usage or usage
+        except (openai.APITimeoutError, httpx.TimeoutException) as e:
+            raise TimeoutError(f"LLM call timed out after {timeout}s.") from e
+        details = getattr(usage, "prompt_tokens_details", None)
+        return ChatCompletion(
+            content="".join(parts),
+            model=response_model or model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+        )
+
+
+class LocalBackend(LLMBackend):
+    """
+    Deterministic offline provider: the reply is a pure function of the prompt, shaped like the
+    pipeline expects (title lists, `Slide N:` outlines, bulleted bodies).
+    Latency = `latency_ms` + completion tokens / `tokens_per_second`, with no jitter.
+    """
+    name = "local"
+
+    def __init__(self, latency_ms=LOCAL_LLM_LATENCY_MS, tokens_per_second=LOCAL_LLM_TOKENS_PER_SECOND):
+        self.latency_s = latency_ms / 1000
+        self.tokens_per_second = tokens_per_second
+
+    def chat(self, model, messages, timeout=None, check_abort=None):
+        content = local_completion_text(messages)
+        completion_tokens = count_tokens(content)
+        delay = self.latency_s + (completion_tokens / self.tokens_per_second if self.tokens_per_second else 0)
+        if timeout is not None and delay > timeout:
+            _sleep(timeout, check_abort)
+            raise TimeoutError(f"LLM call timed out after {timeout}s.")
+        _sleep(delay, check_abort)
+        return ChatCompletion(
+            content=content,
+            model=model,
+            prompt_tokens=sum(count_tokens(m.get("content", "")) for m in messages),
+            completion_tokens=completion_tokens,
+        )
+
+
+class RecordReplayBackend(LLMBackend):
+    """
+    Saves real responses to disk and serves them back.
+    - record mode: every call goes to `inner` and the response is written to `directory`.
+    - replay mode: responses are read from `directory`; a prompt never recorded raises LookupError.
+    Recordings are keyed by a hash of (model, messages), one JSON file each.
+    """
+
+    def __init__(self, directory=LLM_RECORDINGS_DIR, inner=None, record=False):
+        if record and inner is None:
+            raise ValueError("Recording needs an inner backend to call.")
+        self.directory = Path(directory)
+        self.inner = inner
+        self.record = record
+        self.name = "record" if record else "replay"
+        self._lock = threading.Lock()
+
+    def chat(self, model, messages, timeout=None, check_abort=None):
+        path = self.directory / f"{recording_key(model, messages)}.json"
+        if not self.record:
+            if not path.exists():
+                raise LookupError(f"No recorded response for this prompt ({path.name}) in {self.directory}.")
+            return ChatCompletion(**json.loads(path.read_text(encoding="utf-8"))["response"])
+
+        completion = self.inner.chat(model, messages, timeout, check_abort)
+        payload = {"model": model, "messages": messages, "response": asdict(completion)}
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+            os.replace(temp_path, path)
+        return completion
+
+
+def _sleep(seconds, check_abort=None, step_s=0.05):
+    """Simulated generation time, polling `check_abort` so an aborted call stops early."""
+    end = time.monotonic() + seconds
+    while True:
+        if check_abort:
+            check_abort()
+        left = end - time.monotonic()
+        if left <= 0:
+            return
+        time.sleep(min(step_s, left))
+
+
+def recording_key(model, messages):
+    data = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def create_llm_backend(kind=LLM_BACKEND):
+    """Builds the backend named by LLM_BACKEND: openai, local, record or replay."""
+    kind = (kind or "openai").lower()
+    if kind == "openai":
+        return OpenAIBackend()
+    if kind == "local":
+        return LocalBackend()
+    if kind == "record":
+        return RecordReplayBackend(inner=OpenAIBackend(), record=True)
+    if kind == "replay":
+        return RecordReplayBackend()
+    raise ValueError(f"Unknown LLM_BACKEND '{kind}' (expected openai, local, record or replay).")
+
+
+# ---------------------- 🧪 LOCAL REPLIES ----------------------
+_SLIDE_COUNT = re.compile(r"(\d+)\s*(?:unique|-slide|slides)", re.IGNORECASE)
+
+
+def local_completion_text(messages):
+    """Builds a plausible reply for the last user message (pure function of the prompt)."""
+    prompt = messages[-1]["content"] if messages else ""
+    match = _SLIDE_COUNT.search(prompt)
+    num_slides = int(match.group(1)) if match else 5
+    seed = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:6]
+
+    if "slide titles" in prompt:
+        return "\n".join(f"{i}. Key aspect {i} ({seed})" for i in range(1, num_slides + 1))
+    if "Expected Output Format" in prompt:
+        return "\n\n".join(
+            f"Slide {i}: **Subtopic {i}**\n- Point A\n- Point B\n- Point C" for i in range(1, num_slides + 1)
+        )
+    return "\n".join([
+        f"Overview: generated content {seed}",
+        "- First supporting point with a short explanation",
+        "- Second supporting point with a concrete example",
+        "- Third supporting point with an implication",
+    ])
+
+
+def count_tokens(text):
+    """Rough token estimate (~4 characters per token), good enough for latency modelling."""
+    return max(1, len(text) // 4)
@@ -0,0 +1,159 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from backend.cancellation import RequestCancelled, cancellation_stats, check_cancelled, remaining_time
+from backend.config import USAGE_FLUSH_BATCH, USAGE_FLUSH_SECONDS
+from backend.db_handler import store_llm_usage_batch
+from backend.fair_scheduler import fair_scheduler
+from backend.model_router import model_router
+from backend.request_context import get_request_id
+from backend.tracing import span
+
+
+# ---------------------- 🧾 LLM USAGE ACCOUNTING ----------------------
+class UsageTracker:
+    """
+    Records prompt/completion/cached tokens, latency and model for every LLM call.
+    - Rows are buffered in memory and written to `llm_usage` in batches
+      (every `flush_batch` rows or `flush_seconds`, whichever comes first).
+    - A per-request summary is kept until the request collects it with `pop_summary`.
+    """
+
+    def __init__(self, flush_batch=USAGE_FLUSH_BATCH, flush_seconds=USAGE_FLUSH_SECONDS):
+        self.flush_batch = flush_batch
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._summaries = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stopped = threading.Event()
+
+    def record(self, stage, model, completion, latency_s):
+        """Records one completed LLM call (a `ChatCompletion`) for the request bound to the current context."""
+        prompt_tokens = completion.prompt_tokens
+        completion_tokens = completion.completion_tokens
+        cached_tokens = completion.cached_tokens
+        model = completion.model or model
+        latency_ms = round(latency_s * 1000, 1)
+        request_id = get_request_id()
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+        with self._lock:
+            self._buffer.append(
+                (request_id, stage, model, prompt_tokens, completion_tokens, cached_tokens, latency_ms, timestamp)
+            )
+            if request_id:
+                summary = self._summaries.setdefault(request_id, _empty_summary())
+                _add_call(summary, prompt_tokens, completion_tokens, cached_tokens, latency_ms)
+                _add_call(summary["by_stage"].setdefault(stage, _empty_totals()),
+                          prompt_tokens, completion_tokens, cached_tokens, latency_ms)
+                summary["models"][model] = summary["models"].get(model, 0) + 1
+            should_flush = len(self._buffer) >= self.flush_batch
+
+        self._ensure_flusher()
+        if should_flush:
+            self.flush()
+
+    def summary(self, request_id):
+        """Returns a copy of a request's usage totals so far (it stays available to `pop_summary`)."""
+        with self._lock:
+            summary = self._summaries.get(request_id)
+            return {key: summary[key] for key in _empty_totals()} if summary else _empty_totals()
+
+    def pop_summary(self, request_id):
+        """Returns and forgets the usage summary of a request (empty if it made no calls)."""
+        with self._lock:
+            return self._summaries.pop(request_id, None) or _empty_summary()
+
+    def flush(self):
+        """Writes all buffered rows to the database in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            try:
+                store_llm_usage_batch(rows)
+            except Exception as e:
+                # Keep the rows for the next attempt rather than losing accounting data.
+                print(f"⚠️ Failed to store LLM usage ({len(rows)} rows): {str(e)}")
+                with self._lock:
+                    self._buffer[:0] = rows
+
+    def stop(self):
+        self._stopped.set()
+        self.flush()
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._stopped.clear()
+                    self._flusher = threading.Thread(target=self._flush_periodically, name="usage-flusher", daemon=True)
+                    self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_seconds):
+            if self._buffer:
+                self.flush()
+        self._flusher = None
+
+
+def _empty_totals():
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "latency_ms": 0.0}
+
+
+def _empty_summary():
+    summary = _empty_totals()
+    summary["by_stage"] = {}
+    summary["models"] = {}
+    return summary
+
+
+def _add_call(totals, prompt_tokens, completion_tokens, cached_tokens, latency_ms):
+    totals["calls"] += 1
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["cached_tokens"] += cached_tokens
+    totals["latency_ms"] = round(totals["latency_ms"] + latency_ms, 1)
+
+
+usage_tracker = UsageTracker()
+
+
+# ---------------------- 🤖 TRACKED CHAT COMPLETION ----------------------
+def tracked_chat_completion(llm, stage, messages, model=None):
+    """
+    Sends a chat call through the LLM backend `llm` and records its usage under `stage`.
+    Without an explicit `model`, the stage's model is picked by the model router.
+    Cancelled work skips the call; a call in flight is aborted once its work is cancelled
+    (client gone, deadline passed or its pipeline failed), raising RequestCancelled.
+    Inside a scheduled job, the call first waits for a fair-share slot of its tenant.
+    Returns the backend's `ChatCompletion`.
+    """
+    check_cancelled(skipped="llm_calls_skipped")
+    model = model or model_router.choose(stage)
+    with fair_scheduler.slot(), span("llm.chat", stage=stage, model=model) as call_span:
+        timeout = remaining_time()
+        start = time.perf_counter()
+        try:
+            completion = llm.chat(model, messages, timeout=timeout, check_abort=check_cancelled)
+        except RequestCancelled:
+            cancellation_stats.record("llm_calls_aborted")
+            call_span.set(aborted=True)
+            raise
+        except TimeoutError:
+            if timeout is not None:
+                cancellation_stats.record("llm_calls_aborted")
+                check_cancelled()  # Report the deadline rather than a timeout when the request ran out of time.
+            model_router.record_call(stage, model, (time.perf_counter() - start) * 1000, ok=False)
+            raise
+        except Exception:
+            model_router.record_call(stage, model, (time.perf_counter() - start) * 1000, ok=False)
+            raise
+        latency_s = time.perf_counter() - start
+        call_span.set(prompt_tokens=completion.prompt_tokens, completion_tokens=completion.completion_tokens,
+                      cached_tokens=completion.cached_tokens)
+    model_router.record_call(stage, model, latency_s * 1000)
+    usage_tracker.record(stage, model, completion, latency_s)
+    return completion
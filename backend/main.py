@@ -1,46 +1,118 @@
+import asyncio
+import contextvars
 import os
-from pathlib import Path
-
-import openai
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, model_validator
 from pptx import Presentation
-from pptx.util import Inches
-from backend.format_ppt import apply_formatting
-from backend.requirement_enricher import RequirementEnricher
-from backend.db_handler import store_ai_feedback, retrieve_common_feedback
+from backend.llm_backend import create_llm_backend
+from backend.llm_usage import tracked_chat_completion, usage_tracker
+from backend.model_router import model_router
+from backend.output_lifecycle import output_lifecycle
+from backend.cancellation import (
+    CLIENT_DISCONNECTED,
+    DEADLINE_EXCEEDED,
+    CancelToken,
+    PipelineCancellation,
+    RequestCancelled,
+    cancellation_stats,
+    check_cancelled,
+    current_cancellation,
+)
+from backend.cache_warmer import CacheWarmer
+from backend.checkpoints import GenerationCheckpoint
+from backend.config import (
+    DISCONNECT_POLL_SECONDS,
+    LARGE_DECK_DEADLINE_SECONDS,
+    LARGE_DECK_MAX_SLIDES,
+    LARGE_DECK_WINDOW,
+    MAX_SLIDES,
+    OUTPUT_DIR,
+    REQUEST_DEADLINE_SECONDS,
+    SCHEDULER_TRUSTED_PROXIES,
+)
+from backend.fair_scheduler import (
+    ANONYMOUS_TENANT,
+    fair_scheduler,
+    job_priority,
+    parse_networks,
+    scheduled_job,
+    tenant_for,
+)
+from backend.file_hash import file_content_hash
+from backend.generation_cache import REQUEST, GenerationCache
+from backend.large_deck import plan_sections, run_windowed, section_overview
+from backend.pipeline import Pipeline
+from backend.profiling import list_profiles, profile_path, profile_request, profile_summary, profiled_call
+from backend.render_worker import render_pool
+from backend.request_context import get_request_id, start_request
+from backend.request_key import canonical_request_hash
+from backend.retry import RetryBudget, call_with_retry
+from backend.single_flight import SingleFlight
+from backend.slide_prompts import slide_messages
+from backend.thumbnails import PENDING, READY, thumbnail_service
+from backend.tracing import span, span_exporter, start_trace
+from backend.requirement_enricher import RequirementEnricher, fallback_titles
+from backend.db_handler import (
+    append_deck_slides,
+    db,
+    delete_deck_state,
+    retrieve_deck_state,
+    retrieve_usage_report,
+    store_ai_feedback,
+    store_ai_feedback_batch,
+    store_deck_state,
+    store_user_feedback,
+    store_user_preferences,
+    update_deck_slides,
+)
 
 # ------------------------- 🚀 Initialize FastAPI App -------------------------
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    output_lifecycle.start()
+    cache_warmer.start()
+    yield
+    cache_warmer.stop()
+    output_lifecycle.stop()
+    render_pool.shutdown()
+    thumbnail_service.shutdown()
+    usage_tracker.stop()
+    span_exporter.stop()
+    db.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def home():
     return {"message": "AI Presentation Generator is Running!"}
 
 # ------------------------- 📁 File Paths -------------------------
-BASE_DIR = Path(__file__).resolve().parents[1]
-OUTPUT_DIR = BASE_DIR / "output"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# ------------------------- 🤖 Load OpenAI API Key -------------------------
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
-    raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY as an environment variable.")
-
-client = openai.OpenAI(api_key=openai_api_key)
-enricher = RequirementEnricher(api_key=openai_api_key)
+# ------------------------- 🤖 LLM Backend -------------------------
+# Chosen by LLM_BACKEND; only the OpenAI-backed providers need OPENAI_API_KEY.
+llm = create_llm_backend()
+enricher = RequirementEnricher(llm)
 
-SYSTEM_PROMPT = (
-    "You are an expert presentation writer who creates concise, bulleted slide content. "
-    "Respond only with the body copy for the slide. Do not include slide numbers, titles, "
-    "or any assistant preamble or postscript."
-)
+generation_flight = SingleFlight()
+# Clients allowed to name the tenant they schedule for (X-Tenant-ID), e.g. the Streamlit frontend.
+TRUSTED_PROXIES = parse_networks(SCHEDULER_TRUSTED_PROXIES)
 
 # ------------------------- 📄 Request Model -------------------------
 class PresentationRequest(BaseModel):
     topic: str = Field(..., example="AI in Finance")
-    num_slides: int = Field(..., ge=1, le=20, example=5)
+    num_slides: int = Field(..., ge=1, le=LARGE_DECK_MAX_SLIDES, example=5)
     audience: str = Field(default="General Public")
     duration: int = Field(default=20)
     purpose: str = Field(default="Explain how AI is used in finance.")
@@ -48,101 +120,614 @@ class PresentationRequest(BaseModel):
     font_choice: str = Field(default="Arial")
     color_scheme: str = Field(default="#000000")  # Used as font color now
     additional_notes: str = Field(default="")
+    large_deck: bool = Field(default=False, description="Sectioned, streamed generation for decks with hundreds of slides.")
+
+    @model_validator(mode="after")
+    def check_slide_limit(self):
+        if self.num_slides > MAX_SLIDES and not self.large_deck:
+            raise ValueError(f"num_slides above {MAX_SLIDES} requires large_deck mode.")
+        return self
+
+
+class SlideFeedback(BaseModel):
+    slide_number: int = Field(..., ge=1, example=2)
+    feedback: str = Field(..., min_length=1, example="Add a concrete example from retail banking.")
+
+
+class RegenerateSlidesRequest(BaseModel):
+    deck_id: str = Field(..., example="3f2a9c0e5b7d4e1f8a6b2c4d9e0f1a3b")
+    slides: List[SlideFeedback] = Field(..., min_length=1)
+
+# ------------------------- ✍️ Slide Content Generation -------------------------
+def generate_slide_content(index, title, refined_prompt, num_slides, previous_content=None, feedback=None):
+    """
+    Generates the body copy for a single slide (one LLM round trip).
+    When `feedback` is given, the model revises `previous_content` instead of starting fresh.
+    """
+    try:
+        with span("slide", slide_number=index + 1, revision=bool(feedback)):
+            response = tracked_chat_completion(
+                llm,
+                "slide_revision" if feedback else "slide",
+                slide_messages(index, title, refined_prompt, num_slides, previous_content, feedback),
+            )
+            content = response.content.strip()
+            model_router.record_quality("slide_revision" if feedback else "slide", bool(content))
+            if not content:
+                raise ValueError(f"Empty response for slide {index + 1}.")
+            return content
+    except RequestCancelled:
+        raise
+    except Exception as api_error:
+        raise HTTPException(status_code=500, detail=f"❌ GPT API Error: {str(api_error)}") from api_error
+
+
+# ------------------------- 🗃️ Cached Generation Stages -------------------------
+# Titles, enrichment and slides pre-generated for the most requested decks by the cache
+# warmer (and, if live caching is on, outputs of recent requests with identical inputs).
+def cached_titles(topic, num_slides, retry_budget, source=REQUEST):
+    return generation_cache.get_or_compute("titles", (topic, num_slides), lambda: call_with_retry(
+        lambda: enricher.generate_slide_titles(topic, num_slides),
+        retry_budget, label="titles",
+    ), source)
+
+
+def cached_enrichment(topic, audience, duration, purpose, num_slides, retry_budget, source=REQUEST):
+    # The past feedback is part of the key, so newly recorded feedback always reaches the outline.
+    past_feedback = enricher.past_feedback(topic)
+    outline = generation_cache.get_or_compute(
+        "enrichment", (topic, audience, duration, purpose, num_slides, past_feedback), lambda: call_with_retry(
+            lambda: enricher.enrich_prompt(
+                topic, audience, duration, purpose, num_slides, past_feedback=past_feedback, record=False
+            ),
+            retry_budget, label="enrichment",
+        ), source,
+    )
+    if source == REQUEST:
+        enricher.record_outline(topic, outline)  # Only outlines that reach a deck become feedback.
+    return outline
+
+
+def cached_slide(index, title, refined_prompt, num_slides, retry_budget, source=REQUEST):
+    return generation_cache.get_or_compute("slide", (index, title, refined_prompt, num_slides), lambda: call_with_retry(
+        lambda: generate_slide_content(index, title, refined_prompt, num_slides),
+        retry_budget, label=f"slide {index + 1}",
+    ), source)
+
+
+generation_cache = GenerationCache(namespace=llm.name)
+cache_warmer = CacheWarmer(
+    generation_cache,
+    {"titles": cached_titles, "enrichment": cached_enrichment, "slide": cached_slide},
+    defaults={name: PresentationRequest.model_fields[name].default for name in ("audience", "duration", "purpose")},
+)
+
+
+# ------------------------- 🖼️ Slide Rendering -------------------------
+def render_presentation(request, titles, slide_contents, file_path):
+    """
+    Builds, formats and saves the deck once every slide's content is available.
+    The CPU-bound python-pptx work runs in the render worker pool; only bytes come back.
+    Returns the size optimization report of the saved deck.
+    """
+    check_cancelled(skipped="renders_skipped")  # Nobody is waiting for this deck any more.
+
+    # ✅ Store AI Feedback for Continuous Improvement
+    store_ai_feedback_batch(request.topic, slide_contents)
+
+    # ✅ Generate Slides with AI-Formatted Content
+    pptx_bytes, optimization = render_pool.render({
+        "titles": list(titles),
+        "bodies": list(slide_contents),
+        "preferences": user_preferences_for(request.model_dump()),
+    })
+    write_output(file_path, pptx_bytes)
+    thumbnail_service.submit(file_path)
+    print(f"🗜️ {file_path.name}: {optimization['optimized_bytes']} bytes")
+    return optimization
+
+
+def user_preferences_for(request_data):
+    """Formatting preferences (plain data, safe to send to render workers) for a request."""
+    return {
+        "font_choice": request_data.get("font_choice", "Arial"),
+        "color_scheme": request_data.get("color_scheme", "#000000"),
+    }
+
+
+def write_output(file_path, data):
+    """Writes a deck atomically so concurrent downloads never see a half-written file."""
+    with span("write_output", bytes=len(data)):
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        try:
+            replaced_size = file_path.stat().st_size
+        except FileNotFoundError:
+            replaced_size = None
+        os.replace(tmp_path, file_path)
+    output_lifecycle.record_write(file_path, len(data), replaced_size)
+
 
 # ------------------------- 📝 Generate PPT with AI Optimization -------------------------
 @app.post("/generate_ppt")
-def generate_ppt(request: PresentationRequest):
+async def generate_ppt_endpoint(request: PresentationRequest, http_request: Request, profile: bool = False):
+    """
+    Generates the deck in a worker thread while watching the connection: once the client is gone
+    (closed tab, client-side timeout) or the deadline passes, pending LLM calls and the render are
+    skipped. Finished stages stay checkpointed, so resubmitting the request resumes from them.
+    """
+    cancel_token = CancelToken(request_deadline(request, http_request.headers.get("x-request-timeout")))
+    # ✅ Opt-in profiling (`X-Profile: 1` header or `?profile=1`), sampled by PROFILE_SAMPLE_RATE
+    profile_requested = profile or http_request.headers.get("x-profile", "").lower() in ("1", "true", "yes")
+    work = asyncio.ensure_future(run_in_threadpool(
+        generate_ppt, request, http_request.headers.get("traceparent"), profile_requested, cancel_token,
+        tenant_of(http_request),
+    ))
+    while not work.done():
+        await asyncio.wait({work}, timeout=DISCONNECT_POLL_SECONDS)
+        if not work.done() and cancel_token.reason is None and await http_request.is_disconnected():
+            print("🔌 Client disconnected; cancelling its generation")
+            cancel_token.cancel(CLIENT_DISCONNECTED)
+    return work.result()
+
+
+def request_deadline(request, timeout_header=None):
+    """Seconds a generation may take: the server limit, lowered by a client's `X-Request-Timeout`."""
+    limit = LARGE_DECK_DEADLINE_SECONDS if request.large_deck else REQUEST_DEADLINE_SECONDS
     try:
-        print(f"🟢 Generating PPT for topic: {request.topic} | Slides: {request.num_slides}")
+        requested = float(timeout_header) if timeout_header else None
+    except ValueError:
+        requested = None
+    return min(limit, requested) if requested and requested > 0 else limit
+
+
+def generate_ppt(request, traceparent=None, profile=False, cancel_token=None, tenant=ANONYMOUS_TENANT):
+    """Generates a deck (or joins an identical generation already in flight); returns the API response."""
+    request_id = start_request()
+    request_hash = canonical_request_hash(request.model_dump())
+    # ✅ Every request's brief is kept; the most frequent ones are pre-generated by the cache warmer
+    store_user_preferences(request.topic, request.num_slides, request.font_choice, request.color_scheme,
+                           audience=request.audience, duration=request.duration, purpose=request.purpose)
+
+    # ✅ Spans join the caller's trace when a W3C `traceparent` header is sent (e.g. by the frontend)
+    # ✅ LLM calls are fair-queued per tenant; small decks go ahead of bulk ones
+    with start_trace("POST /generate_ppt", request_id, traceparent,
+                     topic=request.topic, num_slides=request.num_slides, tenant=tenant) as root, \
+            profile_request(request_id, profile) as request_profile, \
+            scheduled_job(tenant, job_priority(request.num_slides, request.large_deck)):
+        for attempt in (1, 2):
+            try:
+                # ✅ Identical requests already in flight share one generation instead of repeating it
+                result, coalesced = profiled_call(
+                    generation_flight.do, request_hash, lambda: build_presentation(request, request_hash),
+                    cancel_token,
+                )
+                break
+            except RequestCancelled as e:
+                # A follower can inherit the cancellation of a generation every other client left;
+                # if this client is still waiting, it starts over (resuming from the checkpoint).
+                if attempt == 1 and cancel_token is not None and cancel_token.reason is None:
+                    continue
+                usage_tracker.pop_summary(request_id)
+                cancellation_stats.record_cancelled(e.reason)
+                root.set(cancelled=e.reason)
+                raise HTTPException(
+                    status_code=504 if e.reason == DEADLINE_EXCEEDED else 499,
+                    detail=f"❌ Generation cancelled ({e.reason}). Completed slides were kept; "
+                           "submit the same request again to resume.",
+                ) from e
+        root.set(coalesced=coalesced)
+
+    if coalesced:
+        print(f"🤝 Request {request_id} coalesced with in-flight request {result['request_id']}")
+        result = {
+            **result,
+            "request_id": request_id,
+            "coalesced_with": result["request_id"],
+            "usage": usage_tracker.pop_summary(request_id),
+        }
+    result = {**result, "trace_id": root.trace_id}
+    if request_profile is not None and request_profile.saved_path:
+        result["profile"] = f"/profiles/{request_id}"
+    return result
 
-        filename = f"{request.topic.replace(' ', '_')}_presentation.pptx"
-        file_path = OUTPUT_DIR / filename
 
-        if file_path.exists():
-            file_path.unlink()
+def _traceparent(http_request):
+    return http_request.headers.get("traceparent") if http_request is not None else None
 
-        prs = Presentation()
 
-        # ✅ AI-Generated Slide Titles (Enforcing Slide Count)
-        enriched_titles = enricher.generate_slide_titles(request.topic, request.num_slides)
+def tenant_of(http_request):
+    """Who a request is scheduled for: the client's address, or `X-Tenant-ID` from a trusted proxy."""
+    if http_request is None:
+        return ANONYMOUS_TENANT
+    client_host = http_request.client.host if http_request.client is not None else None
+    return tenant_for(client_host, http_request.headers.get("x-tenant-id"), TRUSTED_PROXIES)
 
-        # ✅ AI-Optimized Prompt for Content (Enforcing Slide Count)
-        refined_prompt = enricher.enrich_prompt(
-            request.topic, request.audience, request.duration, request.purpose, request.num_slides
-        )
 
-        # ✅ GPT-Generated Slide Content (Batch Processing + Slide Count Fix)
-        slides_prompts = [
-            {
-                "role": "user",
-                "content": f"Slide {i+1}: {enriched_titles[i]}\n{refined_prompt}\nEnsure {request.num_slides} slides."
-            }
-            for i in range(request.num_slides)
-        ]
+def build_presentation(request, request_hash):
+    """Runs the full generation pipeline for a request and returns the API response."""
+    request_id = get_request_id()
+    try:
+        print(f"🟢 Generating PPT for topic: {request.topic} | Slides: {request.num_slides}"
+              f"{' (large deck)' if request.large_deck else ''}")
 
-        slide_contents = []
-        for idx, user_prompt in enumerate(slides_prompts):
-            try:
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        user_prompt,
-                    ],
-                )
-                content = response.choices[0].message.content.strip()
-                if not content:
-                    raise ValueError(f"Empty response for slide {idx + 1}.")
-                slide_contents.append(content)
-            except Exception as api_error:
-                raise HTTPException(status_code=500, detail=f"❌ GPT API Error: {str(api_error)}") from api_error
-
-        # ✅ Ensure Slide Content Matches Requested Count
-        if len(slide_contents) != request.num_slides:
-            raise HTTPException(
-                status_code=500,
-                detail=f"⚠️ AI returned {len(slide_contents)} slides instead of {request.num_slides}. Please retry."
-            )
+        deck_id = uuid.uuid4().hex
+        filename = f"{request.topic.replace(' ', '_')}_{deck_id[:8]}_presentation.pptx"
+        file_path = OUTPUT_DIR / filename
 
-        # ✅ Generate Slides with AI-Formatted Content
-        for i, slide_content in enumerate(slide_contents):
-            slide = prs.slides.add_slide(prs.slide_layouts[5])
-            title_shape = slide.shapes.title
-            if title_shape:
-                title_shape.text = enriched_titles[i]
-            else:
-                title_box = slide.shapes.add_textbox(Inches(1), Inches(0.3), Inches(8), Inches(1))
-                title_box.text_frame.text = enriched_titles[i]
-
-            left, top, width, height = Inches(1), Inches(1.5), Inches(8), Inches(4)
-            text_box = slide.shapes.add_textbox(left, top, width, height)
-            text_frame = text_box.text_frame
-            text_frame.text = slide_content
-
-            text_frame.margin_left = Inches(0.2)
-            text_frame.margin_right = Inches(0.2)
-            text_frame.margin_top = Inches(0.2)
-            text_frame.margin_bottom = Inches(0.2)
-            text_frame.word_wrap = True
-
-            # ✅ Store AI Feedback for Continuous Improvement
-            store_ai_feedback(request.topic, i+1, slide_content)
-
-        # ✅ Apply AI-Driven Formatting
-        user_preferences = {
-            "font_choice": request.font_choice,
-            "color_scheme": request.color_scheme,
+        # ✅ Finished stages are checkpointed; resubmitting a failed request resumes from them
+        checkpoint = GenerationCheckpoint(request_hash)
+        resumed_stages = checkpoint.resumed_items()
+        if resumed_stages:
+            print(f"♻️ Resuming from checkpoint: {', '.join(resumed_stages)}")
+        retry_budget = RetryBudget()
+
+        build_deck = build_large_deck if request.large_deck else build_regular_deck
+        details = build_deck(request, deck_id, filename, file_path, checkpoint, retry_budget)
+        checkpoint.clear()
+
+        return {
+            "message": "✅ Presentation created successfully",
+            "file": filename,
+            "deck_id": deck_id,
+            "request_id": request_id,
+            "num_slides": request.num_slides,
+            **details,
+            "resumed_stages": resumed_stages,
+            "retries_used": retry_budget.used,
+            "usage": usage_tracker.pop_summary(request_id),
         }
-        apply_formatting(prs, user_preferences)
 
-        prs.save(str(file_path))
-        print(f"✅ Presentation saved successfully: {file_path}")
+    except RequestCancelled as e:
+        usage_tracker.pop_summary(request_id)
+        cancellation_stats.record("stages_checkpointed", checkpoint.stored)
+        print(f"🛑 Generation cancelled ({e.reason}) after {checkpoint.stored} new stage(s); they stay checkpointed.")
+        raise
+    except Exception as e:
+        usage_tracker.pop_summary(request_id)
+        print(f"❌ Error generating presentation: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"❌ Error generating presentation: {str(e)}. Completed slides were kept; "
+                   "submit the same request again to resume.",
+        )
 
-        return {"message": "✅ Presentation created successfully", "file": filename}
 
+def checkpointed_titles(checkpoint, item, topic, num_slides, compute):
+    """
+    Runs a titles stage under the checkpoint. `compute` retries within the request's retry budget
+    and raises once that is spent; the generic fallback titles are used then, but never
+    checkpointed, so resubmitting the request asks the model again.
+    """
+    try:
+        return checkpoint.run(item, compute)
+    except RequestCancelled:
+        raise
     except Exception as e:
-        print(f"❌ Error generating presentation: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"❌ Error generating presentation: {str(e)}")
+        print(f"⚠️ {item} failed, using generic titles: {str(e)}")
+        return fallback_titles(topic, num_slides)
+
+
+def build_regular_deck(request, deck_id, filename, file_path, checkpoint, retry_budget):
+    """One-shot DAG pipeline: titles & enrichment, then every slide, then a single render."""
+
+    def titles_stage():
+        return checkpointed_titles(checkpoint, "titles", request.topic, request.num_slides, lambda: cached_titles(
+            request.topic, request.num_slides, retry_budget
+        ))
+
+    def enrichment_stage():
+        return checkpoint.run("enrichment", lambda: cached_enrichment(
+            request.topic, request.audience, request.duration, request.purpose, request.num_slides, retry_budget
+        ))
+
+    def slide_stage(i, titles, refined_prompt):
+        return checkpoint.run(f"slide_{i + 1}", lambda: cached_slide(
+            i, titles[i], refined_prompt, request.num_slides, retry_budget
+        ))
+
+    # ✅ Titles & enrichment are independent LLM calls, so they run concurrently.
+    # Each slide starts as soon as both are ready; rendering waits for every slide.
+    pipeline = Pipeline()
+    pipeline.add_stage("titles", titles_stage)
+    pipeline.add_stage("enrichment", enrichment_stage)
+
+    slide_stages = []
+    for i in range(request.num_slides):
+        stage_name = f"slide_{i + 1}"
+        pipeline.add_stage(
+            stage_name,
+            lambda titles, refined_prompt, i=i: slide_stage(i, titles, refined_prompt),
+            deps=("titles", "enrichment"),
+        )
+        slide_stages.append(stage_name)
+
+    pipeline.add_stage(
+        "render",
+        lambda titles, *slide_contents: render_presentation(request, titles, slide_contents, file_path),
+        deps=("titles", *slide_stages),
+    )
+
+    result = pipeline.run()
+    print(f"✅ Presentation saved successfully: {file_path} ({result.total_ms:.0f} ms)")
+
+    # ✅ Keep titles, enrichment & slide bodies so single slides can be regenerated later
+    store_deck_state(
+        deck_id, request.topic, filename, request.model_dump(),
+        result.results["titles"], result.results["enrichment"],
+        [result.results[name] for name in slide_stages],
+    )
+    return {
+        "timings": result.timings,
+        "critical_path": result.critical_path(),
+        "optimization": result.results["render"],
+    }
+
+
+def build_large_deck(request, deck_id, filename, file_path, checkpoint, retry_budget):
+    """
+    Large-deck mode: the deck is split into sections. Each section gets its own titles and
+    brief (planned one section ahead), and every slide is streamed into a render process
+    in deck order as soon as it is written, so at most LARGE_DECK_WINDOW slide bodies are
+    held at any time. Every step is checkpointed, as in the regular pipeline.
+    """
+    start_time = time.perf_counter()
+    sections = plan_sections(request.num_slides)
+    section_titles = checkpointed_titles(checkpoint, "sections", request.topic, len(sections), lambda: call_with_retry(
+        lambda: enricher.generate_slide_titles(request.topic, len(sections)),
+        retry_budget, label="section titles",
+    ))
+    print(f"📚 Large deck: {len(sections)} sections of ~{sections[0][1]} slides")
+
+    def plan_section(s):
+        """Titles & brief of one section (two concurrent LLM calls)."""
+        section_topic = f"{request.topic}: {section_titles[s]}"
+        count = sections[s][1]
+        titles = planner.submit(
+            contextvars.copy_context().run, profiled_call, checkpointed_titles, checkpoint, f"section_{s + 1}_titles",
+            section_topic, count, lambda: call_with_retry(
+                lambda: enricher.generate_slide_titles(section_topic, count),
+                retry_budget, label=f"section {s + 1} titles",
+            ),
+        )
+        brief = checkpoint.run(f"section_{s + 1}_brief", lambda: call_with_retry(
+            lambda: enricher.enrich_prompt(section_topic, request.audience, request.duration, request.purpose, count),
+            retry_budget, label=f"section {s + 1} brief",
+        ))
+        return titles.result(), brief
+
+    def slide_jobs():
+        # Planning runs one section ahead, so slides never wait for the next section's titles.
+        next_plan = planner.submit(contextvars.copy_context().run, profiled_call, plan_section, 0)
+        for s, (first, count) in enumerate(sections):
+            titles, brief = next_plan.result()
+            if s + 1 < len(sections):
+                next_plan = planner.submit(contextvars.copy_context().run, profiled_call, plan_section, s + 1)
+            for k in range(count):
+                yield lambda i=first + k, title=titles[k], brief=brief: (i, title, checkpoint.run(
+                    f"slide_{i + 1}", lambda: call_with_retry(
+                        lambda: generate_slide_content(i, title, brief, request.num_slides),
+                        retry_budget, label=f"slide {i + 1}",
+                    )))
+
+    # ✅ The deck state (for regenerating slides later) is written a chunk of slides at a time,
+    # so slide bodies never pile up in memory.
+    state_chunk = []
+
+    def flush_state():
+        if state_chunk:
+            append_deck_slides(deck_id, [title for title, _ in state_chunk], [body for _, body in state_chunk])
+            state_chunk.clear()
+
+    def render_slide(result):
+        i, title, body = result
+        stream.add_slide(title, body)
+        store_ai_feedback(request.topic, i + 1, body)
+        state_chunk.append((title, body))
+        if len(state_chunk) >= LARGE_DECK_WINDOW:
+            flush_state()
+
+    store_deck_state(
+        deck_id, request.topic, filename, request.model_dump(), [], section_overview(section_titles, sections), []
+    )
+    planner = ThreadPoolExecutor(max_workers=4, thread_name_prefix="section-planner")
+    # Section planning runs under its own scope too, so a failure also aborts its LLM calls.
+    cancellation = PipelineCancellation(current_cancellation.get())
+    scope = current_cancellation.set(cancellation)
+    try:
+        with render_pool.open_stream(user_preferences_for(request.model_dump())) as stream:
+            run_windowed(slide_jobs(), render_slide)
+            flush_state()
+            check_cancelled(skipped="renders_skipped")
+            pptx_bytes, optimization = stream.finish()
+    except BaseException:
+        cancellation.cancel()
+        delete_deck_state(deck_id)  # Only complete decks can have slides regenerated.
+        raise
+    finally:
+        current_cancellation.reset(scope)
+        planner.shutdown(wait=False, cancel_futures=True)
+
+    write_output(file_path, pptx_bytes)
+    thumbnail_service.submit(file_path)
+    total_ms = (time.perf_counter() - start_time) * 1000
+    print(f"✅ Large presentation saved successfully: {file_path} ({total_ms:.0f} ms, "
+          f"{optimization['optimized_bytes']} bytes)")
+    return {
+        "sections": len(sections),
+        "timings": {"total_ms": round(total_ms, 1)},
+        "optimization": optimization,
+    }
+
+
+# ------------------------- 🔁 Regenerate Selected Slides -------------------------
+_deck_locks = {}
+_deck_locks_guard = threading.Lock()
+
+
+def _deck_lock(deck_id):
+    with _deck_locks_guard:
+        return _deck_locks.setdefault(deck_id, threading.Lock())
+
+
+@app.post("/regenerate_slides")
+def regenerate_slides(request: RegenerateSlidesRequest, http_request: Request):
+    """
+    Regenerates only the slides that received feedback and patches them into the stored deck.
+    Titles and enrichment are reused from the original generation, so the cost is one
+    LLM call per changed slide regardless of deck size.
+    """
+    request_id = start_request()
+    tenant = tenant_of(http_request)
+    with start_trace("POST /regenerate_slides", request_id, _traceparent(http_request),
+                     deck_id=request.deck_id, tenant=tenant) as root, \
+            scheduled_job(tenant, job_priority(len(request.slides))):
+        return {**regenerate_deck_slides(request, request_id), "trace_id": root.trace_id}
+
+
+def regenerate_deck_slides(request, request_id):
+    """Patches the slides of a stored deck that received feedback; returns the API response."""
+    with _deck_lock(request.deck_id):
+        deck = retrieve_deck_state(request.deck_id)
+        if not deck:
+            raise HTTPException(status_code=404, detail=f"❌ Deck '{request.deck_id}' not found.")
+
+        file_path = OUTPUT_DIR / deck["filename"]
+        if not file_path.exists():
+            raise HTTPException(status_code=404, detail=f"❌ File '{deck['filename']}' not found.")
+
+        num_slides = len(deck["slides"])
+        feedback_by_slide = {}
+        for item in request.slides:
+            if item.slide_number > num_slides:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"❌ Slide {item.slide_number} does not exist (deck has {num_slides} slides)."
+                )
+            # Several comments on the same slide are applied together.
+            feedback_by_slide.setdefault(item.slide_number, []).append(item.feedback.strip())
+
+        try:
+            print(f"🔁 Regenerating slides {sorted(feedback_by_slide)} of deck {request.deck_id}")
+
+            pipeline = Pipeline()
+            for slide_number, comments in feedback_by_slide.items():
+                index = slide_number - 1
+                pipeline.add_stage(
+                    f"slide_{slide_number}",
+                    lambda index=index, comments=comments: generate_slide_content(
+                        index, deck["titles"][index], deck["refined_prompt"], num_slides,
+                        previous_content=deck["slides"][index], feedback="\n".join(comments),
+                    ),
+                )
+            result = pipeline.run()
+
+            # ✅ Patch only the regenerated slides into the stored presentation
+            patches = {
+                slide_number: result.results[f"slide_{slide_number}"] for slide_number in feedback_by_slide
+            }
+            slides = list(deck["slides"])
+            for slide_number, new_content in patches.items():
+                slides[slide_number - 1] = new_content
+
+            pptx_bytes, optimization = render_pool.patch(
+                file_path.read_bytes(), patches, user_preferences_for(deck["request"])
+            )
+            write_output(file_path, pptx_bytes)
+            thumbnail_service.submit(file_path)
+
+            update_deck_slides(request.deck_id, slides)
+            for comments in feedback_by_slide.values():
+                for comment in comments:
+                    store_user_feedback(deck["topic"], comment)
+
+        except Exception as e:
+            usage_tracker.pop_summary(request_id)
+            print(f"❌ Error regenerating slides: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"❌ Error regenerating slides: {str(e)}")
+
+    return {
+        "message": "✅ Slides regenerated successfully",
+        "file": deck["filename"],
+        "deck_id": request.deck_id,
+        "regenerated": sorted(feedback_by_slide),
+        "request_id": request_id,
+        "timings": result.timings,
+        "optimization": optimization,
+        "usage": usage_tracker.pop_summary(request_id),
+    }
+
+
+# ------------------------- 🧾 LLM Usage Report -------------------------
+@app.get("/usage_report")
+async def usage_report(since: Optional[str] = None):
+    """
+    Aggregated token usage & latency per pipeline stage and model.
+    `since` filters by UTC timestamp, e.g. `2025-01-31` or `2025-01-31 12:00:00`.
+    The queries run on the database threads, so the event loop keeps serving other requests.
+    """
+    await db.run_async(usage_tracker.flush)  # Include calls still waiting in the write buffer.
+    stages = await db.run_async(retrieve_usage_report, since)
+    totals = {
+        key: sum(row[key] for row in stages)
+        for key in ("calls", "prompt_tokens", "completion_tokens", "cached_tokens")
+    }
+    totals["cached_ratio"] = round(totals["cached_tokens"] / totals["prompt_tokens"], 4) if totals["prompt_tokens"] else 0.0
+    return {"since": since, "totals": totals, "stages": stages}
+
+
+# ------------------------- 📈 Metrics -------------------------
+@app.get("/metrics")
+def metrics():
+    """Operational counters of the generation service."""
+    return {
+        "llm_backend": llm.name,
+        "coalescing": generation_flight.metrics(),
+        "model_routing": model_router.report(),
+        "database": db.stats(),
+        "cancellation": cancellation_stats.metrics(),
+        "output": output_lifecycle.metrics(),
+        "generation_cache": cache_warmer.metrics(),
+        "scheduler": fair_scheduler.metrics(),
+    }
+
+
+@app.post("/warm_cache", status_code=202)
+def warm_cache():
+    """
+    Starts a cache warming pass in the background (within the configured LLM budget).
+    Its report shows up under `generation_cache.last_run` in /metrics once it finished.
+    """
+    if not cache_warmer.run_in_background():
+        raise HTTPException(status_code=409, detail="❌ A cache warming run is already in progress.")
+    return {"status": "started"}
+
+
+# ------------------------- 🔬 Request Profiles -------------------------
+@app.get("/profiles")
+def profiles():
+    """Saved request profiles, newest first (record one with `?profile=1` on /generate_ppt)."""
+    return {"profiles": list_profiles()}
+
+
+@app.get("/profiles/{request_id}")
+def download_profile(request_id: str):
+    """Downloads a request's cProfile dump (load with `pstats.Stats(path)` or snakeviz)."""
+    path = profile_path(request_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"❌ No profile for request '{request_id}'.")
+    return FileResponse(str(path), media_type="application/octet-stream", filename=path.name)
+
+
+@app.get("/profiles/{request_id}/summary")
+def profile_top_functions(request_id: str, sort: str = "cumulative", limit: int = Query(40, ge=1, le=500)):
+    """The slowest functions of a request's profile as plain pstats text."""
+    path = profile_path(request_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"❌ No profile for request '{request_id}'.")
+    if sort not in ("cumulative", "tottime", "ncalls"):
+        raise HTTPException(status_code=400, detail="❌ sort must be one of: cumulative, tottime, ncalls.")
+    return PlainTextResponse(profile_summary(path, sort, limit))
 
 
 # ------------------------- 📥 Smart Backend Preview -------------------------
@@ -163,14 +748,98 @@ def preview_ppt(filename: str):
     return {"preview": "\n\n".join(preview)}
 
 
-# ------------------------- 📥 Download PPT -------------------------
-@app.get("/download_ppt/{filename}")
-def download_ppt(filename: str):
+# ------------------------- 🖼️ Slide Thumbnails -------------------------
+THUMBNAIL_CACHE_CONTROL = "public, max-age=31536000, immutable"  # URLs are content-addressed
+
+
+@app.get("/thumbnails/{filename}")
+def slide_thumbnails(filename: str):
+    """
+    Lists the slide images of a deck. The first request for a deck starts a background
+    render and answers 202; once ready, the image URLs never change for that deck content.
+    """
     file_path = OUTPUT_DIR / filename
     if not file_path.exists():
         raise HTTPException(status_code=404, detail=f"❌ File '{filename}' not found.")
-    
-    return FileResponse(str(file_path), media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation", filename=filename)
+
+    status, deck_hash, slide_count = thumbnail_service.lookup(file_path)
+    body = {
+        "status": status,
+        "deck_hash": deck_hash,
+        "slides": [f"/thumbnails/{deck_hash}/{n}.png" for n in range(1, slide_count + 1)] if status == READY else [],
+    }
+    if status == PENDING:
+        return JSONResponse(body, status_code=202, headers={"Retry-After": "2", "Cache-Control": "no-store"})
+    # The deck behind a filename can be regenerated, so the listing is always revalidated.
+    return JSONResponse(body, headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/thumbnails/{deck_hash}/{slide_number}.png")
+def slide_thumbnail(deck_hash: str, slide_number: int, request: Request):
+    """Serves one cached slide image; the content hash in the URL makes it cacheable forever."""
+    image_path = thumbnail_service.image_path(deck_hash, slide_number)
+    if image_path is None:
+        raise HTTPException(status_code=404, detail="❌ Thumbnail not found.")
+
+    etag = f'"{deck_hash}-{slide_number}"'
+    headers = {"ETag": etag, "Cache-Control": THUMBNAIL_CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(image_path, media_type="image/png", headers=headers)
+
+
+def _not_modified(request, etag, last_modified=None):
+    """
+    True when the client's cached copy is current: its If-None-Match lists `etag`, or (only
+    without If-None-Match) If-Modified-Since is not older than `last_modified` (unix seconds).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False  # Unparseable dates are ignored.
+    return int(last_modified) <= since
+
+
+# ------------------------- 📥 Download PPT -------------------------
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+# Regenerating slides rewrites a deck under the same name, so clients revalidate every time;
+# with the content-hash ETag an unchanged deck costs a 304 instead of a re-download.
+DOWNLOAD_CACHE_CONTROL = "private, no-cache"
+
+
+@app.api_route("/download_ppt/{filename}", methods=["GET", "HEAD"])
+def download_ppt(filename: str, request: Request):
+    """
+    Serves a generated deck.
+    - Strong ETag (content SHA-256) and Last-Modified; matching If-None-Match / If-Modified-Since → 304.
+    - Range / If-Range requests (resumed downloads) → 206 with only the requested bytes.
+    - HEAD answers with the same headers without reading the file.
+    """
+    file_path = OUTPUT_DIR / filename
+    try:
+        stat_result = file_path.stat()
+        etag = f'"{file_content_hash(file_path)}"'
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"❌ File '{filename}' not found.")
+
+    output_lifecycle.touch(filename)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(file_path, media_type=PPTX_MEDIA_TYPE, filename=filename, headers=headers,
+                        stat_result=stat_result)
 
 # ------------------------- 🏁 Start API -------------------------
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+import statistics
+import threading
+from collections import deque
+from contextvars import ContextVar
+
+from backend.config import (
+    FALLBACK_MODEL,
+    ROUTING_PROBE_EVERY,
+    ROUTING_WINDOW,
+    STAGE_LATENCY_TARGETS_MS,
+    STAGE_MODELS,
+)
+
+DEFAULT_MODEL = "gpt-4o"
+
+# Model of the most recent routed call in the current context (each pipeline stage has its own),
+# so quality checks made right after a call are credited to the model that produced it.
+_last_model = ContextVar("last_routed_model", default=None)
+
+
+# ---------------------- 🧭 MODEL ROUTING ----------------------
+class ModelRouter:
+    """
+    Picks the model for each LLM stage and keeps the counters needed to tune that choice.
+    - Each stage has its own model and a latency target (see config).
+    - When the median of the stage's recent calls on its model exceeds the target, calls are
+      routed to the faster fallback model; every `probe_every`th call still goes to the stage's
+      own model, and one probe within the target switches the route back.
+    - Per-model counters: calls, errors, latency and quality checks passed/failed.
+    """
+
+    def __init__(self, stage_models=None, latency_targets_ms=None, fallback_model=FALLBACK_MODEL,
+                 window=ROUTING_WINDOW, probe_every=ROUTING_PROBE_EVERY):
+        self.stage_models = dict(STAGE_MODELS if stage_models is None else stage_models)
+        self.latency_targets_ms = dict(STAGE_LATENCY_TARGETS_MS if latency_targets_ms is None else latency_targets_ms)
+        self.fallback_model = fallback_model
+        self.window = window
+        self.probe_every = probe_every
+        self._recent = {}  # (stage, model) -> deque of latencies (ms)
+        self._fallback_calls = {}  # stage -> calls routed to the fallback in a row
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def choose(self, stage):
+        """Returns the model the next call of `stage` should use."""
+        primary = self.stage_models.get(stage, DEFAULT_MODEL)
+        with self._lock:
+            if primary == self.fallback_model or not self._over_target(stage, primary):
+                self._fallback_calls.pop(stage, None)
+                model = primary
+            else:
+                calls = self._fallback_calls.get(stage, 0) + 1
+                self._fallback_calls[stage] = calls
+                model = primary if calls % self.probe_every == 0 else self.fallback_model
+        _last_model.set(model)
+        return model
+
+    def record_call(self, stage, model, latency_ms, ok=True):
+        """Records the outcome of one LLM call."""
+        with self._lock:
+            counters = self._model_counters(model)
+            counters["calls"] += 1
+            if not ok:
+                counters["errors"] += 1
+                return
+            counters["latency_ms"].append(latency_ms)
+            recent = self._recent.setdefault((stage, model), deque(maxlen=self.window))
+            target = self.latency_targets_ms.get(stage)
+            if stage in self._fallback_calls and model == self.stage_models.get(stage) and target and latency_ms <= target:
+                # A fast probe while falling back: the old slow samples no longer describe the model.
+                recent.clear()
+            recent.append(latency_ms)
+
+    def record_quality(self, stage, passed, model=None):
+        """Records whether a response passed the stage's sanity check (defaults to the last routed model)."""
+        model = model or _last_model.get() or self.stage_models.get(stage, DEFAULT_MODEL)
+        with self._lock:
+            counters = self._model_counters(model)
+            counters["quality_passed" if passed else "quality_failed"] += 1
+            by_stage = counters["quality_by_stage"].setdefault(stage, {"passed": 0, "failed": 0})
+            by_stage["passed" if passed else "failed"] += 1
+
+    def report(self):
+        """Routing state per stage and counters per model."""
+        with self._lock:
+            stages = {}
+            for stage, primary in self.stage_models.items():
+                recent = self._recent.get((stage, primary))
+                stages[stage] = {
+                    "model": primary,
+                    "latency_target_ms": self.latency_targets_ms.get(stage),
+                    "recent_median_ms": round(statistics.median(recent), 1) if recent else None,
+                    "falling_back": primary != self.fallback_model and self._over_target(stage, primary),
+                }
+            models = {}
+            for model, counters in self._models.items():
+                latencies = sorted(counters["latency_ms"])
+                checks = counters["quality_passed"] + counters["quality_failed"]
+                models[model] = {
+                    "calls": counters["calls"],
+                    "errors": counters["errors"],
+                    "latency_p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+                    "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)], 1) if latencies else None,
+                    "quality_passed": counters["quality_passed"],
+                    "quality_failed": counters["quality_failed"],
+                    "quality_pass_rate": round(counters["quality_passed"] / checks, 4) if checks else None,
+                    "quality_by_stage": {stage: dict(c) for stage, c in counters["quality_by_stage"].items()},
+                }
+            return {"fallback_model": self.fallback_model, "stages": stages, "models": models}
+
+    def _over_target(self, stage, model):
+        target = self.latency_targets_ms.get(stage)
+        recent = self._recent.get((stage, model))
+        return bool(target and recent) and statistics.median(recent) > target
+
+    def _model_counters(self, model):
+        return self._models.setdefault(model, {
+            "calls": 0,
+            "errors": 0,
+            # Bounded so long-running servers keep a rolling latency picture.
+            "latency_ms": deque(maxlen=1000),
+            "quality_passed": 0,
+            "quality_failed": 0,
+            "quality_by_stage": {},
+        })
+
+
+model_router = ModelRouter()
@@ -0,0 +1,237 @@
+import os
+import shutil
+import threading
+import time
+
+from backend.config import OUTPUT_DIR, OUTPUT_QUOTA_MB, OUTPUT_SWEEP_SECONDS, OUTPUT_TTL_HOURS
+from backend.file_hash import file_content_hash
+from backend.thumbnails import thumbnail_service
+
+STALE_TMP_SECONDS = 3600  # partial writes (".<name>.<id>.tmp", "thumbs-*" render dirs) left behind by a crash
+
+
+# ---------------------- 🧹 OUTPUT LIFECYCLE ----------------------
+class OutputLifecycle:
+    """
+    Keeps the output directory bounded; a background thread sweeps it periodically.
+    - TTL: a deck expires `ttl_hours` after its last download (or its creation if never downloaded).
+    - Quota: while the decks exceed `quota_mb`, the least recently downloaded ones are removed.
+    - `touch()` (called per download) only records the time in memory; the sweep persists it as
+      the file's atime, so the LRU order survives restarts without a write per download.
+    - Thumbnails: a deck's thumbnail folder counts towards its size and is removed with it; folders
+      of decks that no longer exist (overwritten or deleted) are removed once older than an hour.
+    """
+
+    def __init__(self, directory=OUTPUT_DIR, ttl_hours=OUTPUT_TTL_HOURS, quota_mb=OUTPUT_QUOTA_MB,
+                 sweep_seconds=OUTPUT_SWEEP_SECONDS, thumbnails=thumbnail_service):
+        self.directory = directory
+        self.thumbnails = thumbnails
+        self.ttl_s = ttl_hours * 3600
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        self.sweep_seconds = sweep_seconds
+        self._accessed = {}  # filename -> last download (unix time), not yet persisted
+        self._usage = {"files": 0, "bytes": 0}
+        self._counts = {"sweeps": 0, "evicted_ttl": 0, "evicted_quota": 0, "bytes_evicted": 0, "tmp_removed": 0,
+                        "thumbnails_removed": 0}
+        self._last_sweep_ms = None
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._sweeper = None
+
+    def touch(self, filename):
+        """Records a download of `filename` (a dictionary write)."""
+        with self._lock:
+            self._accessed[filename] = time.time()
+
+    def record_write(self, file_path, size, replaced_size=None):
+        """
+        Accounts for a written deck; wakes the sweeper once the quota is exceeded.
+        - `replaced_size`: size of the deck this write overwrote (None for a new file).
+        """
+        with self._lock:
+            self._accessed.pop(file_path.name, None)  # new content starts a fresh lifetime
+            if replaced_size is None:
+                self._usage["files"] += 1
+            self._usage["bytes"] += size - (replaced_size or 0)
+            over_quota = self.quota_bytes > 0 and self._usage["bytes"] > self.quota_bytes
+        if over_quota:
+            self._wake.set()
+
+    # ---------------------- 🔁 SWEEPING ----------------------
+    def sweep(self):
+        """Removes expired decks, then the least recently downloaded ones until under quota."""
+        with self._sweep_lock:
+            start = time.perf_counter()
+            now = time.time()
+            folders = self._scan_thumbnails(now)  # before the decks: a folder only appears after its deck
+            decks = self._scan(now)
+            self._attach_thumbnails(decks, folders)
+
+            expired = [deck for deck in decks if self.ttl_s > 0 and now - deck["last_access"] > self.ttl_s]
+            total = sum(deck["size"] for deck in decks) - sum(deck["size"] for deck in expired)
+            over_quota = []
+            if self.quota_bytes > 0 and total > self.quota_bytes:
+                expired_names = {deck["name"] for deck in expired}
+                for deck in sorted(decks, key=lambda d: d["last_access"]):
+                    if total <= self.quota_bytes:
+                        break
+                    if deck["name"] not in expired_names:
+                        over_quota.append(deck)
+                        total -= deck["size"]
+
+            removed_ttl = self._remove(expired)
+            removed_quota = self._remove(over_quota)
+            removed = removed_ttl + removed_quota
+            self._remove_thumbnails(decks, removed, folders, now)
+            with self._lock:
+                # Usage is re-measured here; between sweeps `record_write` keeps a running estimate.
+                self._usage = {
+                    "files": len(decks) - len(removed),
+                    "bytes": sum(deck["size"] for deck in decks) - sum(deck["size"] for deck in removed),
+                }
+                self._counts["sweeps"] += 1
+                self._counts["evicted_ttl"] += len(removed_ttl)
+                self._counts["evicted_quota"] += len(removed_quota)
+                self._counts["bytes_evicted"] += sum(deck["size"] for deck in removed)
+                self._last_sweep_ms = round((time.perf_counter() - start) * 1000, 1)
+            if removed_ttl or removed_quota:
+                print(f"🧹 Output cleanup: {len(removed_ttl)} expired, {len(removed_quota)} over quota removed")
+            return {"expired": len(removed_ttl), "over_quota": len(removed_quota)}
+
+    def _scan(self, now):
+        """Decks with size and last access; persists recorded downloads and drops stale temp files."""
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        decks = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return decks
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                stat = entry.stat()
+                if entry.name.startswith(".") and entry.name.endswith(".tmp"):
+                    if now - stat.st_mtime > STALE_TMP_SECONDS:
+                        os.remove(entry.path)
+                        with self._lock:
+                            self._counts["tmp_removed"] += 1
+                    continue
+                if not entry.name.endswith(".pptx"):
+                    continue
+                last_access = max(stat.st_mtime, stat.st_atime)
+                downloaded = accessed.get(entry.name)
+                if downloaded and downloaded > last_access:
+                    os.utime(entry.path, (downloaded, stat.st_mtime))
+                    last_access = downloaded
+            except FileNotFoundError:
+                continue  # removed meanwhile
+            decks.append({"name": entry.name, "path": entry.path, "size": stat.st_size, "last_access": last_access})
+        return decks
+
+    def _scan_thumbnails(self, now):
+        """Thumbnail folders by deck hash with their size; drops render work dirs left by a crash."""
+        folders = {}
+        if self.thumbnails is None:
+            return folders
+        try:
+            entries = list(os.scandir(self.thumbnails.cache_dir))
+        except FileNotFoundError:
+            return folders
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                if entry.name.startswith("thumbs-"):
+                    if now - mtime > STALE_TMP_SECONDS:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                        with self._lock:
+                            self._counts["tmp_removed"] += 1
+                    continue
+                size = sum(image.stat().st_size for image in os.scandir(entry.path) if image.is_file())
+            except FileNotFoundError:
+                continue  # removed meanwhile
+            folders[entry.name] = {"path": entry.path, "size": size, "mtime": mtime}
+        return folders
+
+    def _attach_thumbnails(self, decks, folders):
+        """Adds each deck's content hash and thumbnail folder size (memoized hashes: a stat per deck)."""
+        for deck in decks:
+            deck["hash"] = None
+            if not folders:
+                continue
+            try:
+                deck["hash"] = file_content_hash(deck["path"])
+            except FileNotFoundError:
+                continue
+            folder = folders.get(deck["hash"])
+            if folder is not None:
+                deck["size"] += folder["size"]
+
+    def _remove_thumbnails(self, decks, removed, folders, now):
+        """Removes folders of evicted decks (unless another deck has the same content) and old orphans."""
+        removed_names = {deck["name"] for deck in removed}
+        kept_hashes = {deck["hash"] for deck in decks if deck["name"] not in removed_names}
+        evicted_hashes = {deck["hash"] for deck in removed}
+        for deck_hash, folder in folders.items():
+            if deck_hash in kept_hashes:
+                continue
+            if deck_hash in evicted_hashes or now - folder["mtime"] > STALE_TMP_SECONDS:
+                shutil.rmtree(folder["path"], ignore_errors=True)
+                self.thumbnails.forget(deck_hash)
+                with self._lock:
+                    self._counts["thumbnails_removed"] += 1
+
+    def _remove(self, decks):
+        removed = []
+        for deck in decks:
+            with self._lock:
+                if deck["name"] in self._accessed:
+                    continue  # downloaded since the scan
+            try:
+                os.remove(deck["path"])
+                removed.append(deck)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    # ---------------------- 🧵 BACKGROUND SWEEPER ----------------------
+    def start(self):
+        if self._sweeper is None and self.sweep_seconds > 0 and (self.ttl_s > 0 or self.quota_bytes > 0):
+            self._stopped.clear()
+            self._sweeper = threading.Thread(target=self._sweep_periodically, name="output-lifecycle", daemon=True)
+            self._sweeper.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def _sweep_periodically(self):
+        while not self._stopped.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"⚠️ Output cleanup failed: {str(e)}")
+            self._wake.wait(self.sweep_seconds)
+            self._wake.clear()
+        self._sweeper = None
+
+    # ---------------------- 📊 METRICS ----------------------
+    def metrics(self):
+        with self._lock:
+            return {
+                **self._usage,
+                "quota_bytes": self.quota_bytes,
+                "quota_used": round(self._usage["bytes"] / self.quota_bytes, 3) if self.quota_bytes > 0 else None,
+                "ttl_hours": self.ttl_s / 3600,
+                "pending_access_updates": len(self._accessed),
+                "last_sweep_ms": self._last_sweep_ms,
+                **self._counts,
+            }
+
+
+output_lifecycle = OutputLifecycle()
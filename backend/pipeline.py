@@ -0,0 +1,115 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from backend.cancellation import PipelineCancellation, current_cancellation
+from backend.config import LLM_MAX_CONCURRENCY
+from backend.profiling import profiled_call
+
+
+# ---------------------- 🧩 PIPELINE STAGE ----------------------
+class Stage:
+    """A named unit of work that runs once all of its dependencies have finished."""
+
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+# ---------------------- 📊 PIPELINE RESULT ----------------------
+class PipelineResult:
+    """Stage outputs plus per-stage timings (milliseconds, relative to pipeline start)."""
+
+    def __init__(self, stages, results, timings):
+        self.stages = stages
+        self.results = results
+        self.timings = timings
+
+    @property
+    def total_ms(self):
+        return max((t["end_ms"] for t in self.timings.values()), default=0.0)
+
+    def critical_path(self):
+        """
+        Walks back from the last stage to finish, always following the dependency
+        that finished latest. The returned chain is what bounded the total runtime.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n]["end_ms"])
+        path = [name]
+        while self.stages[name].deps:
+            name = max(self.stages[name].deps, key=lambda n: self.timings[n]["end_ms"])
+            path.append(name)
+        return list(reversed(path))
+
+
+# ---------------------- 🔀 DAG PIPELINE ----------------------
+class Pipeline:
+    """
+    Runs a small dependency graph (DAG) of stages.
+    - Independent stages run concurrently on a shared thread pool.
+    - A stage starts as soon as all of its dependencies are done.
+    - Each stage receives its dependencies' results as positional arguments, in `deps` order.
+    - The first failing stage aborts the run; stages that have not started are cancelled, and
+      the LLM calls of stages still running are aborted (through the run's cancellation scope).
+    - Stages run in a copy of the caller's context, so request-scoped context vars carry over.
+    """
+
+    def __init__(self, max_workers=LLM_MAX_CONCURRENCY):
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add_stage(self, name, func, deps=()):
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined.")
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            # Requiring dependencies to exist up front also rules out cycles.
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(missing)}")
+        self.stages[name] = Stage(name, func, deps)
+        return self
+
+    def run(self):
+        pending = dict(self.stages)
+        running = {}
+        results = {}
+        timings = {}
+        started_at = time.perf_counter()
+        cancellation = PipelineCancellation(current_cancellation.get())
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline")
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.deps):
+                        del pending[name]
+                        args = [results[dep] for dep in stage.deps]
+                        context = contextvars.copy_context()
+                        context.run(current_cancellation.set, cancellation)
+                        future = pool.submit(context.run, profiled_call, _timed_call, stage.func, args, started_at)
+                        running[future] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], timings[name] = future.result()
+        except BaseException:
+            cancellation.cancel()  # Stages still running stop at their next LLM call or poll.
+            raise
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return PipelineResult(self.stages, results, timings)
+
+
+def _timed_call(func, args, started_at):
+    start = time.perf_counter()
+    result = func(*args)
+    end = time.perf_counter()
+    return result, {
+        "start_ms": round((start - started_at) * 1000, 1),
+        "end_ms": round((end - started_at) * 1000, 1),
+        "duration_ms": round((end - start) * 1000, 1),
+    }
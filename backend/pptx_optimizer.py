@@ -0,0 +1,147 @@
+import hashlib
+import io
+import posixpath
+import zipfile
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from backend.config import PPTX_COMPRESSION_LEVEL
+from backend.tracing import traced
+
+_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+_MEDIA_PREFIX = "ppt/media/"
+
+# Template parts that generated decks never need: the template's stale preview image
+# and the printer settings blob carried over from the default template.
+_DISPOSABLE_PACKAGE_RELS = (RT.THUMBNAIL,)
+_DISPOSABLE_PRESENTATION_RELS = (RT.PRINTER_SETTINGS,)
+
+
+# ---------------------- 🗜️ OPTIMIZED SAVE ----------------------
+@traced("save")
+def save_optimized(prs, compression_level=PPTX_COMPRESSION_LEVEL, measure_savings=False):
+    """
+    Serializes a deck after an optimization pass and returns (pptx_bytes, report):
+    - drops slide layouts no slide uses (and everything only they reference),
+    - drops the template thumbnail & printer settings parts,
+    - deduplicates byte-identical media files,
+    - writes the ZIP with the given deflate `compression_level` (0-9).
+    With `measure_savings`, the deck is also saved unoptimized once to report bytes saved; that is a
+    second serialization, so request paths leave it off.
+    """
+    original_bytes = len(_save(prs)) if measure_savings else None
+
+    layouts_removed = remove_unused_layouts(prs)
+    parts_removed = remove_disposable_parts(prs)
+    data, media_deduplicated = repack(_save(prs), compression_level)
+
+    report = {
+        "original_bytes": original_bytes,
+        "optimized_bytes": len(data),
+        "bytes_saved": original_bytes - len(data) if original_bytes is not None else None,
+        "layouts_removed": layouts_removed,
+        "parts_removed": parts_removed,
+        "media_deduplicated": media_deduplicated,
+        "compression_level": compression_level,
+    }
+    return data, report
+
+
+def remove_unused_layouts(prs):
+    """Removes every slide layout that no slide is based on; returns how many were removed."""
+    removed = 0
+    for master in prs.slide_masters:
+        for layout in list(master.slide_layouts):
+            if not layout.used_by_slides:
+                master.slide_layouts.remove(layout)
+                removed += 1
+    return removed
+
+
+def remove_disposable_parts(prs):
+    """Drops relationships to template-only parts; unreferenced parts are not saved."""
+    removed = 0
+    package = prs.part.package
+    for owner, rels, reltypes in (
+        (package, package._rels, _DISPOSABLE_PACKAGE_RELS),
+        (prs.part, prs.part.rels, _DISPOSABLE_PRESENTATION_RELS),
+    ):
+        for rId, rel in list(rels.items()):
+            if rel.reltype in reltypes:
+                owner.drop_rel(rId)
+                removed += 1
+    return removed
+
+
+# ---------------------- 📦 ZIP REPACK ----------------------
+def repack(pptx_bytes, compression_level=PPTX_COMPRESSION_LEVEL):
+    """
+    Rewrites a PPTX package: byte-identical media are collapsed onto one file (relationships
+    are retargeted) and every entry is deflated at `compression_level`.
+    Returns (new_bytes, number_of_media_files_removed).
+    """
+    with zipfile.ZipFile(io.BytesIO(pptx_bytes)) as source:
+        entries = {info.filename: source.read(info) for info in source.infolist()}
+
+    duplicates = _find_duplicate_media(entries)
+    if duplicates:
+        for name in list(entries):
+            if name.endswith(".rels"):
+                entries[name] = _retarget_rels(name, entries[name], duplicates)
+        for duplicate in duplicates:
+            del entries[duplicate]
+        entries["[Content_Types].xml"] = _drop_overrides(entries["[Content_Types].xml"], duplicates)
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, compresslevel=compression_level) as target:
+        # [Content_Types].xml first, as Office writes it.
+        for name in sorted(entries, key=lambda n: n != "[Content_Types].xml"):
+            target.writestr(name, entries[name])
+    return output.getvalue(), len(duplicates)
+
+
+def _find_duplicate_media(entries):
+    """Maps each duplicate media part name to the canonical part with the same bytes."""
+    canonical_by_hash = {}
+    duplicates = {}
+    for name in sorted(n for n in entries if n.startswith(_MEDIA_PREFIX)):
+        digest = hashlib.sha1(entries[name]).hexdigest()
+        if digest in canonical_by_hash:
+            duplicates[name] = canonical_by_hash[digest]
+        else:
+            canonical_by_hash[digest] = name
+    return duplicates
+
+
+def _retarget_rels(rels_name, rels_xml, duplicates):
+    # "ppt/slides/_rels/slide1.xml.rels" describes "ppt/slides/slide1.xml"
+    source_dir = posixpath.dirname(posixpath.dirname(rels_name))
+    root = etree.fromstring(rels_xml)
+    changed = False
+    for rel in root.iter(f"{{{_RELS_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        resolved = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(source_dir, target))
+        if resolved in duplicates:
+            canonical = duplicates[resolved]
+            rel.set("Target", "/" + canonical if target.startswith("/") else posixpath.relpath(canonical, source_dir or "."))
+            changed = True
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True) if changed else rels_xml
+
+
+def _drop_overrides(content_types_xml, removed_parts):
+    root = etree.fromstring(content_types_xml)
+    removed = {"/" + name for name in removed_parts}
+    for override in list(root.iter(f"{{{_CT_NS}}}Override")):
+        if override.get("PartName") in removed:
+            root.remove(override)
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _save(prs):
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
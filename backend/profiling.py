@@ -0,0 +1,205 @@
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from backend.config import PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE, PROFILES_DIR
+
+# ---------------------- 🔬 REQUEST PROFILING ----------------------
+# The profile of the request being served. Like the request ID, it travels with the context
+# that pipeline stages copy into their worker threads.
+current_profile = contextvars.ContextVar("current_profile", default=None)
+
+_REQUEST_ID = re.compile(r"^[0-9a-f]{32}$")  # profiles are named after (uuid4 hex) request IDs
+_thread_state = threading.local()
+_active = threading.Lock()  # one profiled request at a time
+# Python 3.12+ profiles through sys.monitoring: one cProfile per interpreter, recording every thread.
+_INTERPRETER_WIDE = sys.version_info >= (3, 12)
+
+
+class _StatsSnapshot:
+    """Raw cProfile stats (e.g. sent back by a render process) in the shape pstats accepts."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class RequestProfile:
+    """
+    cProfile of one request across every thread and render process that works on it.
+    - Each thread running request work gets its own profiler (`run`); render processes profile
+      their job and send the raw stats back with the result (`add_stats`).
+    - Timings are wall-clock, so time spent waiting on the LLM, SQLite or the render processes
+      shows up under the functions that waited.
+    - `save()` merges everything into PROFILES_DIR/<request_id>.prof (open with pstats/snakeviz),
+      with its limitations (`notes()`) next to it in <request_id>.json.
+    - Python 3.12+ allows one active profiler: it also records threads serving other requests,
+      and request threads starting while it runs are counted as unprofiled instead.
+    """
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.saved_path = None
+        self.unprofiled_calls = 0
+        self._sources = []
+        self._lock = threading.Lock()
+
+    def run(self, func, *args):
+        if getattr(_thread_state, "profiling", False):
+            return func(*args)  # Already inside a profiled call on this thread.
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            with self._lock:
+                self.unprofiled_calls += 1  # Python 3.12+ allows one active profiler per interpreter.
+            return func(*args)
+        _thread_state.profiling = True
+        try:
+            return func(*args)
+        finally:
+            profiler.disable()
+            _thread_state.profiling = False
+            with self._lock:
+                self._sources.append(profiler)
+
+    def add_stats(self, stats):
+        if stats:
+            with self._lock:
+                self._sources.append(_StatsSnapshot(stats))
+
+    def notes(self):
+        """What the profile may be missing or include besides this request."""
+        notes = []
+        if _INTERPRETER_WIDE:
+            notes.append("Python 3.12+ runs one profiler per interpreter and it records every thread: "
+                         "functions of requests served at the same time are included.")
+        if self.unprofiled_calls:
+            notes.append(f"{self.unprofiled_calls} call(s) of this request started while another profiler "
+                         "was active and have no profile of their own.")
+        return notes
+
+    def save(self, directory=PROFILES_DIR):
+        with self._lock:
+            sources = list(self._sources)
+        if not sources:
+            return None
+        merged = pstats.Stats(sources[0])
+        if len(sources) > 1:
+            merged.add(*sources[1:])
+
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.request_id}.prof"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        merged.dump_stats(tmp_path)
+        path.with_suffix(".json").write_text(json.dumps({"threads": len(sources), "notes": self.notes()}))
+        os.replace(tmp_path, path)
+        self.saved_path = path
+        prune_profiles(directory)
+        return path
+
+
+@contextmanager
+def profile_request(request_id, requested, sample_rate=PROFILE_SAMPLE_RATE):
+    """
+    Profiles the enclosed request when it opted in and is sampled; yields the RequestProfile
+    (or None). Only one request is profiled at a time, which bounds the overhead; opted-in
+    requests arriving meanwhile run unprofiled.
+    """
+    if not requested or random.random() >= sample_rate or not _active.acquire(blocking=False):
+        yield None
+        return
+
+    profile = RequestProfile(request_id)
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+        try:
+            path = profile.save()
+            print(f"🔬 Profile of request {request_id} saved: {path}")
+        except Exception as e:
+            print(f"⚠️ Could not save profile of request {request_id}: {str(e)}")
+        finally:
+            _active.release()
+
+
+def profiled_call(func, *args):
+    """Runs `func(*args)` under the current request's profiler, if any (used in worker threads)."""
+    profile = current_profile.get()
+    return func(*args) if profile is None else profile.run(func, *args)
+
+
+def profile_job(func, *args):
+    """Runs a job under cProfile inside a worker process; returns (result, raw_stats)."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = func(*args)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+# ---------------------- 📂 SAVED PROFILES ----------------------
+def list_profiles(directory=PROFILES_DIR):
+    """Saved profiles, newest first."""
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in directory.glob("*.prof"):
+        stat = path.stat()
+        profiles.append({
+            "request_id": path.stem,
+            "file": path.name,
+            "bytes": stat.st_size,
+            "created": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(timespec="seconds"),
+            "notes": profile_notes(path),
+        })
+    return sorted(profiles, key=lambda p: p["created"], reverse=True)
+
+
+def profile_path(request_id, directory=PROFILES_DIR):
+    """Path of a request's saved profile, or None (also for anything that isn't a request ID)."""
+    if not _REQUEST_ID.match(request_id):
+        return None
+    path = directory / f"{request_id}.prof"
+    return path if path.is_file() else None
+
+
+def profile_notes(path):
+    """The limitations recorded with a saved profile (none for profiles saved without them)."""
+    try:
+        return json.loads(path.with_suffix(".json").read_text())["notes"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return []
+
+
+def profile_summary(path, sort="cumulative", limit=40):
+    """The top `limit` functions of a saved profile as pstats text, after its limitations."""
+    output = io.StringIO()
+    for note in profile_notes(path):
+        output.write(f"⚠️ {note}\n")
+    pstats.Stats(str(path), stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def prune_profiles(directory=PROFILES_DIR, keep=PROFILE_MAX_FILES):
+    """Deletes the oldest profiles beyond `keep`."""
+    paths = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in paths[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
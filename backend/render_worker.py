@@ -0,0 +1,249 @@
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from pptx import Presentation
+
+from backend.base_deck import base_decks
+from backend.config import RENDER_WORKERS
+from backend.deck_builder import add_content_slide, replace_slide_content
+from backend.format_ppt import DEFAULT_USER_PREFERENCES, apply_formatting, format_deck_text
+from backend.pptx_optimizer import save_optimized
+from backend.profiling import current_profile, profile_job
+from backend.tracing import collect_spans, export_spans, span, trace_context
+
+# ---------------------- 🏭 RENDER JOBS (run inside worker processes) ----------------------
+# Jobs take and return plain data only (strings, dicts, bytes) so they can cross process
+# boundaries cheaply; nothing here touches the API's globals, database or LLM clients.
+
+
+def render_deck(deck_spec):
+    """
+    Builds, formats and serializes a whole deck.
+    `deck_spec` = {"titles": [str], "bodies": [str], "preferences": {...}}.
+    Returns (pptx_bytes, optimization_report).
+    """
+    preferences = deck_spec.get("preferences")
+    prs = base_decks.presentation(preferences=preferences)  # already themed
+    for title, body in zip(deck_spec["titles"], deck_spec["bodies"]):
+        add_content_slide(prs, title, body)
+
+    apply_formatting(prs, preferences, apply_theme=False)
+    return save_optimized(prs)
+
+
+def run_job(job, args, trace_parent=None, profiled=False):
+    """
+    Runs a render job on behalf of a request: its spans join the request's trace and, for a
+    profiled request, the job is profiled. Returns (result, spans, profile_stats).
+    """
+    with collect_spans(trace_parent) as spans:
+        if profiled:
+            result, stats = profile_job(job, *args)
+        else:
+            result, stats = job(*args), None
+    return result, spans, stats
+
+
+def patch_deck(pptx_bytes, patches, preferences=None):
+    """
+    Replaces the body of selected slides in an existing deck and reformats only those slides.
+    `patches` maps 1-based slide numbers to new body text.
+    Returns (pptx_bytes, optimization_report).
+    """
+    prs = Presentation(io.BytesIO(pptx_bytes))
+    patched = [
+        replace_slide_content(prs.slides[slide_number - 1], body)
+        for slide_number, body in patches.items()
+    ]
+    apply_formatting(prs, preferences, slides=patched)
+    return save_optimized(prs)
+
+
+# ---------------------- 🌊 STREAMING RENDER (large decks) ----------------------
+class StreamingDeck:
+    """
+    A deck built one slide at a time: it starts from a themed base deck and each slide is
+    formatted as soon as it is added, so no slide text has to be held until the end.
+    """
+
+    def __init__(self, preferences=None):
+        self.prs = base_decks.presentation(preferences=preferences)
+        self.font_choice = (preferences or DEFAULT_USER_PREFERENCES).get("font_choice", "Arial")
+        self.slide_count = 0
+
+    def add_slide(self, title, body):
+        slide = add_content_slide(self.prs, title, body)
+        format_deck_text([slide], self.font_choice)
+        self.slide_count += 1
+
+    def finish(self):
+        """Returns (pptx_bytes, optimization_report); skips the extra unoptimized save."""
+        return save_optimized(self.prs)
+
+
+def stream_render(conn, preferences, profiled=False, trace_parent=None):
+    """
+    Worker-process loop behind `RenderStream`: receives ("slide", title, body) messages in
+    deck order and answers a ("finish",) message with ("ok", (pptx_bytes, report), spans, profile_stats).
+    Failures are reported as ("error", message).
+    """
+    try:
+        result, spans, stats = run_job(_receive_slides, (conn, preferences), trace_parent, profiled)
+        if result is not None:
+            conn.send(("ok", result, spans, stats))
+    except EOFError:
+        pass  # The API side went away; nothing to report to.
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+    finally:
+        conn.close()
+
+
+def _receive_slides(conn, preferences):
+    """Builds the deck from incoming slides; returns the finished deck, or None if closed early."""
+    deck = StreamingDeck(preferences)
+    while True:
+        message = conn.recv()
+        if message[0] == "slide":
+            deck.add_slide(message[1], message[2])
+        elif message[0] == "finish":
+            return deck.finish()
+        else:
+            return None
+
+
+# ---------------------- 🧵 RENDER POOL (used by the API process) ----------------------
+class RenderPool:
+    """
+    Process pool that keeps CPU-bound python-pptx work out of the API interpreter.
+    - Workers are started lazily on first use and reused across requests.
+    - `spawn` is used because the API process runs threads, which `fork` does not copy safely.
+    """
+
+    def __init__(self, max_workers=RENDER_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stream_slots = threading.BoundedSemaphore(max_workers)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def render(self, deck_spec):
+        """Renders a deck in a worker process; returns (pptx_bytes, optimization_report)."""
+        return self._run(render_deck, deck_spec)
+
+    def patch(self, pptx_bytes, patches, preferences=None):
+        """Patches slides of an existing deck in a worker process; returns (pptx_bytes, optimization_report)."""
+        return self._run(patch_deck, pptx_bytes, patches, preferences)
+
+    def _run(self, job, *args):
+        """Runs a job in a worker process, within the caller's trace (and profile)."""
+        profile = current_profile.get()
+        with span(f"render.{job.__name__}"):
+            result, spans, stats = self._get_executor().submit(
+                run_job, job, args, trace_context(), profile is not None
+            ).result()
+        export_spans(spans)
+        if profile is not None:
+            profile.add_stats(stats)
+        return result
+
+    def open_stream(self, preferences=None):
+        """
+        Starts a dedicated render process for a deck that is fed slide by slide.
+        At most `max_workers` streams run at once; use the result as a context manager.
+        """
+        self._stream_slots.acquire()
+        try:
+            return RenderStream(preferences, on_close=self._stream_slots.release)
+        except Exception:
+            self._stream_slots.release()
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+class RenderStream:
+    """API-side handle of a streaming render process (see `stream_render`)."""
+
+    def __init__(self, preferences=None, on_close=None):
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._profile = current_profile.get()
+        self._process = context.Process(
+            target=stream_render, args=(child_conn, preferences, self._profile is not None, trace_context()),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._on_close = on_close
+        self.slides_sent = 0
+
+    def add_slide(self, title, body):
+        """Hands one slide to the renderer; blocks while the renderer is behind (backpressure)."""
+        try:
+            self._conn.send(("slide", title, body))
+        except OSError:
+            self._raise_worker_error()
+        self.slides_sent += 1
+
+    def finish(self):
+        """Waits for the deck; returns (pptx_bytes, optimization_report)."""
+        try:
+            self._conn.send(("finish",))
+        except OSError:
+            self._raise_worker_error()
+        with span("render.stream_finish", slides=self.slides_sent):
+            status, payload, *extra = self._receive()
+        if status != "ok":
+            raise RuntimeError(f"Streaming render failed: {payload}")
+        spans, stats = extra
+        export_spans(spans)
+        if self._profile is not None:
+            self._profile.add_stats(stats)
+        return payload
+
+    def close(self):
+        if self._process.is_alive():
+            try:
+                self._conn.send(("close",))
+            except OSError:
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._conn.close()
+        if self._on_close:
+            self._on_close()
+            self._on_close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _receive(self):
+        try:
+            return self._conn.recv()
+        except EOFError:
+            return "error", f"render process exited with code {self._process.exitcode}"
+
+    def _raise_worker_error(self):
+        status, payload, *_ = self._receive()
+        raise RuntimeError(f"Streaming render failed: {payload if status == 'error' else status}")
+
+
+render_pool = RenderPool()
@@ -0,0 +1,19 @@
+import contextvars
+import uuid
+
+# ---------------------- 🪪 REQUEST CONTEXT ----------------------
+# The ID of the API request currently being served. Pipeline stages copy the caller's
+# context into their worker threads, so anything recorded deep in the pipeline
+# (LLM usage, DB writes) can be attributed to the request that caused it.
+current_request_id = contextvars.ContextVar("current_request_id", default=None)
+
+
+def start_request(request_id=None):
+    """Binds a (new) request ID to the current context and returns it."""
+    request_id = request_id or uuid.uuid4().hex
+    current_request_id.set(request_id)
+    return request_id
+
+
+def get_request_id():
+    return current_request_id.get()
@@ -0,0 +1,15 @@
+import hashlib
+import json
+
+# ---------------------- 🔑 CANONICAL REQUEST KEY ----------------------
+def canonical_request_hash(request_data):
+    """
+    Stable hash of a request body: keys are sorted and string values have their
+    whitespace normalized, so trivially different submissions of the same request match.
+    """
+    normalized = {
+        key: " ".join(value.split()) if isinstance(value, str) else value
+        for key, value in request_data.items()
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,15 +1,19 @@
-import openai
 import re
 
 from backend.db_handler import retrieve_common_feedback, store_ai_feedback
+from backend.llm_usage import tracked_chat_completion
+from backend.model_router import model_router
+from backend.tracing import traced
 
 class RequirementEnricher:
-    def __init__(self, api_key):
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(self, llm):
+        self.llm = llm
 
+    @traced("enricher.titles")
     def generate_slide_titles(self, topic, num_slides):
         """
         Forces AI to generate exactly `num_slides` unique slide titles.
+        Raises if the model fails or returns too few; callers retry and fall back to `fallback_titles`.
         """
         enriched_prompt = f"""
         You are an AI expert creating a PowerPoint on **"{topic}"**.
@@ -28,42 +32,54 @@ class RequirementEnricher:
         ...
         """
 
+        response = tracked_chat_completion(
+            self.llm, "titles", [{"role": "user", "content": enriched_prompt}]
+        )
+        slide_titles_raw = response.content.split("\n")
+
+        # ✅ **Ensure Correct Slide Count**
+        slide_titles = []
+        for title in slide_titles_raw:
+            cleaned = title.strip()
+            if not cleaned:
+                continue
+            cleaned = re.sub(r"^\d+[\).\s-]*", "", cleaned).strip()
+            if cleaned:
+                slide_titles.append(cleaned)
+
+        model_router.record_quality("titles", len(slide_titles) >= num_slides)
+        if len(slide_titles) < num_slides:
+            raise ValueError(f"⚠️ AI returned {len(slide_titles)} slides instead of {num_slides}.")
+
+        return slide_titles[:num_slides]
+
+    def past_feedback(self, topic):
+        """The past feedback on `topic` that enrichment injects into its prompt."""
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": enriched_prompt}]
-            )
-            slide_titles_raw = response.choices[0].message.content.split("\n")
-
-            # ✅ **Ensure Correct Slide Count**
-            slide_titles = []
-            for title in slide_titles_raw:
-                cleaned = title.strip()
-                if not cleaned:
-                    continue
-                cleaned = re.sub(r"^\d+[\).\s-]*", "", cleaned).strip()
-                if cleaned:
-                    slide_titles.append(cleaned)
-
-            if len(slide_titles) < num_slides:
-                raise ValueError(f"⚠️ AI returned {len(slide_titles)} slides instead of {num_slides}. Retrying...")
-
-            return slide_titles[:num_slides]
+            past_feedback_entries = retrieve_common_feedback(topic)
+            if past_feedback_entries:
+                return "; ".join(past_feedback_entries)
+            return "No relevant feedback found."
         except Exception as e:
-            return [f"Slide {i+1}: {topic}" for i in range(num_slides)]  # Fallback
+            return f"⚠️ Error retrieving past feedback: {str(e)}"
 
-    def enrich_prompt(self, topic, audience, duration, purpose, num_slides):
+    def record_outline(self, topic, enriched_content):
+        """Stores an outline as feedback for future enrichments of the topic."""
+        if topic.strip():
+            store_ai_feedback(topic, 0, enriched_content)
+
+    @traced("enricher.enrichment")
+    def enrich_prompt(self, topic, audience, duration, purpose, num_slides, max_attempts=2,
+                      past_feedback=None, record=True):
         """
         Forces AI to generate exactly `num_slides` structured slides.
+        - Regenerates up to `max_attempts` times if the outline has the wrong slide count.
+        - Raises if the model fails; it never returns an error message as the outline.
+        - `past_feedback` defaults to the stored feedback on the topic; with `record`, the
+          outline is stored as feedback in turn.
         """
-        try:
-            past_feedback_entries = retrieve_common_feedback(topic)
-            if past_feedback_entries:
-                past_feedback = "; ".join(past_feedback_entries)
-            else:
-                past_feedback = "No relevant feedback found."
-        except Exception as e:
-            past_feedback = f"⚠️ Error retrieving past feedback: {str(e)}"
+        if past_feedback is None:
+            past_feedback = self.past_feedback(topic)
 
         refined_prompt = f"""
         You are creating a **{num_slides}-slide** PowerPoint on **"{topic}"**.
@@ -100,22 +116,49 @@ class RequirementEnricher:
         - Bullet 3
         """
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": refined_prompt}]
+        # API errors propagate so the pipeline can retry within its budget; an error
+        # message must never end up inside the slide prompts.
+        enriched_content = None
+        for attempt in range(1, max_attempts + 1):
+            response = tracked_chat_completion(
+                self.llm, "enrichment", [{"role": "user", "content": refined_prompt}]
             )
-            enriched_content = response.choices[0].message.content
+            content = response.content.strip()
+            if not content:
+                model_router.record_quality("enrichment", False)
+                continue
+            enriched_content = content
 
             # ✅ **Check for Correct Slide Count**
-            generated_slides = enriched_content.split("\n\n")
-            if len(generated_slides) != num_slides:
-                raise ValueError(f"⚠️ AI returned {len(generated_slides)} slides instead of {num_slides}. Regenerating...")
+            generated_slides = count_outline_slides(enriched_content)
+            model_router.record_quality("enrichment", generated_slides == num_slides)
+            if generated_slides == num_slides:
+                break
+            print(f"⚠️ AI returned {generated_slides} slides instead of {num_slides} (attempt {attempt}/{max_attempts}).")
 
-            # ✅ Store AI-generated feedback for future improvements
-            if topic.strip():
-                store_ai_feedback(topic, 0, enriched_content)
+        if not enriched_content:
+            raise ValueError("AI returned an empty outline.")
 
-            return enriched_content
-        except Exception as e:
-            return f"⚠️ Error generating enriched content: {str(e)}"
+        # ✅ Store AI-generated feedback for future improvements
+        if record:
+            self.record_outline(topic, enriched_content)
+
+        # A near-miss outline is still better slide context than none at all.
+        return enriched_content
+
+
+def fallback_titles(topic, num_slides):
+    """Generic titles used when the model fails to produce usable ones."""
+    return [f"Slide {i+1}: {topic}" for i in range(num_slides)]
+
+
+# ---------------------- 🔢 OUTLINE SLIDE COUNT ----------------------
+_OUTLINE_SLIDE_HEADING = re.compile(r"^\s*(?:[#*]+\s*)?Slide\s+\d+\b", re.IGNORECASE | re.MULTILINE)
+
+
+def count_outline_slides(content):
+    """Counts `Slide N:` headings in an outline, falling back to blank-line separated blocks."""
+    headings = len(_OUTLINE_SLIDE_HEADING.findall(content))
+    if headings:
+        return headings
+    return len([block for block in content.split("\n\n") if block.strip()])
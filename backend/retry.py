@@ -0,0 +1,41 @@
+import threading
+
+from backend.cancellation import RequestCancelled, cancellable_sleep
+from backend.config import SLIDE_MAX_ATTEMPTS, SLIDE_RETRY_BUDGET
+
+
+# ---------------------- 🔁 RETRY BUDGET ----------------------
+class RetryBudget:
+    """
+    Caps the number of retries a whole request may spend, shared by all of its stages,
+    so a flaky provider cannot multiply the cost of a deck.
+    """
+
+    def __init__(self, limit=SLIDE_RETRY_BUDGET):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self):
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+
+def call_with_retry(func, budget, attempts=SLIDE_MAX_ATTEMPTS, backoff_s=0.5, label="call"):
+    """
+    Calls `func()` until it succeeds, up to `attempts` times, as long as `budget` allows.
+    Re-raises the last error once attempts or budget are exhausted; cancellation is never retried.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except RequestCancelled:
+            raise
+        except Exception as e:
+            if attempt == attempts or not budget.try_spend():
+                raise
+            print(f"🔁 Retrying {label} (attempt {attempt + 1}/{attempts}) after error: {str(e)}")
+            cancellable_sleep(backoff_s * attempt)
@@ -0,0 +1,89 @@
+import threading
+
+from backend.cancellation import RequestCancelled, SharedCancellation, current_cancellation
+
+
+# ---------------------- 🛫 SINGLE-FLIGHT COALESCING ----------------------
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.cancellation = SharedCancellation()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent work: while a call for `key` is in flight, later callers
+    with the same key wait for it and receive its result (or its error) instead of repeating it.
+    Nothing is cached once the call finishes; the next caller starts a fresh execution.
+    Callers may pass their `CancelToken`: the execution is cancelled only once every caller
+    attached to it (leader and followers) has cancelled.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+        self._max_waiters = 0
+        self._abandoned = 0
+
+    def do(self, key, func, cancel_token=None):
+        """
+        Runs `func()` once per in-flight `key`; returns (result, shared) where `shared` means coalesced.
+        - The leader runs `func` with the call's shared cancellation as the current scope.
+        - A follower whose `cancel_token` is cancelled stops waiting (RequestCancelled).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                call.waiters += 1
+                self._coalesced += 1
+                self._max_waiters = max(self._max_waiters, call.waiters)
+            if cancel_token is not None:
+                call.cancellation.attach(cancel_token)
+
+        if leader:
+            scope = current_cancellation.set(call.cancellation) if cancel_token is not None else None
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+            finally:
+                if scope is not None:
+                    current_cancellation.reset(scope)
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif cancel_token is None:
+            call.done.wait()
+        else:
+            while not call.done.wait(0.2):
+                if cancel_token.reason is not None:
+                    with self._lock:
+                        call.waiters -= 1
+                        self._abandoned += 1
+                    raise RequestCancelled(cancel_token.reason)
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+    def metrics(self):
+        with self._lock:
+            requests = self._executions + self._coalesced
+            return {
+                "executions": self._executions,
+                "coalesced_requests": self._coalesced,
+                "coalesce_ratio": round(self._coalesced / requests, 4) if requests else 0.0,
+                "in_flight": len(self._calls),
+                "waiting_followers": sum(call.waiters for call in self._calls.values()),
+                "max_followers_per_call": self._max_waiters,
+                "abandoned_followers": self._abandoned,
+            }
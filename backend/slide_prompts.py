@@ -0,0 +1,34 @@
+# ---------------------- 💬 SLIDE PROMPTS ----------------------
+# Providers cache prompts by exact prefix, so everything shared by the slide calls of a deck
+# (and by later requests on the same topic) comes first and never varies between calls;
+# the slide-specific instruction is always the last message.
+
+SYSTEM_PROMPT = (
+    "You are an expert presentation writer who creates concise, bulleted slide content. "
+    "Respond only with the body copy for the slide. Do not include slide numbers, titles, "
+    "or any assistant preamble or postscript."
+)
+
+
+def slide_messages(index, title, refined_prompt, num_slides, previous_content=None, feedback=None):
+    """
+    Builds the chat messages for one slide:
+    - system prompt + presentation brief: identical for every slide of the deck (cacheable prefix),
+    - final user message: which slide to write, plus the revision request when `feedback` is given.
+    """
+    instruction = f"Write the body of slide {index + 1} of {num_slides}: {title}"
+    if feedback:
+        instruction += (
+            f"\n\nCurrent content of slide {index + 1}:\n{previous_content}"
+            f"\n\nRewrite this slide only, applying the following feedback:\n{feedback}"
+        )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": shared_context(refined_prompt, num_slides)},
+        {"role": "user", "content": instruction},
+    ]
+
+
+def shared_context(refined_prompt, num_slides):
+    """The deck-wide part of every slide prompt."""
+    return f"Presentation brief ({num_slides} slides in total):\n{refined_prompt.strip()}"
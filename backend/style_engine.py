@@ -0,0 +1,161 @@
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.enum.text import MSO_AUTO_SIZE
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.text.fonts import FontFiles
+from pptx.text.layout import TextFitter
+from pptx.util import Pt
+
+from backend.tracing import traced
+
+# ---------------------- 🎨 THEME-LEVEL STYLING ----------------------
+# Instead of stamping font name/size/color onto every run, the deck's defaults are written
+# once into the slide master, layout placeholders and presentation default text style.
+# Runs inherit from there, so only genuine exceptions (sub-headers, fitted sizes) add XML.
+
+# Children of <a:defRPr> that must come after <a:latin> (schema order).
+_AFTER_LATIN = {qn(tag) for tag in ("a:ea", "a:cs", "a:sym", "a:hlinkClick", "a:hlinkMouseOver", "a:rtl", "a:extLst")}
+_TITLE_TYPES = {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE, PP_PLACEHOLDER.VERTICAL_TITLE}
+_FILLS = {qn(tag) for tag in ("a:noFill", "a:solidFill", "a:gradFill", "a:blipFill", "a:pattFill", "a:grpFill")}
+
+
+def apply_deck_theme(prs, font_choice, header_color, content_color, header_size=Pt(32), body_size=Pt(22)):
+    """
+    Writes font, size and color defaults for titles and body text once per deck.
+    - Titles: slide master title style + any layout title placeholder overrides.
+    - Body: master body/other styles + the presentation default text style (used by text boxes).
+    """
+    for master in prs.slide_masters:
+        tx_styles = master._element.find(qn("p:txStyles"))
+        if tx_styles is None:
+            continue
+        _style_list(tx_styles.find(qn("p:titleStyle")), font_choice, header_size, header_color)
+        _style_list(tx_styles.find(qn("p:bodyStyle")), font_choice, body_size, content_color)
+        _style_list(tx_styles.find(qn("p:otherStyle")), font_choice, body_size, content_color)
+
+        for layout in master.slide_layouts:
+            for placeholder in layout.placeholders:
+                lst_style = placeholder._element.find(f"{qn('p:txBody')}/{qn('a:lstStyle')}")
+                if lst_style is None or lst_style.find(qn("a:lvl1pPr")) is None:
+                    continue  # Inherits from the master, nothing to override.
+                is_title = placeholder.placeholder_format.type in _TITLE_TYPES
+                _style_list(
+                    lst_style, font_choice,
+                    header_size if is_title else body_size,
+                    header_color if is_title else content_color,
+                )
+
+    default_style = prs.part._element.find(qn("p:defaultTextStyle"))
+    _style_list(default_style, font_choice, body_size, content_color)
+    return prs
+
+
+def set_shape_font_size(text_frame, size):
+    """Overrides the font size of one text frame via its list style (one element, not one per run)."""
+    tx_body = text_frame._txBody
+    lst_style = tx_body.find(qn("a:lstStyle"))
+    if lst_style is None:
+        lst_style = OxmlElement("a:lstStyle")
+        tx_body.find(qn("a:bodyPr")).addnext(lst_style)
+    lvl1 = lst_style.find(qn("a:lvl1pPr"))
+    if lvl1 is None:
+        lvl1 = _append_level(lst_style)
+    _def_rpr(lvl1).set("sz", str(int(size.pt * 100)))
+
+
+def fit_font_size(shape, text_frame, font_choice, max_size=24, min_size=12):
+    """
+    Returns the largest point size (<= `max_size`) at which the frame's text fits the shape,
+    using real font metrics when the font file is installed. Without metrics, only very long
+    paragraphs get a smaller size; None means the theme default already fits.
+    """
+    try:
+        font_file = FontFiles.find(font_choice, False, False)
+        extents = (
+            shape.width - text_frame.margin_left - text_frame.margin_right,
+            shape.height - text_frame.margin_top - text_frame.margin_bottom,
+        )
+        return max(TextFitter.best_fit_font_size(text_frame.text, extents, max_size, font_file), min_size)
+    except (KeyError, OSError, TypeError, ValueError):
+        # Font lookup is unsupported on some platforms (e.g. Linux) or the font is missing.
+        longest = max((len(paragraph.text.strip()) for paragraph in text_frame.paragraphs), default=0)
+        if longest > 500:
+            return 14
+        if longest > 300:
+            return 16
+        return None
+
+
+@traced("fit_text")
+def fit_text_to_shape(shape, text_frame, font_choice, max_size=24):
+    """Theme-mode replacement for `fit_text`: one shape-level size instead of per-run fonts."""
+    if not text_frame.text:
+        return
+    text_frame.word_wrap = True
+    text_frame.auto_size = MSO_AUTO_SIZE.NONE
+    size = fit_font_size(shape, text_frame, font_choice, max_size)
+    if size is not None:
+        set_shape_font_size(text_frame, Pt(size))
+
+
+# ---------------------- 🔧 XML HELPERS ----------------------
+def _style_list(list_style, font_choice, size, color):
+    """Sets latin font, size & solid color on the first paragraph level of a list style."""
+    if list_style is None:
+        return
+    lvl1 = list_style.find(qn("a:lvl1pPr"))
+    if lvl1 is None:
+        lvl1 = _append_level(list_style)
+    def_rpr = _def_rpr(lvl1)
+    def_rpr.set("sz", str(int(size.pt * 100)))
+
+    for child in list(def_rpr):
+        if child.tag in _FILLS or child.tag == qn("a:latin"):
+            def_rpr.remove(child)
+
+    solid_fill = OxmlElement("a:solidFill")
+    srgb_clr = OxmlElement("a:srgbClr")
+    srgb_clr.set("val", str(_as_rgb(color)))
+    solid_fill.append(srgb_clr)
+    ln = def_rpr.find(qn("a:ln"))
+    def_rpr.insert(def_rpr.index(ln) + 1 if ln is not None else 0, solid_fill)
+
+    latin = OxmlElement("a:latin")
+    latin.set("typeface", font_choice)
+    successor = next((child for child in def_rpr if child.tag in _AFTER_LATIN), None)
+    if successor is not None:
+        successor.addprevious(latin)
+    else:
+        def_rpr.append(latin)
+
+
+def _append_level(list_style):
+    """Adds an <a:lvl1pPr> right after any <a:defPPr> of a list style."""
+    lvl1 = OxmlElement("a:lvl1pPr")
+    def_ppr = list_style.find(qn("a:defPPr"))
+    if def_ppr is not None:
+        def_ppr.addnext(lvl1)
+    else:
+        list_style.insert(0, lvl1)
+    return lvl1
+
+
+def _def_rpr(level_ppr):
+    """Returns the <a:defRPr> of a paragraph-level style, creating it in schema order."""
+    def_rpr = level_ppr.find(qn("a:defRPr"))
+    if def_rpr is None:
+        def_rpr = OxmlElement("a:defRPr")
+        ext_lst = level_ppr.find(qn("a:extLst"))
+        if ext_lst is not None:
+            ext_lst.addprevious(def_rpr)
+        else:
+            level_ppr.append(def_rpr)
+    return def_rpr
+
+
+def _as_rgb(color):
+    if isinstance(color, RGBColor):
+        return color
+    return RGBColor.from_string(str(color).lstrip("#"))
+
@@ -0,0 +1,77 @@
+import re
+
+# ---------------------- 🧹 COMPILED TEXT PIPELINE ----------------------
+# Paragraph post-processing (clean-up → summarization → bulleting → sub-header detection) with
+# every pattern compiled once. Most paragraphs contain none of the clean-up markers, so a single
+# combined scan decides whether the (ordered) clean-up substitutions need to run at all.
+
+SUMMARY_MAX_WORDS = 50
+SUBHEADER_KEYWORDS = (
+    "Introduction", "Overview", "Impact", "Analysis", "Examples",
+    "Benefits", "Challenges", "Trends", "Case Studies", "Conclusion",
+)
+BULLET_PREFIXES = ("-", "•", "Numbers")
+
+_ASSISTANT_CHATTER = re.compile(
+    r"\b(Sure! Here's your slide:|Feel free to customize|Let's proceed with|If needed, you can).*"
+)
+_LIST_STYLE_WORDS = re.compile(r"\b(Numbers|Dots|Checkmarks)\s\b")
+_DESIGN_SUGGESTIONS = re.compile(r"(\*\*Visual Enhancements:\*\*|➤ Suggestions:).*", re.IGNORECASE)
+_ANY_CLEANUP_MARKER = re.compile(
+    r"Sure! Here's your slide:|Feel free to customize|Let's proceed with|If needed, you can"
+    r"|Numbers|Dots|Checkmarks|---"
+    r"|(?i:\*\*Visual Enhancements:\*\*|➤ Suggestions:)"
+)
+_SUBHEADER_KEYWORD = re.compile("|".join(re.escape(keyword) for keyword in SUBHEADER_KEYWORDS))
+
+
+def clean_text(text):
+    """Removes assistant chatter, list-style filler words and design suggestions."""
+    if not _ANY_CLEANUP_MARKER.search(text):
+        return text.strip()
+    text = _ASSISTANT_CHATTER.sub("", text).strip()
+    text = _LIST_STYLE_WORDS.sub("", text).strip()
+    text = _DESIGN_SUGGESTIONS.sub("", text).strip()
+    return text.replace("---", "──────────").strip()  # AI section separator
+
+
+def summarize_text(text, max_words=SUMMARY_MAX_WORDS):
+    """Truncates text to `max_words` words (tokenized once), marking the cut with '...'."""
+    words = text.split()
+    if len(words) > max_words:
+        return " ".join(words[:max_words]) + "..."
+    return text
+
+
+def bulletize(text):
+    """Prefixes a bullet unless the text is empty or already formatted as a list item."""
+    text = text.strip()
+    if not text or text.startswith(BULLET_PREFIXES):
+        return text
+    return f"• {text}"
+
+
+def is_subheader(text):
+    """Short text with ':' or any thematic keyword marks a sub-header."""
+    return (len(text) < 50 and ":" in text) or _SUBHEADER_KEYWORD.search(text) is not None
+
+
+def process_paragraph(text):
+    """Runs the whole pipeline on one paragraph; returns (processed_text, is_subheader)."""
+    text = bulletize(summarize_text(clean_text(text)))
+    return text, is_subheader(text)
+
+
+def process_paragraphs(texts):
+    """
+    Processes a batch of paragraphs (e.g. a whole deck) in order; returns a list of
+    (processed_text, is_subheader). Repeated paragraphs are processed once.
+    """
+    results = {}
+    processed = []
+    for text in texts:
+        result = results.get(text)
+        if result is None:
+            result = results[text] = process_paragraph(text)
+        processed.append(result)
+    return processed
@@ -0,0 +1,189 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from backend.config import (
+    SOFFICE_BINARY,
+    THUMBNAIL_CACHE_DIR,
+    THUMBNAIL_RETRY_MAX_SECONDS,
+    THUMBNAIL_RETRY_SECONDS,
+    THUMBNAIL_TIMEOUT_SECONDS,
+    THUMBNAIL_WIDTH,
+    THUMBNAIL_WORKERS,
+)
+from backend.file_hash import file_content_hash
+
+READY, PENDING, FAILED, UNAVAILABLE = "ready", "pending", "failed", "unavailable"
+_MAX_TRACKED_DECKS = 4096  # per in-memory state dictionary; the disk cache stays authoritative
+
+
+# ---------------------- 🖼️ SLIDE THUMBNAILS ----------------------
+class ThumbnailService:
+    """
+    Renders PNG thumbnails of every slide with a headless office install (PPTX → PDF → PNG)
+    in background worker threads. Images are cached on disk per deck content hash, so a deck
+    is rendered once and every later lookup is a stat call plus an in-memory dictionary hit.
+    A failed render is reported as failed until its back-off (`retry_s`, doubling per consecutive
+    failure up to `retry_max_s`) has passed; the next lookup then renders the deck again.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, width=THUMBNAIL_WIDTH, workers=THUMBNAIL_WORKERS,
+                 timeout_s=THUMBNAIL_TIMEOUT_SECONDS, soffice=SOFFICE_BINARY, retry_s=THUMBNAIL_RETRY_SECONDS,
+                 retry_max_s=THUMBNAIL_RETRY_MAX_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.width = width
+        self.workers = workers
+        self.timeout_s = timeout_s
+        self.soffice = soffice
+        self.retry_s = retry_s
+        self.retry_max_s = retry_max_s
+        self._ready = {}  # deck hash -> number of slide images
+        self._pending = set()
+        self._failed = {}  # deck hash -> (retry at (monotonic), consecutive failures, error message)
+        self._executor = None
+        self._available = None
+        self._lock = threading.Lock()
+
+    def available(self):
+        """True when both converters are installed (checked once)."""
+        if self._available is None:
+            self._available = bool(shutil.which(self.soffice) and shutil.which("pdftoppm"))
+        return self._available
+
+    def lookup(self, file_path):
+        """
+        Returns (status, deck_hash, slide_count) for a deck, starting a background render
+        when no thumbnails exist yet.
+        """
+        deck_hash = file_content_hash(file_path)
+        with self._lock:
+            if deck_hash in self._ready:
+                return READY, deck_hash, self._ready[deck_hash]
+            if deck_hash in self._pending:
+                return PENDING, deck_hash, None
+            failure = self._failed.get(deck_hash)
+            if failure is not None and time.monotonic() < failure[0]:
+                return FAILED, deck_hash, None
+
+        slide_count = self._count_cached(deck_hash)
+        if slide_count:
+            with self._lock:
+                _remember(self._ready, deck_hash, slide_count)
+            return READY, deck_hash, slide_count
+
+        if not self.available():
+            return UNAVAILABLE, deck_hash, None
+        self.submit(file_path, deck_hash)
+        return PENDING, deck_hash, None
+
+    def submit(self, file_path, deck_hash=None):
+        """Queues a background render of a deck (no-op if it is cached, queued or converters are missing)."""
+        if not self.available():
+            return
+        deck_hash = deck_hash or file_content_hash(file_path)
+        with self._lock:
+            if deck_hash in self._ready or deck_hash in self._pending:
+                return
+            self._pending.add(deck_hash)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+            executor = self._executor
+        executor.submit(self._render, Path(file_path), deck_hash)
+
+    def forget(self, deck_hash):
+        """Drops the in-memory state of a deck whose thumbnail folder was removed (e.g. evicted)."""
+        with self._lock:
+            self._ready.pop(deck_hash, None)
+            self._failed.pop(deck_hash, None)
+
+    def image_path(self, deck_hash, slide_number):
+        """Path of a cached slide image, or None if it does not exist."""
+        if not _is_hex(deck_hash):
+            return None
+        path = self.cache_dir / deck_hash / f"slide-{slide_number}.png"
+        return path if path.is_file() else None
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, file_path, deck_hash):
+        try:
+            slide_count = self._convert(file_path, deck_hash)
+            with self._lock:
+                _remember(self._ready, deck_hash, slide_count)
+                self._failed.pop(deck_hash, None)
+            print(f"🖼️ Rendered {slide_count} thumbnails for {file_path.name}")
+        except Exception as e:
+            with self._lock:
+                failures = self._failed[deck_hash][1] + 1 if deck_hash in self._failed else 1
+                backoff_s = min(self.retry_s * 2 ** (failures - 1), self.retry_max_s)
+                _remember(self._failed, deck_hash, (time.monotonic() + backoff_s, failures, str(e)))
+            print(f"⚠️ Thumbnail rendering failed for {file_path.name} (retry in {backoff_s:.0f}s): {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(deck_hash)
+
+    def _convert(self, file_path, deck_hash):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="thumbs-", dir=self.cache_dir) as work_dir:
+            work_dir = Path(work_dir)
+            # A private profile per conversion: office refuses to run twice on one profile.
+            profile = (work_dir / "profile").as_uri()
+            subprocess.run(
+                [self.soffice, f"-env:UserInstallation={profile}", "--headless", "--norestore",
+                 "--convert-to", "pdf", "--outdir", str(work_dir), str(file_path)],
+                check=True, capture_output=True, timeout=self.timeout_s,
+            )
+            pdf_path = work_dir / f"{file_path.stem}.pdf"
+            if not pdf_path.exists():
+                raise RuntimeError("office conversion produced no PDF")
+
+            images_dir = work_dir / "images"
+            images_dir.mkdir()
+            subprocess.run(
+                ["pdftoppm", "-png", "-scale-to-x", str(self.width), "-scale-to-y", "-1",
+                 str(pdf_path), str(images_dir / "slide")],
+                check=True, capture_output=True, timeout=self.timeout_s,
+            )
+            # pdftoppm zero-pads page numbers by page count (slide-01.png); store them unpadded.
+            images = sorted(images_dir.glob("slide-*.png"), key=lambda p: int(p.stem.rsplit("-", 1)[1]))
+            if not images:
+                raise RuntimeError("PDF rasterization produced no images")
+            for number, image in enumerate(images, start=1):
+                image.rename(images_dir / f"slide-{number}.png")
+
+            # Publish the whole folder at once so readers never see a partial set.
+            target = self.cache_dir / deck_hash
+            try:
+                os.replace(images_dir, target)
+            except OSError:
+                if not target.is_dir():  # Already published by a concurrent render otherwise.
+                    raise
+            return len(images)
+
+    def _count_cached(self, deck_hash):
+        folder = self.cache_dir / deck_hash
+        return sum(1 for _ in folder.glob("slide-*.png")) if folder.is_dir() else 0
+
+
+def _remember(entries, deck_hash, value):
+    """Stores `value`, dropping the oldest entries beyond _MAX_TRACKED_DECKS."""
+    entries.pop(deck_hash, None)
+    entries[deck_hash] = value
+    while len(entries) > _MAX_TRACKED_DECKS:
+        del entries[next(iter(entries))]
+
+
+def _is_hex(value):
+    return bool(value) and all(c in "0123456789abcdef" for c in value)
+
+
+thumbnail_service = ThumbnailService()
@@ -0,0 +1,283 @@
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from backend.config import (
+    OTLP_TRACES_ENDPOINT,
+    TRACE_EXPORTER,
+    TRACE_FILE,
+    TRACE_FLUSH_SECONDS,
+    TRACE_SERVICE_NAME,
+)
+
+# ---------------------- 🧭 TRACE SPANS ----------------------
+# The innermost open span of the current context. Pipeline stages copy the caller's context
+# into their worker threads, so spans opened there become children of the stage that started
+# them. Outside a traced request there is no current span and `span()` costs one lookup.
+_current_span = contextvars.ContextVar("current_span", default=None)
+# Set in render processes: finished spans are collected here and returned with the job result.
+_collected_spans = contextvars.ContextVar("collected_spans", default=None)
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_MAX_BUFFERED_SPANS = 10000
+
+
+class Span:
+    """One timed operation of a trace; `set()` adds attributes while it is open."""
+
+    def __init__(self, name, trace_id, parent_id=None, request_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.request_id = request_id
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self._start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self._duration_ms = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        self._duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "request_id": self.request_id,
+            "start_unix_ns": self._start_ns,
+            "end_unix_ns": self._start_ns + int(self._duration_ms * 1_000_000),
+            "duration_ms": round(self._duration_ms, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+            "pid": os.getpid(),
+        }
+
+
+class _NoopSpan:
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@contextmanager
+def start_trace(name, request_id, traceparent=None, **attributes):
+    """
+    Opens the root span of a request. A valid W3C `traceparent` header (e.g. sent by the
+    frontend) makes the request part of the caller's trace; otherwise a new trace starts.
+    """
+    match = _TRACEPARENT.match((traceparent or "").strip().lower())
+    trace_id, parent_id = match.groups() if match else (os.urandom(16).hex(), None)
+    with _open_span(Span(name, trace_id, parent_id, request_id, attributes)) as root:
+        yield root
+
+
+@contextmanager
+def span(name, **attributes):
+    """Times the enclosed block as a child of the current span (a no-op outside a trace)."""
+    parent = _current_span.get()
+    if parent is None:
+        yield _NOOP_SPAN
+        return
+    with _open_span(Span(name, parent.trace_id, parent.span_id, parent.request_id, attributes)) as current:
+        yield current
+
+
+def traced(name):
+    """Decorator form of `span(name)`."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def _open_span(current):
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {str(e)}"[:500]
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+        collected = _collected_spans.get()
+        if collected is not None:
+            collected.append(current.to_dict())
+        else:
+            span_exporter.export(current.to_dict())
+
+
+# ---------------------- 📦 CROSS-PROCESS PROPAGATION ----------------------
+def trace_context():
+    """Picklable reference to the current span, handed to render processes (None outside a trace)."""
+    current = _current_span.get()
+    return None if current is None else (current.trace_id, current.span_id, current.request_id)
+
+
+@contextmanager
+def collect_spans(parent_context):
+    """
+    Render-process side: spans opened inside become children of `parent_context` and are
+    collected into the yielded list (to be sent back with the result) instead of exported.
+    """
+    spans = []
+    if parent_context is None:
+        yield spans
+        return
+    remote_parent = Span("remote-parent", parent_context[0], request_id=parent_context[2])
+    remote_parent.span_id = parent_context[1]
+    span_token = _current_span.set(remote_parent)
+    collect_token = _collected_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _collected_spans.reset(collect_token)
+        _current_span.reset(span_token)
+
+
+def export_spans(spans):
+    """Exports spans that finished in another process."""
+    for finished in spans or ():
+        span_exporter.export(finished)
+
+
+# ---------------------- 📤 SPAN EXPORT ----------------------
+class SpanExporter:
+    """
+    Buffers finished spans and writes them in batches from a background thread:
+    - "jsonl": one JSON object per line, appended to `path`;
+    - "otlp":  OTLP/HTTP JSON posted to `endpoint` (OpenTelemetry collector, Jaeger, Tempo, ...);
+    - "none":  spans are dropped.
+    Export is best effort: a failed batch is reported and discarded.
+    """
+
+    def __init__(self, kind=TRACE_EXPORTER, path=TRACE_FILE, endpoint=OTLP_TRACES_ENDPOINT,
+                 flush_seconds=TRACE_FLUSH_SECONDS, service_name=TRACE_SERVICE_NAME):
+        if kind not in ("jsonl", "otlp", "none"):
+            raise ValueError(f"Unknown TRACE_EXPORTER '{kind}' (expected jsonl, otlp or none).")
+        self.kind = kind
+        self.path = path
+        self.endpoint = endpoint
+        self.flush_seconds = flush_seconds
+        self.service_name = service_name
+        self.dropped = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stopped = threading.Event()
+
+    def export(self, finished):
+        if self.kind == "none":
+            return
+        with self._lock:
+            if len(self._buffer) >= _MAX_BUFFERED_SPANS:
+                self.dropped += 1
+                return
+            self._buffer.append(finished)
+        self._ensure_flusher()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                spans, self._buffer = self._buffer, []
+            if not spans:
+                return
+            try:
+                if self.kind == "jsonl":
+                    self._write_jsonl(spans)
+                else:
+                    self._post_otlp(spans)
+            except Exception as e:
+                print(f"⚠️ Failed to export {len(spans)} trace spans: {str(e)}")
+
+    def stop(self):
+        self._stopped.set()
+        self.flush()
+
+    def _write_jsonl(self, spans):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("".join(json.dumps(s, ensure_ascii=False, default=str) + "\n" for s in spans))
+
+    def _post_otlp(self, spans):
+        import httpx  # installed with the openai SDK
+
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+            "scopeSpans": [{"scope": {"name": "backend.tracing"}, "spans": [_otlp_span(s) for s in spans]}],
+        }]}
+        httpx.post(self.endpoint, json=payload, timeout=5).raise_for_status()
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._stopped.clear()
+                    self._flusher = threading.Thread(target=self._flush_periodically, name="span-exporter", daemon=True)
+                    self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_seconds):
+            if self._buffer:
+                self.flush()
+        self._flusher = None
+
+
+def _otlp_span(finished):
+    attributes = dict(finished["attributes"], **{"request.id": finished["request_id"], "process.pid": finished["pid"]})
+    otlp = {
+        "traceId": finished["trace_id"],
+        "spanId": finished["span_id"],
+        "name": finished["name"],
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(finished["start_unix_ns"]),
+        "endTimeUnixNano": str(finished["end_unix_ns"]),
+        "attributes": _otlp_attributes(attributes),
+        "status": {"code": 2, "message": finished["error"]} if finished["error"] else {"code": 1},
+    }
+    if finished["parent_id"]:
+        otlp["parentSpanId"] = finished["parent_id"]
+    return otlp
+
+
+def _otlp_attributes(attributes):
+    encoded = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            encoded.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            encoded.append({"key": key, "value": {"intValue": str(value)}})
+        elif isinstance(value, float):
+            encoded.append({"key": key, "value": {"doubleValue": value}})
+        else:
+            encoded.append({"key": key, "value": {"stringValue": str(value)}})
+    return encoded
+
+
+span_exporter = SpanExporter()
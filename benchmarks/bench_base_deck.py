@@ -0,0 +1,135 @@
+"""
+Deck setup benchmark: what each render job pays before its first slide is added.
+
+- parse:      `Presentation(template)` + deck theme (the previous per-request setup);
+- from bytes: the template kept as serialized bytes in memory, re-parsed + themed per request;
+- base copy:  a deep copy of the prepared (parsed + themed) base deck from backend/base_deck.py.
+
+Runs against python-pptx's default template and a synthesized "corporate" template: branded
+master and layouts (logo and background images) plus sample slides with pictures and tables,
+as corporate templates usually ship. It also checks that copies are isolated from each other.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_base_deck --repeat 30 --sample-slides 40
+"""
+import argparse
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image  # installed with python-pptx
+from pptx import Presentation
+from pptx.util import Inches
+
+from backend.base_deck import BaseDeckCache
+from backend.deck_builder import add_content_slide
+from backend.format_ppt import apply_formatting
+
+PREFERENCES = {"font_choice": "Calibri"}
+
+
+# ---------------------- 🏢 SYNTHETIC CORPORATE TEMPLATE ----------------------
+def noise_png(seed, size=(480, 270)):
+    """A photo-like (poorly compressible) PNG."""
+    rng = random.Random(seed)
+    image = Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def add_branding(shapes, part, seed):
+    """Adds a background picture and a logo to a master or layout (python-pptx has no API for it)."""
+    for offset, (x, y, cx, cy) in enumerate(((0, 0, Inches(10), Inches(7.5)), (Inches(8.5), 0, Inches(1.5), Inches(0.8)))):
+        image_part, rId = part.get_or_add_image_part(io.BytesIO(noise_png(seed + offset, (160, 90))))
+        shape_id = max([s.shape_id for s in shapes] + [1]) + 1
+        shapes._spTree.add_pic(shape_id, f"Brand {shape_id}", image_part.desc, rId, x, y, cx, cy)
+
+
+def corporate_template(path, sample_slides):
+    prs = Presentation()
+    for master in prs.slide_masters:
+        add_branding(master.shapes, master.part, 0)
+        for index, layout in enumerate(master.slide_layouts):
+            add_branding(layout.shapes, layout.part, 10 * (index + 1))
+
+    for i in range(sample_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Sample slide {i + 1}"
+        slide.shapes.add_picture(io.BytesIO(noise_png(1000 + i)), Inches(0.5), Inches(1.5), Inches(4.5))
+        table = slide.shapes.add_table(6, 4, Inches(5.2), Inches(1.5), Inches(4.3), Inches(3)).table
+        for row in range(6):
+            for col in range(4):
+                table.cell(row, col).text = f"R{row}C{col}"
+    prs.save(path)
+    return path
+
+
+# ---------------------- ⏱️ SETUP STRATEGIES ----------------------
+def parse(template):
+    prs = Presentation(template)
+    apply_formatting(prs, PREFERENCES, slides=[])
+    return prs
+
+
+def from_bytes(blob):
+    prs = Presentation(io.BytesIO(blob))
+    apply_formatting(prs, PREFERENCES, slides=[])
+    return prs
+
+
+def best_ms(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def check_isolation(cache, template):
+    """Copies must not share state: editing one deck leaves the cache and other copies untouched."""
+    first = cache.presentation(template, PREFERENCES)
+    baseline = len(first.slides)
+    add_content_slide(first, "Only in the first copy", "- one\n- two")
+    first.slide_masters[0].name = "modified"
+    second = cache.presentation(template, PREFERENCES)
+    assert len(second.slides) == baseline, "slides leaked between copies"
+    assert second.slide_masters[0].name != "modified", "master edits leaked between copies"
+    for prs in (first, second):
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        assert len(Presentation(io.BytesIO(buffer.getvalue())).slides) == len(prs.slides)
+
+
+# ---------------------- 🏁 MAIN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--sample-slides", type=int, default=40, help="sample slides in the corporate template")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        default_path = Path(directory) / "default.pptx"
+        Presentation().save(default_path)
+        corporate_path = corporate_template(Path(directory) / "corporate.pptx", args.sample_slides)
+
+        print(f"{'template':>22} | {'parse ms':>8} | {'from bytes ms':>13} | {'base copy ms':>12} | {'speed-up':>8}")
+        for label, template in (("default", None), ("corporate", corporate_path)):
+            path = template or default_path
+            blob = path.read_bytes()
+            cache = BaseDeckCache(max_entries=4)
+            check_isolation(cache, template)
+
+            parse_ms = best_ms(lambda: parse(template), args.repeat)
+            bytes_ms = best_ms(lambda: from_bytes(blob), args.repeat)
+            copy_ms = best_ms(lambda: cache.presentation(template, PREFERENCES), args.repeat)
+            name = f"{label} ({len(blob) / 1024:.0f} KB)"
+            print(f"{name:>22} | {parse_ms:>8.1f} | {bytes_ms:>13.1f} | {copy_ms:>12.1f} | {parse_ms / copy_ms:>7.1f}x")
+        print("✅ Copies are isolated: edits to one deck never reach the cache or other copies.")
+
+
+if __name__ == "__main__":
+    main()
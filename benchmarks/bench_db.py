@@ -0,0 +1,101 @@
+"""
+Database benchmark: a connection per call (the previous db_handler pattern) vs. the pooled,
+tuned connector in database/db_connector.py.
+
+The workload mirrors the generation path: every "slide" writes a checkpoint item and a feedback
+row, then reads the checkpoint back. It runs sequentially and from several threads at once,
+each time against a fresh database file in a temporary directory.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_db --ops 2000 --threads 4
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from database.db_connector import Database
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS ai_feedback (id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, "
+    "slide_number INTEGER NOT NULL, feedback TEXT NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)",
+    "CREATE TABLE IF NOT EXISTS generation_checkpoints (request_hash TEXT NOT NULL, item TEXT NOT NULL, "
+    "content TEXT NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (request_hash, item))",
+)
+INSERT_FEEDBACK = "INSERT INTO ai_feedback (topic, slide_number, feedback) VALUES (?, ?, ?)"
+INSERT_CHECKPOINT = "INSERT OR REPLACE INTO generation_checkpoints (request_hash, item, content) VALUES (?, ?, ?)"
+SELECT_CHECKPOINT = "SELECT item, content FROM generation_checkpoints WHERE request_hash = ?"
+BODY = "• Automated risk scoring reduces manual review time\n" * 6
+
+
+# ---------------------- 🧪 WORKLOADS ----------------------
+def per_call_connect(path):
+    def run(sql, params, fetch=False):
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if fetch else None
+        conn.commit()
+        conn.close()
+        return rows
+    return run
+
+
+def pooled(database):
+    def run(sql, params, fetch=False):
+        return database.fetchall(sql, params) if fetch else database.execute(sql, params)
+    return run
+
+
+def slide_ops(run, worker, count):
+    request_hash = f"request-{worker}"
+    for i in range(count):
+        run(INSERT_CHECKPOINT, (request_hash, f"slide_{i}", BODY))
+        run(INSERT_FEEDBACK, ("Benchmark topic", i + 1, BODY))
+        run(SELECT_CHECKPOINT, (request_hash,), fetch=True)
+
+
+def timed(run, ops, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        slide_ops(run, 0, ops)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda w: slide_ops(run, w, ops // threads), range(threads)))
+    return (time.perf_counter() - start) * 1000
+
+
+def fresh_db(directory, name):
+    path = Path(directory) / f"{name}.db"
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+    return path
+
+
+# ---------------------- 🏁 MAIN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000, help="slides (3 statements each) per run")
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'workload':>22} | {'per-call ms':>11} | {'pooled ms':>9} | {'speed-up':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in (1, args.threads):
+            legacy_ms = timed(per_call_connect(fresh_db(directory, f"legacy-{threads}")), args.ops, threads)
+            database = Database(fresh_db(directory, f"pooled-{threads}"), pool_size=max(threads, 1))
+            pooled_ms = timed(pooled(database), args.ops, threads)
+            stats = database.stats()
+            database.close()
+            label = f"{args.ops} slides, {threads} thread{'s' if threads > 1 else ''}"
+            print(f"{label:>22} | {legacy_ms:>11.0f} | {pooled_ms:>9.0f} | {legacy_ms / pooled_ms:>7.1f}x"
+                  f"   (connections: {stats['connections_open']}, acquire waits: {stats['acquire_waits']})")
+
+
+if __name__ == "__main__":
+    main()
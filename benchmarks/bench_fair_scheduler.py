@@ -0,0 +1,95 @@
+"""
+Fair scheduling benchmark: a bulk tenant floods the service with large decks, then an
+interactive user asks for a small one. Compares a plain FIFO concurrency limit (first come,
+first served) with backend/fair_scheduler.py. LLM calls are simulated with a sleep, and each
+deck runs its slides on its own thread pool like the generation pipeline.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_fair_scheduler --bulk-decks 4 --bulk-slides 20 --small-slides 5 --latency-ms 50
+"""
+import argparse
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from backend.config import LLM_MAX_CONCURRENCY, SCHEDULER_MAX_IN_FLIGHT, SCHEDULER_TENANT_MAX_IN_FLIGHT
+from backend.fair_scheduler import FairScheduler, job_priority, scheduled_job
+
+
+class FifoSlots:
+    """The baseline: one shared concurrency limit, no notion of who is calling."""
+
+    def __init__(self, max_in_flight):
+        self._slots = threading.Semaphore(max_in_flight)
+
+    @contextmanager
+    def slot(self):
+        with self._slots:
+            yield
+
+
+# ---------------------- 🧪 WORKLOAD ----------------------
+def run_deck(scheduler, tenant, num_slides, latency_s):
+    """Generates one simulated deck; returns its wall time in ms."""
+    def llm_call():
+        with scheduler.slot():
+            time.sleep(latency_s)
+
+    start = time.perf_counter()
+    with scheduled_job(tenant, job_priority(num_slides)):
+        with ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY) as pool:
+            for future in [pool.submit(contextvars.copy_context().run, llm_call) for _ in range(num_slides)]:
+                future.result()
+    return (time.perf_counter() - start) * 1000
+
+
+def scenario(scheduler, args):
+    latency_s = args.latency_ms / 1000
+    timings = {}
+
+    def deck(name, tenant, num_slides, delay_s=0.0):
+        time.sleep(delay_s)
+        timings[name] = run_deck(scheduler, tenant, num_slides, latency_s)
+
+    threads = [threading.Thread(target=deck, args=(f"bulk-{d}", "bulk-tenant", args.bulk_slides))
+               for d in range(args.bulk_decks)]
+    threads.append(threading.Thread(target=deck, args=("small", "interactive-user", args.small_slides, 2 * latency_s)))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total_ms = (time.perf_counter() - start) * 1000
+    return timings["small"], max(v for k, v in timings.items() if k.startswith("bulk")), total_ms
+
+
+# ---------------------- 🏁 MAIN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bulk-decks", type=int, default=4)
+    parser.add_argument("--bulk-slides", type=int, default=20)
+    parser.add_argument("--small-slides", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--max-in-flight", type=int, default=SCHEDULER_MAX_IN_FLIGHT)
+    parser.add_argument("--tenant-max-in-flight", type=int, default=SCHEDULER_TENANT_MAX_IN_FLIGHT)
+    args = parser.parse_args()
+
+    print(f"{args.bulk_decks} bulk decks x {args.bulk_slides} slides, then 1 interactive deck of {args.small_slides} "
+          f"slides; {args.max_in_flight} LLM calls in flight ({args.tenant_max_in_flight} per tenant with fair scheduling), "
+          f"{args.latency_ms:.0f} ms per call\n")
+    print(f"{'scheduler':>10} | {'small deck ms':>13} | {'slowest bulk deck ms':>20} | {'total ms':>8}")
+    fair = FairScheduler(max_in_flight=args.max_in_flight, tenant_max_in_flight=args.tenant_max_in_flight, weights={})
+    for name, scheduler in (("fifo", FifoSlots(args.max_in_flight)), ("fair", fair)):
+        small_ms, bulk_ms, total_ms = scenario(scheduler, args)
+        print(f"{name:>10} | {small_ms:>13.0f} | {bulk_ms:>20.0f} | {total_ms:>8.0f}")
+
+    print("\nfair scheduler wait times per tenant:")
+    for tenant, stats in fair.metrics()["tenants"].items():
+        print(f"  {tenant:>16}: {stats['granted']:>3} calls, avg {stats['wait_ms_avg']:.0f} ms, "
+              f"p95 {stats['wait_ms_p95']:.0f} ms, max {stats['wait_ms_max']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
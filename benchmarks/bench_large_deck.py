@@ -0,0 +1,100 @@
+"""
+Large-deck benchmark: peak RSS and total time against slide count.
+
+Every measurement runs in a fresh subprocess so peak RSS (ru_maxrss) belongs to that run alone.
+Modes:
+- buffered:  all slide bodies are collected first, then the deck is built in one go
+             (the regular pipeline's `render_deck`).
+- streaming: slides are added to a `StreamingDeck` one at a time and their text is dropped.
+- full:      the whole large-deck pipeline through `generate_ppt` with the deterministic
+             local LLM backend (writes to output/ and the database like a real request);
+             RSS is reported for the API process and the render process.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_large_deck --slides 50 100 200 400
+    python -m benchmarks.bench_large_deck --slides 100 300 --modes streaming full
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MODES = ("buffered", "streaming", "full")
+
+
+# ---------------------- 🧪 ONE MEASUREMENT (runs in a subprocess) ----------------------
+def slide_text(i):
+    from backend.llm_backend import local_completion_text
+
+    return f"Key aspect {i + 1}", local_completion_text([{"role": "user", "content": f"Slide {i + 1}"}])
+
+
+def measure(mode, num_slides):
+    start = time.perf_counter()
+    if mode == "buffered":
+        from backend.render_worker import render_deck
+
+        slides = [slide_text(i) for i in range(num_slides)]
+        data, _ = render_deck({"titles": [t for t, _ in slides], "bodies": [b for _, b in slides]})
+    elif mode == "streaming":
+        from backend.render_worker import StreamingDeck
+
+        deck = StreamingDeck()
+        for i in range(num_slides):
+            deck.add_slide(*slide_text(i))
+        data, _ = deck.finish()
+    else:
+        from backend import main
+
+        request = main.PresentationRequest(topic="Large deck benchmark", num_slides=num_slides, large_deck=True)
+        result = main.generate_ppt(request)
+        data = (main.OUTPUT_DIR / result["file"]).read_bytes()
+        main.render_pool.shutdown()
+        main.usage_tracker.stop()
+
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "child_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "deck_bytes": len(data),
+    }
+
+
+def run_subprocess(mode, num_slides):
+    env = dict(os.environ, LLM_BACKEND="local", LOCAL_LLM_LATENCY_MS="0", LOCAL_LLM_TOKENS_PER_SECOND="0")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_large_deck", "--measure", mode, str(num_slides)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# ---------------------- 🏁 MAIN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["buffered", "streaming"])
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "SLIDES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        mode, num_slides = args.measure
+        print(json.dumps(measure(mode, int(num_slides))))
+        return
+
+    print(f"{'slides':>6} | {'mode':>9} | {'time s':>7} | {'peak RSS MB':>11} | {'render proc MB':>14} | {'deck KB':>7}")
+    for num_slides in args.slides:
+        for mode in args.modes:
+            result = run_subprocess(mode, num_slides)
+            child = f"{result['child_peak_rss_mb']:.0f}" if mode == "full" else "-"
+            print(f"{num_slides:>6} | {mode:>9} | {result['seconds']:>7.2f} | {result['peak_rss_mb']:>11.0f} | "
+                  f"{child:>14} | {result['deck_bytes'] / 1024:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
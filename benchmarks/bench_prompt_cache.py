@@ -0,0 +1,138 @@
+"""
+Prompt-layout benchmark: cached-token ratio and time to first token of slide calls.
+
+Compares the previous per-slide prompt (slide-specific text first, shared brief after it)
+with the cache-friendly layout in backend/slide_prompts.py (stable system + brief prefix,
+slide instruction last). Each layout generates the slides of `--requests` decks on the same
+topic, streaming every call to time the first token and reading `cached_tokens` from usage.
+
+Usage (from the repository root):
+    # Against a local stub that simulates prefix caching (default)
+    python -m benchmarks.bench_prompt_cache --slides 10 --requests 3
+
+    # Against the real API (needs OPENAI_API_KEY; costs tokens)
+    python -m benchmarks.bench_prompt_cache --live --model gpt-4o-mini
+"""
+import argparse
+import statistics
+import threading
+import time
+import uuid
+
+import openai
+
+from backend.slide_prompts import SYSTEM_PROMPT, slide_messages
+from benchmarks.stub_llm_server import make_server
+
+
+def legacy_slide_messages(index, title, refined_prompt, num_slides):
+    """The per-slide prompt as it was built before the cache-friendly layout."""
+    content = f"Slide {index+1}: {title}\n{refined_prompt}\nEnsure {num_slides} slides."
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": content},
+    ]
+
+
+LAYOUTS = {
+    "legacy": legacy_slide_messages,
+    "prefix": slide_messages,
+}
+
+
+def sample_brief(topic, num_slides, run_id):
+    """An enrichment-style outline about as long as real refined prompts (~110 tokens per slide)."""
+    sections = [
+        f"Slide {i}: **{topic} – aspect {i}**\n"
+        f"- Explain how {topic.lower()} changes day-to-day work for the audience, with one concrete example.\n"
+        f"- Quantify the impact where possible and name the main risk or limitation to watch.\n"
+        f"- Contrast the situation before and after adoption using one short customer or team story.\n"
+        f"- Close with a practical takeaway that connects to slide {i + 1 if i < num_slides else 1}.\n"
+        f"- Speaker note: keep this section under two minutes and invite one question."
+        for i in range(1, num_slides + 1)
+    ]
+    # The run id keeps each layout's first request cold on a shared provider cache.
+    return f"Presentation on {topic} (benchmark run {run_id}).\n\n" + "\n\n".join(sections)
+
+
+def timed_stream(client, model, messages):
+    """Streams one completion; returns (time to first token in ms, prompt tokens, cached tokens)."""
+    start = time.perf_counter()
+    first_token_ms = None
+    usage = None
+    stream = client.chat.completions.create(
+        model=model, messages=messages, stream=True, stream_options={"include_usage": True}
+    )
+    for chunk in stream:
+        if first_token_ms is None and chunk.choices and chunk.choices[0].delta.content:
+            first_token_ms = (time.perf_counter() - start) * 1000
+        if chunk.usage:
+            usage = chunk.usage
+
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+    return first_token_ms or 0.0, prompt_tokens, cached_tokens
+
+
+def run_layout(client, model, layout, topic, num_slides, num_requests):
+    """Generates every slide of `num_requests` decks with one layout; returns per-call samples."""
+    build_messages = LAYOUTS[layout]
+    refined_prompt = sample_brief(topic, num_slides, uuid.uuid4().hex[:8])
+    samples = []
+    for request_index in range(num_requests):
+        for i in range(num_slides):
+            messages = build_messages(i, f"{topic} – aspect {i + 1}", refined_prompt, num_slides)
+            ttft_ms, prompt_tokens, cached_tokens = timed_stream(client, model, messages)
+            samples.append({
+                "request": request_index, "ttft_ms": ttft_ms,
+                "prompt_tokens": prompt_tokens, "cached_tokens": cached_tokens,
+            })
+    return samples
+
+
+def summarize(samples):
+    prompt_tokens = sum(s["prompt_tokens"] for s in samples)
+    cached_tokens = sum(s["cached_tokens"] for s in samples)
+    ttfts = sorted(s["ttft_ms"] for s in samples)
+    return {
+        "calls": len(samples),
+        "cached_ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        "ttft_p50_ms": statistics.median(ttfts),
+        "ttft_p95_ms": ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=3, help="Decks generated per layout (same topic).")
+    parser.add_argument("--topic", default="AI in Finance")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--live", action="store_true", help="Use the real API instead of the local stub.")
+    parser.add_argument("--stub-latency-ms", type=float, default=150)
+    parser.add_argument("--stub-prefill-tokens-per-second", type=float, default=4000.0)
+    args = parser.parse_args()
+
+    server = None
+    if args.live:
+        client = openai.OpenAI()
+    else:
+        server = make_server(port=0, latency_ms=args.stub_latency_ms, tokens_per_second=400.0,
+                             prefill_tokens_per_second=args.stub_prefill_tokens_per_second)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = openai.OpenAI(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="stub")
+
+    print(f"{'layout':>7} | {'calls':>5} | {'cached ratio':>12} | {'TTFT p50 ms':>11} | {'TTFT p95 ms':>11}")
+    try:
+        for layout in LAYOUTS:
+            result = summarize(run_layout(client, args.model, layout, args.topic, args.slides, args.requests))
+            print(f"{layout:>7} | {result['calls']:>5} | {result['cached_ratio']:>12.1%} | "
+                  f"{result['ttft_p50_ms']:>11.0f} | {result['ttft_p95_ms']:>11.0f}")
+    finally:
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
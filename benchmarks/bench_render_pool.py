@@ -0,0 +1,53 @@
+"""
+Render pool throughput: decks rendered per second as worker processes are added.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_render_pool --decks 16 --slides 20 --workers 1 2 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.render_worker import RenderPool
+from benchmarks.bench_formatting import SAMPLE_BODY
+
+
+def deck_spec(num_slides):
+    return {
+        "titles": [f"Slide title number {i + 1}" for i in range(num_slides)],
+        "bodies": [SAMPLE_BODY] * num_slides,
+        "preferences": {"font_choice": "Arial", "color_scheme": "#000000"},
+    }
+
+
+def measure(workers, num_decks, num_slides):
+    pool = RenderPool(max_workers=workers)
+    spec = deck_spec(num_slides)
+    try:
+        # Request threads submit concurrently, as FastAPI's threadpool would.
+        with ThreadPoolExecutor(max_workers=num_decks) as requests:
+            # Warm-up: start every worker process outside the timed section.
+            list(requests.map(lambda _: pool.render(spec), range(workers)))
+            start = time.perf_counter()
+            list(requests.map(lambda _: pool.render(spec), range(num_decks)))
+            elapsed = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return num_decks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decks", type=int, default=16)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} | {'decks/s':>8}")
+    for workers in args.workers:
+        print(f"{workers:>7} | {measure(workers, args.decks, args.slides):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Text pipeline benchmark.
+
+Times the previous per-paragraph helpers of backend/format_ppt.py against the compiled
+backend/text_pipeline.py on the same corpus: hand-picked edge cases plus seeded random
+paragraphs built from slide-like words and every clean-up marker. The legacy reference and
+the corpus come from tests/test_text_pipeline.py, which checks that both produce identical output.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_text_pipeline --paragraphs 20000 --repeat 5
+"""
+import argparse
+import time
+
+from backend import text_pipeline
+from benchmarks.bench_formatting import SAMPLE_BODY
+from tests.test_text_pipeline import (
+    build_corpus,
+    legacy_apply_smart_bulleting,
+    legacy_clean_slide_text,
+    legacy_is_subheader,
+    legacy_process_paragraph,
+    legacy_summarize_text_if_needed,
+)
+
+
+# ---------------------- ⏱️ MICROBENCHMARKS ----------------------
+def best_ms(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.paragraphs, args.seed)
+    # A typical generated deck: 100 slides of clean bullets, no clean-up markers.
+    deck = [f"{line} ({i})" for i in range(100) for line in SAMPLE_BODY.splitlines()]
+    benchmarks = (
+        ("clean_slide_text", lambda: [legacy_clean_slide_text(t) for t in corpus],
+         lambda: [text_pipeline.clean_text(t) for t in corpus]),
+        ("summarize_text_if_needed", lambda: [legacy_summarize_text_if_needed(t) for t in corpus],
+         lambda: [text_pipeline.summarize_text(t) for t in corpus]),
+        ("apply_smart_bulleting", lambda: [legacy_apply_smart_bulleting(t) for t in corpus],
+         lambda: [text_pipeline.bulletize(t) for t in corpus]),
+        ("is_subheader", lambda: [legacy_is_subheader(t) for t in corpus],
+         lambda: [text_pipeline.is_subheader(t) for t in corpus]),
+        ("full pipeline", lambda: [legacy_process_paragraph(t) for t in corpus],
+         lambda: text_pipeline.process_paragraphs(corpus)),
+        ("100-slide deck batch", lambda: [legacy_process_paragraph(t) for t in deck],
+         lambda: text_pipeline.process_paragraphs(deck)),
+    )
+
+    print(f"\n{'function':>24} | {'legacy ms':>9} | {'compiled ms':>11} | {'speed-up':>8}")
+    for name, legacy, compiled in benchmarks:
+        legacy_ms, compiled_ms = best_ms(legacy, args.repeat), best_ms(compiled, args.repeat)
+        print(f"{name:>24} | {legacy_ms:>9.1f} | {compiled_ms:>11.1f} | {legacy_ms / compiled_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
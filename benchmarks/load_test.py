@@ -0,0 +1,288 @@
+"""
+Load generator for the FastAPI backend.
+
+Replays a weighted mix of `PresentationRequest` payloads (see traffic_model.json) with a
+stepped ramp of concurrent users, then reports throughput, latency percentiles, error rate
+and the saturation point per stage. Each run is saved under benchmarks/reports/ and compared
+with the previous report so regressions are visible.
+
+Usage (from the repository root):
+    # Start a stub LLM + backend automatically and run the default traffic model
+    python -m benchmarks.load_test --spawn
+
+    # Or target an already running backend
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --users 1 4 16 --stage-seconds 60
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+DEFAULT_MODEL = BENCH_DIR / "traffic_model.json"
+DEFAULT_REPORTS_DIR = BENCH_DIR / "reports"
+
+
+# ---------------------- 🚦 TRAFFIC MODEL ----------------------
+class TrafficModel:
+    """Draws request payloads and think times according to a traffic model config."""
+
+    def __init__(self, config):
+        self.config = config
+        slide_counts = config["slide_counts"]
+        self.slide_choices = [int(count) for count in slide_counts]
+        self.slide_weights = list(slide_counts.values())
+
+    def next_payload(self, rng):
+        if rng.random() < self.config["repeat_topic_ratio"]:
+            topic = rng.choice(self.config["repeated_topics"])
+        else:
+            topic = f"Load test topic {uuid.uuid4().hex[:8]}"
+        return {
+            "topic": topic,
+            "num_slides": rng.choices(self.slide_choices, self.slide_weights)[0],
+            "audience": rng.choice(self.config["audiences"]),
+            "purpose": f"Explain {topic} to the audience.",
+        }
+
+    def think_time(self, rng):
+        low, high = self.config["think_time_seconds"]
+        return rng.uniform(low, high)
+
+
+# ---------------------- 👥 VIRTUAL USERS ----------------------
+def run_stage(base_url, model, users, stage_seconds, seed):
+    """Runs `users` closed-loop virtual users for `stage_seconds`; returns per-request samples."""
+    samples = []
+    samples_lock = threading.Lock()
+    deadline = time.monotonic() + stage_seconds
+    timeout = model.config["request_timeout_seconds"]
+
+    def user_loop(user_index):
+        rng = random.Random(seed * 1000 + user_index)
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            payload = model.next_payload(rng)
+            start = time.monotonic()
+            try:
+                response = session.post(f"{base_url}/generate_ppt", json=payload, timeout=timeout)
+                error = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = type(e).__name__
+            sample = {
+                "latency_s": time.monotonic() - start,
+                "num_slides": payload["num_slides"],
+                "error": error,
+            }
+            with samples_lock:
+                samples.append(sample)
+            time.sleep(min(model.think_time(rng), max(deadline - time.monotonic(), 0)))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=user_loop, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.monotonic() - started
+
+
+def summarize(users, samples, elapsed_s):
+    latencies = sorted(s["latency_s"] for s in samples if s["error"] is None)
+    errors = [s["error"] for s in samples if s["error"] is not None]
+    return {
+        "users": users,
+        "requests": len(samples),
+        "elapsed_s": round(elapsed_s, 2),
+        "throughput_rps": round(len(latencies) / elapsed_s, 3) if elapsed_s else 0.0,
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "errors": {error: errors.count(error) for error in set(errors)},
+        "latency_s": {
+            name: round(percentile(latencies, q), 3) for name, q in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99))
+        },
+        "latency_max_s": round(latencies[-1], 3) if latencies else None,
+    }
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def find_saturation(stages, min_throughput_gain, max_error_rate):
+    """
+    The saturation point is the first stage where adding users no longer buys meaningful
+    throughput (gain below `min_throughput_gain`) or the error rate exceeds `max_error_rate`.
+    Returns (saturated stage users, last healthy stage users); either may be None.
+    """
+    previous = None
+    for stage in stages:
+        if stage["error_rate"] > max_error_rate:
+            return stage["users"], previous["users"] if previous else None
+        if previous and previous["throughput_rps"] > 0:
+            gain = stage["throughput_rps"] / previous["throughput_rps"] - 1
+            if gain < min_throughput_gain:
+                return stage["users"], previous["users"]
+        previous = stage
+    return None, previous["users"] if previous else None
+
+
+# ---------------------- 💾 REPORTS ----------------------
+def save_report(report, reports_dir):
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    path = reports_dir / f"load-{report['started_at'].replace(':', '').replace('-', '')}.json"
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def latest_report(reports_dir, exclude=None):
+    reports = sorted(p for p in reports_dir.glob("load-*.json") if p != exclude)
+    return json.loads(reports[-1].read_text()) if reports else None
+
+
+def print_report(report, previous=None):
+    previous_by_users = {s["users"]: s for s in (previous or {}).get("stages", [])}
+    print(f"\n{'users':>5} | {'reqs':>5} | {'rps':>7} | {'err %':>6} | {'p50 s':>6} | {'p95 s':>6} | {'p99 s':>6} | {'Δ p95 vs prev':>13}")
+    for stage in report["stages"]:
+        before = previous_by_users.get(stage["users"])
+        delta = ""
+        if before and before["latency_s"]["p95"]:
+            delta = f"{(stage['latency_s']['p95'] / before['latency_s']['p95'] - 1) * 100:+.0f}%"
+        print(
+            f"{stage['users']:>5} | {stage['requests']:>5} | {stage['throughput_rps']:>7.2f} | "
+            f"{stage['error_rate'] * 100:>6.1f} | {stage['latency_s']['p50']:>6.2f} | "
+            f"{stage['latency_s']['p95']:>6.2f} | {stage['latency_s']['p99']:>6.2f} | {delta:>13}"
+        )
+
+    saturation = report["saturation"]
+    print(f"\n📈 Peak throughput: {report['peak_throughput_rps']:.2f} req/s")
+    if saturation["saturated_at_users"]:
+        print(f"🧱 Saturation at {saturation['saturated_at_users']} users (last healthy: {saturation['max_healthy_users']})")
+    else:
+        print(f"✅ No saturation up to {saturation['max_healthy_users']} users")
+    if previous:
+        change = report["peak_throughput_rps"] / previous["peak_throughput_rps"] - 1 if previous["peak_throughput_rps"] else 0
+        print(f"↔️  Peak throughput vs {previous['started_at']} ({previous.get('git_commit')}): {change * 100:+.1f}%")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------------- 🧪 LOCAL STACK (--spawn) ----------------------
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, timeout_s=60):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.5)
+    raise RuntimeError(f"{url} did not come up within {timeout_s}s")
+
+
+def spawn_stack(stub_latency_ms, stub_tokens_per_second):
+    """Starts the stub LLM server and a backend pointed at it; returns (base_url, processes)."""
+    stub_port, api_port = free_port(), free_port()
+    stub = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.stub_llm_server", "--port", str(stub_port),
+        "--latency-ms", str(stub_latency_ms), "--tokens-per-second", str(stub_tokens_per_second),
+    ], cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+    env = dict(os.environ, OPENAI_BASE_URL=f"http://127.0.0.1:{stub_port}/v1", OPENAI_API_KEY="stub")
+    api = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(api_port), "--log-level", "warning",
+    ], cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL)
+
+    base_url = f"http://127.0.0.1:{api_port}"
+    try:
+        wait_until_up(base_url)
+    except RuntimeError:
+        for process in (api, stub):
+            process.terminate()
+        raise
+    return base_url, [api, stub]
+
+
+# ---------------------- 🏁 MAIN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL, help="Traffic model JSON file.")
+    parser.add_argument("--users", type=int, nargs="+", help="Override the ramp's user counts.")
+    parser.add_argument("--stage-seconds", type=float, help="Override the ramp's stage duration.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--spawn", action="store_true", help="Start a stub LLM server and backend locally.")
+    parser.add_argument("--stub-latency-ms", type=float, default=300)
+    parser.add_argument("--stub-tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--reports-dir", type=Path, default=DEFAULT_REPORTS_DIR)
+    parser.add_argument("--label", default="", help="Free-form note stored with the report.")
+    args = parser.parse_args()
+
+    config = json.loads(args.model.read_text())
+    ramp_users = args.users or config["ramp"]["users"]
+    stage_seconds = args.stage_seconds or config["ramp"]["stage_seconds"]
+    model = TrafficModel(config)
+
+    processes = []
+    base_url = args.base_url.rstrip("/")
+    if args.spawn:
+        base_url, processes = spawn_stack(args.stub_latency_ms, args.stub_tokens_per_second)
+
+    started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    stages = []
+    try:
+        for stage_index, users in enumerate(ramp_users):
+            print(f"🚀 Stage {stage_index + 1}/{len(ramp_users)}: {users} user(s) for {stage_seconds:.0f}s")
+            samples, elapsed = run_stage(base_url, model, users, stage_seconds, args.seed + stage_index)
+            stages.append(summarize(users, samples, elapsed))
+    finally:
+        for process in processes:
+            process.terminate()
+
+    saturated_at, max_healthy = find_saturation(
+        stages, config["saturation"]["min_throughput_gain"], config["saturation"]["max_error_rate"]
+    )
+    report = {
+        "started_at": started_at,
+        "git_commit": git_commit(),
+        "label": args.label,
+        "base_url": base_url,
+        "spawned_stub": args.spawn,
+        "traffic_model": config,
+        "stages": stages,
+        "peak_throughput_rps": max((s["throughput_rps"] for s in stages), default=0.0),
+        "saturation": {"saturated_at_users": saturated_at, "max_healthy_users": max_healthy},
+    }
+
+    path = save_report(report, args.reports_dir)
+    print_report(report, latest_report(args.reports_dir, exclude=path))
+    print(f"\n💾 Report saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
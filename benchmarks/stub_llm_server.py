@@ -0,0 +1,188 @@
+"""
+Local stub of the OpenAI chat-completions API for load tests and offline runs.
+
+Replies are the same deterministic ones as the in-process `LLM_BACKEND=local` provider
+(backend/llm_backend.py), served over HTTP so the real OpenAI client and network path are exercised.
+Latency = base latency + uncached prompt tokens / prefill rate + completion tokens / tokens-per-second
+(+ optional jitter). Prompt prefixes are cached like the real API does: in 128-token blocks once
+a prompt is at least 1024 tokens long, reported as `prompt_tokens_details.cached_tokens`.
+`"stream": true` requests get server-sent events (with a final usage chunk when
+`stream_options.include_usage` is set), so time to first token can be measured.
+
+Usage (from the repository root):
+    python -m benchmarks.stub_llm_server --port 8900 --latency-ms 300 --tokens-per-second 80
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=stub uvicorn backend.main:app
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.llm_backend import count_tokens, local_completion_text
+
+CACHE_BLOCK_TOKENS = 128
+CACHE_MIN_TOKENS = 1024
+
+
+class PrefixCache:
+    """Remembers prompt prefixes (in whole cache blocks) and reports how many tokens were already seen."""
+
+    def __init__(self, block_tokens=CACHE_BLOCK_TOKENS, min_tokens=CACHE_MIN_TOKENS):
+        self.block_tokens = block_tokens
+        self.min_tokens = min_tokens
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def lookup_and_store(self, messages):
+        """Returns the number of cached prompt tokens and caches every block of this prompt."""
+        text = "".join(f"<|{m.get('role', '')}|>{m.get('content', '')}" for m in messages)
+        if count_tokens(text) < self.min_tokens:
+            return 0
+
+        block_chars = self.block_tokens * 4
+        digests = [
+            hashlib.sha256(text[:end].encode("utf-8")).digest()
+            for end in range(block_chars, len(text) + 1, block_chars)
+        ]
+        with self._lock:
+            hits = 0
+            while hits < len(digests) and digests[hits] in self._seen:
+                hits += 1
+            self._seen.update(digests)
+        return hits * self.block_tokens if hits * self.block_tokens >= self.min_tokens else 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    latency_s = 0.3
+    jitter_s = 0.0
+    tokens_per_second = 80.0
+    prefill_tokens_per_second = 4000.0
+    prefix_cache = None
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        messages = body.get("messages", [])
+        content = local_completion_text(messages)
+        prompt_tokens = sum(count_tokens(m.get("content", "")) for m in messages)
+        completion_tokens = count_tokens(content)
+        cached_tokens = min(self.prefix_cache.lookup_and_store(messages), prompt_tokens) if self.prefix_cache else 0
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+
+        time_to_first_token = self.latency_s + (prompt_tokens - cached_tokens) / self.prefill_tokens_per_second
+        if self.jitter_s:
+            time_to_first_token += random.uniform(0, self.jitter_s)
+        time.sleep(time_to_first_token)
+
+        completion_id = f"chatcmpl-stub-{hashlib.sha1(content.encode()).hexdigest()[:12]}"
+        model = body.get("model", "stub")
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            self._stream(completion_id, model, content, usage if include_usage else None)
+            return
+
+        time.sleep(completion_tokens / self.tokens_per_second)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, completion_id, model, content, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(choices, **extra):
+            self._write_event({
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model, "choices": choices, **extra,
+            })
+
+        pieces = re.findall(r"\S+\s*", content) or [content]
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(count_tokens(piece) / self.tokens_per_second)
+            delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+            chunk([{"index": 0, "delta": delta, "finish_reason": None}])
+        chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage:
+            chunk([], usage=usage)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_event(self, payload):
+        self._write_chunk(b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Per-request logging would dominate load-test output.
+
+
+def make_server(host="127.0.0.1", port=8900, latency_ms=300, jitter_ms=0, tokens_per_second=80.0,
+                prefill_tokens_per_second=4000.0, prefix_caching=True):
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "latency_s": latency_ms / 1000,
+        "jitter_s": jitter_ms / 1000,
+        "tokens_per_second": tokens_per_second,
+        "prefill_tokens_per_second": prefill_tokens_per_second,
+        "prefix_cache": PrefixCache() if prefix_caching else None,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=4000.0)
+    parser.add_argument("--no-prefix-caching", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.latency_ms, args.jitter_ms, args.tokens_per_second,
+        args.prefill_tokens_per_second, prefix_caching=not args.no_prefix_caching,
+    )
+    print(f"🧪 Stub LLM server listening on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
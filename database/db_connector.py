@@ -0,0 +1,165 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# ---------------------- ⚙️ CONNECTION SETTINGS ----------------------
+# Applied to every pooled connection.
+# - WAL lets readers run while a write is in progress (the mode is stored in the DB file).
+# - NORMAL sync is durable across application crashes in WAL mode and much cheaper than FULL.
+# - busy_timeout makes concurrent writers wait for the lock instead of failing immediately.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -8000,  # KiB, i.e. 8 MB page cache per connection
+    "mmap_size": 64 * 1024 * 1024,
+}
+# Compiled statements kept per connection; the SQL text is the cache key, so queries should be
+# module-level constants with "?" parameters.
+STATEMENT_CACHE_SIZE = 128
+
+
+# ---------------------- 🗄️ POOLED DATABASE ----------------------
+class Database:
+    """
+    SQLite access through a small pool of long-lived connections.
+    - `connection()` lends a connection for one transaction (commit on success, rollback on error).
+    - Reusing connections keeps their compiled-statement cache and page cache warm.
+    - `run_async()` executes database work on dedicated DB threads, so async code can await
+      it without blocking the event loop.
+    - `close()` closes the pool; using it again afterwards reopens it.
+    """
+
+    def __init__(self, path, pool_size=4, pragmas=None, acquire_timeout_s=30.0):
+        self.path = str(path)
+        self.pool_size = pool_size
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.acquire_timeout_s = acquire_timeout_s
+        self._idle = queue.LifoQueue()  # most recently used first: its caches are warmest
+        self._created = 0
+        self._waits = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._closed = False
+
+    # ---------------------- 🔌 CONNECTIONS ----------------------
+    @contextmanager
+    def connection(self):
+        """Yields a pooled connection inside a transaction."""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def execute(self, sql, params=()):
+        """Runs one write statement in its own transaction; returns the affected row count."""
+        with self.connection() as conn:
+            return conn.execute(sql, params).rowcount
+
+    def executemany(self, sql, rows):
+        with self.connection() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def fetchone(self, sql, params=()):
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql, params=()):
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    # ---------------------- ⚡ ASYNC ACCESS ----------------------
+    async def run_async(self, func, *args):
+        """Awaits `func(*args)` (any database work) on the DB threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), lambda: func(*args))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # One thread per pooled connection: DB work never waits for a thread, only for SQLite.
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="db")
+            return self._executor
+
+    # ---------------------- 📊 STATS & SHUTDOWN ----------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "connections_open": self._created,
+                "connections_idle": self._idle.qsize(),
+                "acquire_waits": self._waits,
+            }
+
+    def close(self):
+        """Closes idle connections and stops the DB threads (connections in use are closed on return)."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    def _release(self, conn):
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._created -= 1
+        if closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def _acquire(self):
+        if self._closed:
+            with self._lock:
+                self._closed = False  # Used again after close(): reopen.
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.pool_size
+            if can_create:
+                self._created += 1
+            else:
+                self._waits += 1
+        if can_create:
+            try:
+                return self._connect()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.acquire_timeout_s)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection became free within {self.acquire_timeout_s}s.") from None
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,  # connections move between threads, but only one uses them at a time
+            cached_statements=STATEMENT_CACHE_SIZE,
+            timeout=self.pragmas.get("busy_timeout", 5000) / 1000,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
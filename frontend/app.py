@@ -1,6 +1,6 @@
 import streamlit as st
 from components.user_input_form import get_user_inputs
-from components.ppt_generation import generate_ppt
+from components.ppt_generation import generate_ppt, show_generation_progress
 from components.download_section import download_ppt
 from pages.upload_template import upload_template
 from pages.iterative_feedback import iterative_feedback
@@ -28,6 +28,7 @@ col1, col2 = st.columns(2)
 with col1:
     if st.button("🚀 Generate PPT"):
         generate_ppt(user_inputs)
+    show_generation_progress()
 
 with col2:
     download_ppt()
@@ -1,27 +1,55 @@
-import requests  # ✅ FIXED: Importing requests library
 import streamlit as st
 
-from frontend.utils.api_handler import get_backend_base_url
+from frontend.utils.api_handler import (
+    check_ppt_available,
+    fetch_ppt_preview,
+    fetch_thumbnails,
+    get_backend_base_url,
+)
 
 def download_ppt():
+    if st.session_state.get("ppt_error"):
+        st.error(f"❌ Failed to generate presentation. Error: {st.session_state['ppt_error']}")
+
     if "ppt_filename" in st.session_state and st.session_state["ppt_filename"]:
         ppt_filename = st.session_state["ppt_filename"]
         base_url = get_backend_base_url()
         ppt_url = f"{base_url}/download_ppt/{ppt_filename}"
 
+        st.success("✅ Presentation Created Successfully!")
+
         # ✅ Show proper debug info
         st.write(f"📂 Debug: Stored PPT Filename: `{ppt_filename}`")
-        
+
         # ✅ Add a download button
         st.markdown(f'<a href="{ppt_url}" download="{ppt_filename}">📥 Click here to Download PPT</a>', unsafe_allow_html=True)
 
-        # ✅ Optional: Check if the file is accessible
-        try:
-            response = requests.head(ppt_url, timeout=5)
-            if response.status_code == 404:
-                st.error("❌ PPT file not found on server. Try regenerating the presentation.")
-        except requests.RequestException:
+        # ✅ Optional: Check if the file is accessible (cached, so reruns don't hit the backend)
+        available = check_ppt_available(ppt_filename)
+        if available is False:
+            st.error("❌ PPT file not found on server. Try regenerating the presentation.")
+        elif available is None:
             st.warning("⚠️ Unable to verify PPT availability. Download may still succeed.")
 
+        # ✅ Preview is fetched only on demand, then served from cache
+        if st.toggle("👀 Preview slide text"):
+            preview = fetch_ppt_preview(ppt_filename)
+            if preview is None:
+                st.warning("⚠️ Preview is not available right now.")
+            else:
+                st.text(preview)
+
+        # ✅ Slide images are rendered in the background by the backend and cached per deck
+        if st.toggle("🖼️ Show slide thumbnails"):
+            status, thumbnails = fetch_thumbnails(ppt_filename)
+            if status == "ready":
+                st.image(thumbnails, caption=[f"Slide {i + 1}" for i in range(len(thumbnails))], width=240)
+            elif status == "pending":
+                st.info("⏳ Thumbnails are being rendered. Toggle again in a few seconds.")
+            elif status == "unavailable":
+                st.warning("⚠️ Thumbnails are not enabled on this server.")
+            else:
+                st.warning("⚠️ Thumbnails are not available right now.")
+
     else:
         st.warning("⚠️ No PPT available for download. Generate a new one first.")
@@ -1,25 +1,64 @@
-import requests
+import time
+
 import streamlit as st
 
-from frontend.utils.api_handler import get_backend_base_url
+from frontend.utils.api_handler import DEBUG_REQUESTS, BackgroundJob, post_generate_ppt, session_tenant
+
+# Rough per-slide generation time, only used to animate the progress bar.
+ESTIMATED_SECONDS_PER_SLIDE = 4
+
 
 def generate_ppt(user_inputs):
-    st.subheader("🛠️ Generating AI-Powered Presentation...")
+    """
+    Starts generating a presentation in a background thread and returns immediately.
+    Progress is rendered by `show_generation_progress` on every rerun.
+    """
+    job = st.session_state.get("ppt_job")
+    if job and not job["job"].poll():
+        st.info("⏳ A presentation is already being generated.")
+        return
+
+    st.session_state["ppt_job"] = {
+        "job": BackgroundJob(post_generate_ppt, dict(user_inputs), session_tenant()),
+        "num_slides": user_inputs.get("num_slides", 1),
+    }
+
+
+@st.fragment(run_every=1)
+def show_generation_progress():
+    """
+    Polls the background generation job once a second. Only this fragment reruns
+    while waiting, so the rest of the page stays interactive.
+    """
+    job = st.session_state.get("ppt_job")
+    if not job:
+        return
 
-    base_url = get_backend_base_url()
-    endpoint = f"{base_url}/generate_ppt"
+    background = job["job"]
+    if not background.poll():
+        st.subheader("🛠️ Generating AI-Powered Presentation...")
+        if background.started_at is None:
+            st.info("⏳ Waiting for a free worker...")
+            return
+        elapsed = time.time() - background.started_at
+        estimate = max(job["num_slides"] * ESTIMATED_SECONDS_PER_SLIDE, 1)
+        st.progress(min(elapsed / estimate, 0.95), text=f"⏳ Working... {elapsed:.0f}s elapsed")
+        return
 
+    del st.session_state["ppt_job"]
     try:
-        response = requests.post(endpoint, json=user_inputs, timeout=1000)
-        response.raise_for_status()
-
-        if response.status_code == 200:
-            st.success("✅ Presentation Created Successfully!")
-            ppt_filename = response.json().get("file")
-            st.session_state["ppt_filename"] = ppt_filename
-        else:
-            error_msg = response.json().get("detail", response.text)
-            st.error(f"❌ Failed to generate presentation. Error: {error_msg}")
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"⚠️ Could not connect to the API: {str(e)}")
+        result = background.future.result()
+    except Exception as e:
+        st.session_state["ppt_error"] = str(e)
+    else:
+        st.session_state["ppt_filename"] = result.get("file")
+        st.session_state["ppt_deck_id"] = result.get("deck_id")
+        st.session_state["ppt_num_slides"] = result.get("num_slides")
+        st.session_state["ppt_trace_id"] = result.get("trace_id")
+        st.session_state.pop("ppt_error", None)
+        if DEBUG_REQUESTS:
+            # Time the user actually waited (incl. polling) next to the backend trace it belongs to.
+            print(f"⏱️ Deck shown after {time.time() - background.submitted_at:.1f}s in the UI "
+                  f"(trace {result.get('trace_id')})")
+    # Full rerun so the download section picks up the new file.
+    st.rerun()
@@ -6,7 +6,11 @@ def get_user_inputs():
     topic = st.text_input("🔹 Enter the Topic:", "AI in Finance")
     audience = st.selectbox("👥 Target Audience:", ["General Public", "Executives", "Students", "Technical Team"])
     duration = st.slider("⏳ Presentation Duration (minutes):", 5, 60, 20)
-    num_slides = st.slider("📑 Number of Slides:", 1, 20, 5)
+    large_deck = st.toggle("📚 Large deck (generated section by section, up to 500 slides)")
+    if large_deck:
+        num_slides = st.number_input("📑 Number of Slides:", min_value=21, max_value=500, value=100, step=10)
+    else:
+        num_slides = st.slider("📑 Number of Slides:", 1, 20, 5)
     purpose = st.text_area("🎯 Purpose of the Presentation", "Explain how AI is used in finance.")
 
     st.subheader("🎨 Design Preferences")
@@ -23,6 +27,7 @@ def get_user_inputs():
         "audience": audience,
         "duration": duration,
         "num_slides": num_slides,
+        "large_deck": large_deck,
         "purpose": purpose,
         "design_style": design_style,
         "font_choice": font_choice,
@@ -1,9 +1,44 @@
 import streamlit as st
 
+from frontend.utils.api_handler import post_regenerate_slides, session_tenant
+
 def iterative_feedback():
     st.title("🔁 Improve Your Presentation Iteratively")
 
-    feedback = st.text_area("📝 Provide feedback to improve the PPT", "")
-    
+    deck_id = st.session_state.get("ppt_deck_id")
+    num_slides = st.session_state.get("ppt_num_slides")
+    if not deck_id or not num_slides:
+        st.warning("⚠️ Generate a presentation first, then come back to refine individual slides.")
+        return
+
+    st.write(f"📂 Improving: `{st.session_state.get('ppt_filename')}`")
+
+    # ✅ Only the selected slides are regenerated; the rest of the deck is kept as-is
+    selected = st.multiselect("📑 Slides to improve:", list(range(1, num_slides + 1)))
+    feedback = {
+        slide_number: st.text_area(f"📝 Feedback for slide {slide_number}", key=f"feedback_{slide_number}")
+        for slide_number in selected
+    }
+
     if st.button("Submit Feedback"):
-        st.success("✅ Feedback submitted! AI will use this to improve the next version.")
\ No newline at end of file
+        slides = [
+            {"slide_number": slide_number, "feedback": text.strip()}
+            for slide_number, text in feedback.items() if text.strip()
+        ]
+        if not slides:
+            st.warning("⚠️ Select at least one slide and describe what should change.")
+            return
+
+        with st.spinner(f"🛠️ Regenerating {len(slides)} slide(s)..."):
+            try:
+                result = post_regenerate_slides(deck_id, slides, session_tenant())
+            except Exception as e:
+                st.error(f"❌ Failed to improve the presentation. Error: {str(e)}")
+                return
+
+        st.success(f"✅ Updated slide(s) {', '.join(map(str, result.get('regenerated', [])))}. Download the deck again to see the changes.")
+
+
+if __name__ == "__main__":
+    # Streamlit runs page scripts as __main__; importing from app.py only defines the page.
+    iterative_feedback()
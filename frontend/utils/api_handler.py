@@ -1,7 +1,28 @@
 import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 
+import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Requests still running after this long are reported as failed by the UI.
+GENERATION_TIMEOUT_SECONDS = 1000
+# How long availability checks and previews are reused across Streamlit reruns.
+CACHE_TTL_SECONDS = 600
+# Prefix of the tenant each browser session is scheduled as by the backend ("<prefix>:<session id>", sent
+# as X-Tenant-ID; the backend only honours it if this server is one of its SCHEDULER_TRUSTED_PROXIES).
+TENANT_ID = os.getenv("FRONTEND_TENANT_ID", "streamlit").strip()
+# Log every backend POST's wait time and trace ID to the console (for matching UI waits to backend traces).
+DEBUG_REQUESTS = os.getenv("FRONTEND_DEBUG_REQUESTS", "false").lower() in ("1", "true", "yes")
+# Long backend calls (deck generations) this Streamlit process runs at once, across all sessions; size it
+# to the expected number of concurrent users. Further calls wait in the queue until a worker is free.
+MAX_CONCURRENT_JOBS = max(int(os.getenv("FRONTEND_MAX_CONCURRENT_JOBS", "16")), 1)
+# A queued call whose session stopped polling for this long (closed tab) is dropped instead of started.
+ABANDONED_AFTER_SECONDS = 10
 
 
 @lru_cache(maxsize=1)
@@ -23,3 +44,177 @@ def get_backend_base_url() -> str:
 
     base_url = env_url or secret_url or "http://localhost:8000"
     return base_url.rstrip("/")
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """
+    Shared keep-alive session for every backend call made by this Streamlit process.
+    Idempotent requests (GET/HEAD) are retried on connection errors; POSTs never are.
+    """
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.3, allowed_methods=frozenset({"GET", "HEAD"}))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(MAX_CONCURRENT_JOBS, 16), max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_background_executor() -> ThreadPoolExecutor:
+    """Worker threads that run long backend calls so the UI script never blocks on them."""
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="ppt-api")
+
+
+class JobAbandoned(Exception):
+    """The session that queued a background job stopped polling before a worker picked it up."""
+
+
+class BackgroundJob:
+    """
+    One backend call of a session, run on the shared background executor.
+    - `started_at` is set once a worker actually starts the call (None while queued).
+    - The session calls `poll()` on every rerun; a job still queued when its session has not
+      polled for ABANDONED_AFTER_SECONDS is dropped. A call already running is not interrupted.
+    """
+
+    def __init__(self, func, *args):
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.last_polled = self.submitted_at
+        self.future = get_background_executor().submit(self._run, func, *args)
+
+    def poll(self) -> bool:
+        """Marks the session as still waiting; returns True once the call has finished."""
+        self.last_polled = time.time()
+        return self.future.done()
+
+    def _run(self, func, *args):
+        if time.time() - self.last_polled > ABANDONED_AFTER_SECONDS:
+            raise JobAbandoned()
+        self.started_at = time.time()
+        return func(*args)
+
+
+def session_tenant() -> str:
+    """
+    The tenant the current browser session is scheduled as, so the backend fair-queues users against
+    each other instead of treating the whole frontend as one tenant. Call it from the script thread
+    (background jobs have no session state) and pass it to the post_* functions.
+    """
+    session_id = st.session_state.setdefault("tenant_session_id", secrets.token_hex(8))
+    return f"{TENANT_ID}:{session_id}" if TENANT_ID else session_id
+
+
+def post_generate_ppt(user_inputs: dict, tenant: str = None) -> dict:
+    """Calls /generate_ppt and returns its JSON body (raises on HTTP errors)."""
+    return _post_json("/generate_ppt", user_inputs, tenant)
+
+
+def post_regenerate_slides(deck_id: str, slides: list, tenant: str = None) -> dict:
+    """
+    Calls /regenerate_slides for the given deck. `slides` is a list of
+    {"slide_number": int, "feedback": str} entries.
+    """
+    result = _post_json("/regenerate_slides", {"deck_id": deck_id, "slides": slides}, tenant)
+    # The deck file was patched in place, so cached checks/previews are stale.
+    invalidate_ppt_cache()
+    return result
+
+
+def new_traceparent() -> tuple:
+    """A fresh W3C trace context for one backend call: (traceparent header value, trace_id)."""
+    trace_id = secrets.token_hex(16)
+    return f"00-{trace_id}-{secrets.token_hex(8)}-01", trace_id
+
+
+def _post_json(path: str, payload: dict, tenant: str = None) -> dict:
+    # The backend records its spans under this trace, so the wait below can be matched to them.
+    traceparent, trace_id = new_traceparent()
+    # The backend stops working on the request once this client would have given up on it.
+    headers = {"traceparent": traceparent, "X-Request-Timeout": str(GENERATION_TIMEOUT_SECONDS)}
+    if tenant:
+        headers["X-Tenant-ID"] = tenant
+    started = time.perf_counter()
+    response = get_session().post(
+        f"{get_backend_base_url()}{path}", json=payload, timeout=GENERATION_TIMEOUT_SECONDS, headers=headers,
+    )
+    wait_ms = (time.perf_counter() - started) * 1000
+    if DEBUG_REQUESTS:
+        print(f"⏱️ POST {path}: {wait_ms:.0f} ms (trace {trace_id}, status {response.status_code})")
+    if response.status_code != 200:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise RuntimeError(detail)
+    return {**response.json(), "trace_id": trace_id, "ui_wait_ms": round(wait_ms, 1)}
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def _cached_ppt_status(filename: str) -> int:
+    # Connection errors propagate, and st.cache_data never caches exceptions.
+    return get_session().head(f"{get_backend_base_url()}/download_ppt/{filename}", timeout=5).status_code
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=64, show_spinner=False)
+def _cached_ppt_preview(filename: str) -> str:
+    response = get_session().get(f"{get_backend_base_url()}/preview_ppt/{filename}", timeout=30)
+    response.raise_for_status()
+    return response.json().get("preview", "")
+
+
+class _ThumbnailsNotReady(Exception):
+    def __init__(self, status: str):
+        super().__init__(status)
+        self.status = status
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=64, show_spinner=False)
+def _cached_thumbnails(filename: str) -> list:
+    # Only finished listings are cached; "pending" raises so the next rerun asks again.
+    response = get_session().get(f"{get_backend_base_url()}/thumbnails/{filename}", timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != "ready":
+        raise _ThumbnailsNotReady(data.get("status", "unknown"))
+    return [f"{get_backend_base_url()}{url}" for url in data.get("slides", [])]
+
+
+def check_ppt_available(filename: str):
+    """
+    Returns True/False for whether the backend still serves `filename`,
+    or None when the backend could not be reached. Successful checks are cached across reruns.
+    """
+    try:
+        return _cached_ppt_status(filename) != 404
+    except requests.RequestException:
+        return None
+
+
+def fetch_ppt_preview(filename: str):
+    """Returns the backend's text preview for `filename`, or None if it is unavailable."""
+    try:
+        return _cached_ppt_preview(filename)
+    except requests.RequestException:
+        return None
+
+
+def fetch_thumbnails(filename: str):
+    """
+    Returns (status, image_urls) for a deck's slide thumbnails.
+    status is "ready", "pending", "failed", "unavailable" or "error" (backend unreachable).
+    """
+    try:
+        return "ready", _cached_thumbnails(filename)
+    except _ThumbnailsNotReady as e:
+        return e.status, []
+    except requests.RequestException:
+        return "error", []
+
+
+def invalidate_ppt_cache():
+    """Drops cached availability checks, previews and thumbnails (e.g. after a deck was modified)."""
+    _cached_ppt_status.clear()
+    _cached_ppt_preview.clear()
+    _cached_thumbnails.clear()
@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+# Point every file the backend writes (database, decks, thumbnails below OUTPUT_DIR, profiles,
+# traces, LLM recordings) at a throwaway directory before any backend module is imported, so running the
+# suite never touches database/feedback.db, output/, profiles/ or traces/ of the repository.
+_TEST_DIR = tempfile.mkdtemp(prefix="ppt-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(_TEST_DIR, "test.db")
+os.environ["OUTPUT_DIR"] = os.path.join(_TEST_DIR, "output")
+os.environ["PROFILES_DIR"] = os.path.join(_TEST_DIR, "profiles")
+os.environ["TRACE_EXPORTER"] = "jsonl"
+os.environ["TRACE_FILE"] = os.path.join(_TEST_DIR, "traces", "spans.jsonl")
+os.environ["LLM_RECORDINGS_DIR"] = os.path.join(_TEST_DIR, "llm_recordings")
+os.environ["LLM_BACKEND"] = "local"
+os.environ["WARM_ON_STARTUP"] = "false"  # No background warming runs while tests start the app
+os.environ.setdefault("LOCAL_LLM_LATENCY_MS", "0")
+os.environ.setdefault("LOCAL_LLM_TOKENS_PER_SECOND", "0")
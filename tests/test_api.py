@@ -0,0 +1,149 @@
+import os
+import uuid
+from email.utils import formatdate
+
+import pytest
+from fastapi.testclient import TestClient
+from pptx import Presentation
+
+from backend.config import OUTPUT_DIR
+from backend.db_handler import retrieve_deck_state
+from backend.file_hash import file_content_hash
+from backend.main import app
+
+client = TestClient(app)
+DECK_BYTES = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def deck():
+    """A deck file in the output directory; yields its filename."""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    path = OUTPUT_DIR / f"test_{uuid.uuid4().hex}_presentation.pptx"
+    path.write_bytes(DECK_BYTES)
+    yield path.name
+    path.unlink(missing_ok=True)
+
+
+# ---------------------- 📥 DOWNLOAD PPT ----------------------
+def test_download_sends_strong_etag_and_cache_headers(deck):
+    response = client.get(f"/download_ppt/{deck}")
+
+    assert response.status_code == 200
+    assert response.content == DECK_BYTES
+    assert response.headers["etag"] == f'"{file_content_hash(OUTPUT_DIR / deck)}"'
+    assert not response.headers["etag"].startswith("W/")
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" in response.headers
+
+
+def test_matching_if_none_match_returns_304(deck):
+    etag = client.get(f"/download_ppt/{deck}").headers["etag"]
+
+    response = client.get(f"/download_ppt/{deck}", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_changed_deck_is_sent_again(deck):
+    etag = client.get(f"/download_ppt/{deck}").headers["etag"]
+    (OUTPUT_DIR / deck).write_bytes(b"regenerated deck")
+
+    response = client.get(f"/download_ppt/{deck}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.content == b"regenerated deck"
+    assert response.headers["etag"] != etag
+
+
+def test_if_modified_since_applies_only_without_if_none_match(deck):
+    path = OUTPUT_DIR / deck
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    later = formatdate(1_700_000_100, usegmt=True)
+
+    assert client.get(f"/download_ppt/{deck}", headers={"If-Modified-Since": later}).status_code == 304
+    response = client.get(f"/download_ppt/{deck}", headers={"If-Modified-Since": later, "If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_range_request_returns_206_with_requested_bytes(deck):
+    response = client.get(f"/download_ppt/{deck}", headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.content == DECK_BYTES[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(DECK_BYTES)}"
+
+
+def test_range_with_stale_if_range_returns_whole_deck(deck):
+    response = client.get(f"/download_ppt/{deck}", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content == DECK_BYTES
+
+
+def test_unsatisfiable_range_returns_416(deck):
+    response = client.get(f"/download_ppt/{deck}", headers={"Range": f"bytes={len(DECK_BYTES) + 10}-"})
+
+    assert response.status_code == 416
+
+
+def test_head_returns_headers_without_body(deck):
+    get_response = client.get(f"/download_ppt/{deck}")
+
+    response = client.head(f"/download_ppt/{deck}")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["etag"] == get_response.headers["etag"]
+    assert response.headers["content-length"] == str(len(DECK_BYTES))
+
+
+def test_missing_deck_returns_404():
+    assert client.get("/download_ppt/missing_presentation.pptx").status_code == 404
+    assert client.head("/download_ppt/missing_presentation.pptx").status_code == 404
+
+
+# ---------------------- 🔁 REGENERATE SLIDES ----------------------
+@pytest.fixture(scope="module")
+def generated_deck():
+    """A 3-slide deck generated with the local LLM backend; yields the /generate_ppt response."""
+    with TestClient(app) as lifespan_client:
+        response = lifespan_client.post("/generate_ppt", json={"topic": "Regeneration", "num_slides": 3})
+    assert response.status_code == 200, response.text
+    yield response.json()
+
+
+def _slide_texts(filename):
+    prs = Presentation(OUTPUT_DIR / filename)
+    return [[shape.text_frame.text for shape in slide.shapes if shape.has_text_frame] for slide in prs.slides]
+
+
+def _regenerate(deck_id, *slide_numbers):
+    slides = [{"slide_number": number, "feedback": "Add a concrete example."} for number in slide_numbers]
+    return client.post("/regenerate_slides", json={"deck_id": deck_id, "slides": slides})
+
+
+def test_regenerate_unknown_deck_returns_404():
+    assert _regenerate(uuid.uuid4().hex, 1).status_code == 404
+
+
+def test_regenerate_slide_out_of_range_is_rejected(generated_deck):
+    assert _regenerate(generated_deck["deck_id"], 4).status_code == 400
+    assert _regenerate(generated_deck["deck_id"], 0).status_code == 422
+
+
+def test_regenerated_slide_is_patched_into_deck_and_state(generated_deck):
+    before = _slide_texts(generated_deck["file"])
+
+    response = _regenerate(generated_deck["deck_id"], 2)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["regenerated"] == [2]
+    after = _slide_texts(generated_deck["file"])
+    state = retrieve_deck_state(generated_deck["deck_id"])
+    assert after[1] != before[1]
+    assert state["slides"][1].splitlines()[0] in after[1][1]
+    assert after[0] == before[0] and after[2] == before[2]
@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+
+from backend import main
+from backend.checkpoints import GenerationCheckpoint
+from backend.db_handler import db
+from backend.pipeline import Pipeline
+from backend.retry import RetryBudget
+
+
+@pytest.fixture
+def request_hash():
+    return uuid.uuid4().hex
+
+
+def test_finished_stages_are_restored_by_a_new_checkpoint(request_hash):
+    first = GenerationCheckpoint(request_hash)
+    assert first.run("titles", lambda: ["Intro", "Outlook"]) == ["Intro", "Outlook"]
+    assert first.run("slide_1", lambda: "• Point") == "• Point"
+    assert first.stored == 2
+
+    resumed = GenerationCheckpoint(request_hash)
+    assert resumed.resumed_items() == ["slide_1", "titles"]
+    assert resumed.run("titles", lambda: pytest.fail("checkpointed stage ran again")) == ["Intro", "Outlook"]
+    assert resumed.stored == 0
+
+
+def test_clear_drops_the_checkpoint(request_hash):
+    GenerationCheckpoint(request_hash).run("titles", lambda: ["Intro"])
+    GenerationCheckpoint(request_hash).clear()
+    assert GenerationCheckpoint(request_hash).resumed_items() == []
+
+
+def test_stale_checkpoints_are_ignored(request_hash):
+    GenerationCheckpoint(request_hash).run("titles", lambda: ["Intro"])
+    db.execute("""
+        UPDATE generation_checkpoints SET timestamp = datetime('now', '-2 hours') WHERE request_hash = ?
+    """, (request_hash,))
+    assert GenerationCheckpoint(request_hash, max_age_hours=1).resumed_items() == []
+
+
+def test_failed_generation_resumes_with_only_the_missing_stages(request_hash):
+    calls, fail_slide_2 = [], [True]
+
+    def stage(item, value):
+        def run(*_):
+            calls.append(item)
+            if item == "slide_2" and fail_slide_2[0]:
+                raise RuntimeError("LLM error")
+            return value
+        return run
+
+    def generate():
+        checkpoint = GenerationCheckpoint(request_hash)
+        pipeline = Pipeline()
+        pipeline.add_stage("titles", lambda: checkpoint.run("titles", stage("titles", ["A", "B"])))
+        for i in (1, 2):
+            pipeline.add_stage(f"slide_{i}", lambda titles, i=i: checkpoint.run(
+                f"slide_{i}", stage(f"slide_{i}", f"body {titles[i - 1]}")
+            ), deps=("titles",))
+        return pipeline.run().results
+
+    with pytest.raises(RuntimeError):
+        generate()
+    assert sorted(calls) == ["slide_1", "slide_2", "titles"]
+
+    calls.clear()
+    fail_slide_2[0] = False
+    results = generate()
+    assert calls == ["slide_2"]
+    assert results["slide_1"] == "body A" and results["slide_2"] == "body B"
+
+
+def test_titles_fall_back_after_retries_without_being_checkpointed(request_hash, monkeypatch):
+    calls = []
+
+    def flaky_titles(topic, num_slides):
+        calls.append(topic)
+        raise ValueError("AI returned 1 slides instead of 2.")
+
+    monkeypatch.setattr(main.enricher, "generate_slide_titles", flaky_titles)
+    checkpoint = GenerationCheckpoint(request_hash)
+    titles = main.checkpointed_titles(checkpoint, "titles", "Wind power", 2, lambda: main.cached_titles(
+        "Wind power", 2, RetryBudget(limit=1)
+    ))
+
+    assert len(calls) == 2  # First attempt plus the one retry the budget allows.
+    assert titles == main.fallback_titles("Wind power", 2)
+    assert GenerationCheckpoint(request_hash).resumed_items() == []
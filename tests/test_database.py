@@ -0,0 +1,45 @@
+import pytest
+
+from database.db_connector import Database
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = Database(tmp_path / "pool.db", pool_size=2)
+    yield db
+    db.close()
+
+
+def test_connections_are_reused(database):
+    database.execute("CREATE TABLE items (name TEXT)")
+    database.execute("INSERT INTO items VALUES (?)", ("a",))
+    assert database.fetchall("SELECT name FROM items") == [("a",)]
+    assert database.stats()["connections_open"] == 1
+
+
+def test_failed_transaction_is_rolled_back(database):
+    database.execute("CREATE TABLE items (name TEXT)")
+    with pytest.raises(RuntimeError):
+        with database.connection() as conn:
+            conn.execute("INSERT INTO items VALUES ('lost')")
+            raise RuntimeError("boom")
+    assert database.fetchall("SELECT name FROM items") == []
+
+
+def test_connection_in_use_is_closed_on_return_after_close(database):
+    database.fetchone("SELECT 1")  # One idle connection ...
+    with database.connection():  # ... lent out again, then a second one.
+        with database.connection() as busy:
+            database.close()
+            assert database.stats()["connections_open"] == 2
+        assert database.stats()["connections_open"] == 1
+    assert database.stats()["connections_open"] == 0
+    assert database.stats()["connections_idle"] == 0
+    with pytest.raises(Exception):
+        busy.execute("SELECT 1")  # Closed, not leaked back into the pool.
+
+
+def test_pool_reopens_when_used_after_close(database):
+    database.close()
+    assert database.fetchone("SELECT 1") == (1,)
+    assert database.stats()["connections_idle"] == 1
@@ -0,0 +1,137 @@
+import ipaddress
+import threading
+import time
+
+from backend.cancellation import CancelToken, RequestCancelled, current_cancellation
+from backend.fair_scheduler import BULK, INTERACTIVE, FairScheduler, parse_networks, scheduled_job, tenant_for
+
+
+class _Calls:
+    """LLM calls made through a scheduler from separate threads, recording the grant order."""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.granted = []
+        self.cancelled = []
+        self.threads = []
+
+    def start(self, tenant, priority=INTERACTIVE, hold=None, token=None):
+        def call():
+            if token is not None:
+                current_cancellation.set(token)
+            try:
+                with scheduled_job(tenant, priority), self.scheduler.slot():
+                    self.granted.append(tenant)
+                    if hold is not None:
+                        hold.wait(2)
+            except RequestCancelled:
+                self.cancelled.append(tenant)
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        self.threads.append(thread)
+        return self
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 2
+        while not condition(self.scheduler.metrics()) and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def join(self):
+        for thread in self.threads:
+            thread.join(2)
+
+
+def _queued_behind_holder(scheduler, calls):
+    """Occupies the only slot, queues `calls` as (tenant, priority) in order, then frees the slot."""
+    release, recorder = threading.Event(), _Calls(scheduler)
+    recorder.start("holder", hold=release)
+    recorder.wait_until(lambda m: m["in_flight"] == 1)
+    for queued, (tenant, priority) in enumerate(calls, start=1):
+        recorder.start(tenant, priority)
+        recorder.wait_until(lambda m, queued=queued: m["waiting"] == queued)
+    release.set()
+    recorder.join()
+    return recorder.granted[1:]
+
+
+def test_weights_share_slots_proportionally():
+    scheduler = FairScheduler(max_in_flight=1, weights={"a": 2})
+    order = _queued_behind_holder(scheduler, [("a", INTERACTIVE)] * 6 + [("b", INTERACTIVE)] * 6)
+
+    assert order[:6].count("a") == 4
+    assert order[:6].count("b") == 2
+
+
+def test_interactive_calls_go_before_bulk_ones():
+    scheduler = FairScheduler(max_in_flight=1, bulk_promote_s=60)
+    order = _queued_behind_holder(scheduler, [("bulk", BULK), ("bulk", BULK), ("user", INTERACTIVE)])
+
+    assert order == ["user", "bulk", "bulk"]
+
+
+def test_bulk_calls_waiting_too_long_are_promoted():
+    scheduler = FairScheduler(max_in_flight=1, bulk_promote_s=0.05)
+    release, calls = threading.Event(), _Calls(scheduler)
+    calls.start("holder", hold=release)
+    calls.wait_until(lambda m: m["in_flight"] == 1)
+    calls.start("bulk", BULK)
+    time.sleep(0.1)
+    calls.start("user", INTERACTIVE)
+    calls.wait_until(lambda m: m["waiting"] == 2)
+    release.set()
+    calls.join()
+
+    assert calls.granted == ["holder", "bulk", "user"]
+    assert scheduler.metrics()["bulk_promoted"] == 1
+
+
+def test_per_tenant_cap_lets_other_tenants_through():
+    scheduler = FairScheduler(max_in_flight=3, tenant_max_in_flight=1)
+    release, calls = threading.Event(), _Calls(scheduler)
+    calls.start("busy", hold=release).start("busy", hold=release).start("other", hold=release)
+    calls.wait_until(lambda m: m["in_flight"] == 2 and m["waiting"] == 1)
+
+    tenants = scheduler.metrics()["tenants"]
+    assert (tenants["busy"]["in_flight"], tenants["busy"]["waiting"]) == (1, 1)
+    assert tenants["other"]["in_flight"] == 1
+    release.set()
+    calls.join()
+    assert sorted(calls.granted) == ["busy", "busy", "other"]
+
+
+def test_cancelled_request_leaves_the_queue():
+    scheduler = FairScheduler(max_in_flight=1)
+    release, token, calls = threading.Event(), CancelToken(), _Calls(scheduler)
+    calls.start("holder", hold=release)
+    calls.wait_until(lambda m: m["in_flight"] == 1)
+    calls.start("gone", token=token)
+    calls.wait_until(lambda m: m["waiting"] == 1)
+
+    token.cancel()
+    calls.wait_until(lambda m: m["waiting"] == 0)
+
+    assert scheduler.metrics()["waiting"] == 0
+    release.set()
+    calls.join()
+    assert calls.cancelled == ["gone"] and calls.granted == ["holder"]
+
+
+def test_calls_outside_a_job_are_not_scheduled():
+    scheduler = FairScheduler(max_in_flight=1)
+    with scheduler.slot():
+        assert scheduler.metrics()["in_flight"] == 0
+
+
+# ---------------------- 🏷️ TENANT ----------------------
+def test_tenant_header_is_honoured_only_from_trusted_proxies():
+    proxies = parse_networks("10.0.0.5, 192.168.1.0/24, not-a-network")
+
+    assert proxies == [ipaddress.ip_network("10.0.0.5/32"), ipaddress.ip_network("192.168.1.0/24")]
+    assert tenant_for("10.0.0.5", "acme:session", proxies) == "acme:session"
+    assert tenant_for("192.168.1.77", "acme", proxies) == "acme"
+    assert tenant_for("203.0.113.9", "acme", proxies) == "203.0.113.9"
+    assert tenant_for("10.0.0.5", "   ", proxies) == "10.0.0.5"
+    assert tenant_for("testclient", "acme", proxies) == "testclient"
+    assert tenant_for(None, "acme", proxies) == "anonymous"
+    assert len(tenant_for("10.0.0.5", "x" * 100, proxies)) == 64
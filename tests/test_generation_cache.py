@@ -0,0 +1,46 @@
+import uuid
+
+from backend.cache_warmer import CacheWarmer
+from backend.db_handler import claim_cached_generation, retrieve_cached_generation, store_cached_generation
+from backend.generation_cache import REQUEST, WARMER, GenerationCache
+
+
+def test_request_and_warmed_entries_of_one_key_coexist():
+    key = uuid.uuid4().hex
+    store_cached_generation(key, "titles", ["warmed"], WARMER)
+    store_cached_generation(key, "titles", ["live"], REQUEST)
+
+    assert retrieve_cached_generation(key, 1, WARMER) == ["warmed"]
+    assert claim_cached_generation(key, WARMER)
+    assert retrieve_cached_generation(key, 1, REQUEST) == ["live"]
+
+
+def test_warmed_entry_serves_one_request():
+    cache = GenerationCache(namespace=uuid.uuid4().hex, ttl_hours=1, live_ttl_hours=0)
+    cache.get_or_compute("titles", ("topic", 2), lambda: ["Warmed"], WARMER)
+
+    assert cache.get_or_compute("titles", ("topic", 2), lambda: ["Fresh"]) == ["Warmed"]
+    assert cache.get_or_compute("titles", ("topic", 2), lambda: ["Fresh"]) == ["Fresh"]
+
+
+def test_warmer_skips_decks_whose_titles_call_failed():
+    calls = []
+
+    def failing_titles(topic, num_slides, retry_budget, source):
+        raise ValueError("AI returned 0 slides")
+
+    stages = {
+        "titles": failing_titles,
+        "enrichment": lambda *args: calls.append("enrichment"),
+        "slide": lambda *args: calls.append("slide"),
+    }
+    warmer = CacheWarmer(GenerationCache(namespace=uuid.uuid4().hex), stages, defaults={})
+    warmer.candidates = lambda: [
+        {"topic": "Solar power", "num_slides": 2, "requests": 3, "audience": "All", "duration": 10, "purpose": ""}
+    ]
+
+    report = warmer.run()
+
+    assert calls == []
+    assert report["decks"][0]["complete"] is False
+    assert report["decks"][0]["skipped"] == "titles call failed"
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.cancellation import PIPELINE_FAILED, RequestCancelled, check_cancelled
+from backend.db_handler import retrieve_deck_state
+from backend.large_deck import plan_sections, run_windowed
+from backend.main import app
+
+
+def test_sections_are_balanced():
+    assert plan_sections(25, section_size=10) == [(0, 9), (9, 8), (17, 8)]
+    assert plan_sections(3, section_size=10) == [(0, 3)]
+
+
+def test_results_are_consumed_in_job_order_within_the_window():
+    outstanding, peak, lock = [0], [0], threading.Lock()
+
+    def job(i):
+        def run():
+            time.sleep(0.01 * (i % 3))
+            return i
+        return run
+
+    def jobs():
+        for i in range(20):
+            with lock:
+                outstanding[0] += 1
+                peak[0] = max(peak[0], outstanding[0])
+            yield job(i)
+
+    consumed = []
+
+    def on_result(i):
+        with lock:
+            outstanding[0] -= 1
+        consumed.append(i)
+
+    assert run_windowed(jobs(), on_result, window=4, max_workers=4) == 20
+    assert consumed == list(range(20))
+    assert peak[0] <= 5  # The window plus the job being submitted.
+
+
+def test_failure_aborts_jobs_still_running():
+    started, outcome = threading.Event(), []
+
+    def long_job():
+        started.set()
+        try:
+            for _ in range(200):
+                check_cancelled()
+                time.sleep(0.01)
+            outcome.append("finished")
+        except RequestCancelled as e:
+            outcome.append(e.reason)
+
+    def failing_job():
+        started.wait(1)
+        raise ValueError("slide failed")
+
+    def on_result(_):
+        pass
+
+    with pytest.raises(ValueError):
+        run_windowed(iter([failing_job, long_job]), on_result, window=4, max_workers=2)
+    deadline = time.monotonic() + 1
+    while not outcome and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert outcome == [PIPELINE_FAILED]
+
+
+def test_large_deck_stores_its_state_for_regeneration():
+    with TestClient(app) as client:
+        response = client.post("/generate_ppt", json={"topic": "Large deck state", "num_slides": 23, "large_deck": True})
+    assert response.status_code == 200, response.text
+
+    state = retrieve_deck_state(response.json()["deck_id"])
+    assert len(state["titles"]) == len(state["slides"]) == 23
+    assert all(isinstance(body, str) and body for body in state["slides"])
+    assert state["refined_prompt"].startswith("Section 1")
@@ -0,0 +1,101 @@
+import os
+import time
+
+from backend.file_hash import file_content_hash
+from backend.main import write_output
+from backend.output_lifecycle import OutputLifecycle, output_lifecycle
+from backend.thumbnails import ThumbnailService
+
+HOUR = 3600
+
+
+def _deck(directory, name, size, age_s=0):
+    path = directory / name
+    path.write_bytes(os.urandom(size))
+    stamp = time.time() - age_s
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def _thumbnails(service, deck_path, size, age_s=0):
+    folder = service.cache_dir / file_content_hash(deck_path)
+    folder.mkdir(parents=True)
+    (folder / "slide-1.png").write_bytes(b"x" * size)
+    stamp = time.time() - age_s
+    os.utime(folder, (stamp, stamp))
+    return folder
+
+
+def test_decks_expire_after_ttl(tmp_path):
+    old = _deck(tmp_path, "old.pptx", 10, age_s=2 * HOUR)
+    fresh = _deck(tmp_path, "fresh.pptx", 10)
+    lifecycle = OutputLifecycle(directory=tmp_path, ttl_hours=1, quota_mb=0, thumbnails=None)
+
+    assert lifecycle.sweep() == {"expired": 1, "over_quota": 0}
+    assert not old.exists() and fresh.exists()
+    assert lifecycle.metrics()["files"] == 1
+
+
+def test_quota_evicts_least_recently_downloaded_first(tmp_path):
+    for age, name in ((3, "a.pptx"), (2, "b.pptx"), (1, "c.pptx")):
+        _deck(tmp_path, name, 100, age_s=age * 60)
+    lifecycle = OutputLifecycle(directory=tmp_path, ttl_hours=0, quota_mb=250 / 1024 / 1024, thumbnails=None)
+    lifecycle.touch("a.pptx")  # Downloaded now: b is the least recently used.
+
+    assert lifecycle.sweep() == {"expired": 0, "over_quota": 1}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.pptx", "c.pptx"]
+    assert lifecycle.metrics()["bytes"] == 200
+
+
+def test_overwrite_replaces_the_previous_size():
+    lifecycle = OutputLifecycle(thumbnails=None)
+    lifecycle.record_write(lifecycle.directory / "deck.pptx", 100)
+    lifecycle.record_write(lifecycle.directory / "deck.pptx", 120, replaced_size=100)
+
+    assert lifecycle.metrics()["files"] == 1
+    assert lifecycle.metrics()["bytes"] == 120
+
+
+def test_write_output_accounts_an_overwrite_once(tmp_path):
+    path = tmp_path / "deck.pptx"
+    write_output(path, b"x" * 100)
+    before = output_lifecycle.metrics()
+
+    write_output(path, b"x" * 40)
+
+    after = output_lifecycle.metrics()
+    assert after["files"] == before["files"]
+    assert after["bytes"] == before["bytes"] - 60
+
+
+def test_thumbnails_count_towards_quota_and_go_with_their_deck(tmp_path):
+    service = ThumbnailService(cache_dir=tmp_path / "thumbnails")
+    old = _deck(tmp_path, "old.pptx", 100, age_s=120)
+    new = _deck(tmp_path, "new.pptx", 100)
+    old_thumbs = _thumbnails(service, old, 100)
+    new_thumbs = _thumbnails(service, new, 100)
+    service._ready[old_thumbs.name] = 1
+    lifecycle = OutputLifecycle(directory=tmp_path, ttl_hours=0, quota_mb=300 / 1024 / 1024, thumbnails=service)
+
+    assert lifecycle.sweep() == {"expired": 0, "over_quota": 1}
+    assert not old.exists() and not old_thumbs.exists()
+    assert new.exists() and new_thumbs.exists()
+    assert old_thumbs.name not in service._ready
+    assert lifecycle.metrics()["bytes"] == 200
+
+
+def test_orphaned_thumbnails_are_removed_once_stale(tmp_path):
+    service = ThumbnailService(cache_dir=tmp_path / "thumbnails")
+    stale = _thumbnails(service, _deck(tmp_path, "stale.pptx", 10), 10, age_s=2 * HOUR)
+    recent = _thumbnails(service, _deck(tmp_path, "recent.pptx", 20), 10)
+    work_dir = service.cache_dir / "thumbs-render"
+    work_dir.mkdir()
+    (tmp_path / "stale.pptx").unlink()
+    (tmp_path / "recent.pptx").unlink()
+    lifecycle = OutputLifecycle(directory=tmp_path, ttl_hours=0, quota_mb=0, thumbnails=service)
+
+    lifecycle.sweep()
+
+    assert not stale.exists()
+    assert recent.exists() and work_dir.exists()
+    assert lifecycle.metrics()["thumbnails_removed"] == 1
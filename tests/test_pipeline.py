@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from backend.cancellation import PIPELINE_FAILED, RequestCancelled, check_cancelled
+from backend.pipeline import Pipeline
+
+
+def test_stage_receives_dependency_results_in_order():
+    pipeline = Pipeline()
+    pipeline.add_stage("a", lambda: 2)
+    pipeline.add_stage("b", lambda: 3)
+    pipeline.add_stage("c", lambda b, a: (b, a), deps=("b", "a"))
+
+    result = pipeline.run()
+
+    assert result.results == {"a": 2, "b": 3, "c": (3, 2)}
+
+
+def test_stage_starts_only_after_all_dependencies_finished():
+    finished = []
+
+    def stage(name, delay):
+        def run(*_):
+            time.sleep(delay)
+            finished.append(name)
+            return name
+        return run
+
+    pipeline = Pipeline()
+    pipeline.add_stage("slow", stage("slow", 0.05))
+    pipeline.add_stage("fast", stage("fast", 0))
+    pipeline.add_stage("join", stage("join", 0), deps=("slow", "fast"))
+
+    result = pipeline.run()
+
+    assert finished.index("join") == 2
+    assert result.timings["join"]["start_ms"] >= result.timings["slow"]["end_ms"]
+    assert result.critical_path() == ["slow", "join"]
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+    pipeline = Pipeline(max_workers=3)
+    for name in ("a", "b", "c"):
+        pipeline.add_stage(name, barrier.wait)  # Deadlocks (BrokenBarrierError) unless all three overlap.
+
+    assert sorted(pipeline.run().results) == ["a", "b", "c"]
+
+
+def test_unknown_or_duplicate_stages_are_rejected():
+    pipeline = Pipeline().add_stage("a", lambda: 1)
+    with pytest.raises(ValueError):
+        pipeline.add_stage("a", lambda: 1)
+    with pytest.raises(ValueError):
+        pipeline.add_stage("b", lambda x: x, deps=("missing",))
+
+
+def test_failure_propagates_and_skips_dependents():
+    ran = []
+    pipeline = Pipeline()
+    pipeline.add_stage("boom", lambda: 1 / 0)
+    pipeline.add_stage("after", lambda _: ran.append("after"), deps=("boom",))
+
+    with pytest.raises(ZeroDivisionError):
+        pipeline.run()
+    assert ran == []
+
+
+def test_failure_cancels_stages_still_running():
+    started, outcome = threading.Event(), []
+
+    def long_stage():
+        started.set()
+        try:
+            for _ in range(200):
+                check_cancelled()
+                time.sleep(0.01)
+            outcome.append("finished")
+        except RequestCancelled as e:
+            outcome.append(e.reason)
+
+    def failing_stage():
+        started.wait(1)
+        raise ValueError("slide failed")
+
+    pipeline = Pipeline()
+    pipeline.add_stage("long", long_stage)
+    pipeline.add_stage("failing", failing_stage)
+
+    with pytest.raises(ValueError):
+        pipeline.run()
+    deadline = time.monotonic() + 1
+    while not outcome and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert outcome == [PIPELINE_FAILED]
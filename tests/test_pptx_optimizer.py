@@ -0,0 +1,29 @@
+import io
+
+from pptx import Presentation
+
+from backend.deck_builder import add_content_slide
+from backend.pptx_optimizer import save_optimized
+
+
+def _deck(slides=3):
+    prs = Presentation()
+    for i in range(slides):
+        add_content_slide(prs, f"Slide {i + 1}", "- first point\n- second point")
+    return prs
+
+
+def test_savings_are_not_measured_by_default():
+    data, report = save_optimized(_deck())
+
+    assert report["original_bytes"] is None and report["bytes_saved"] is None
+    assert report["optimized_bytes"] == len(data)
+
+
+def test_optimized_deck_is_smaller_and_keeps_its_slides():
+    data, report = save_optimized(_deck(), measure_savings=True)
+
+    assert report["bytes_saved"] > 0
+    assert report["layouts_removed"] > 0
+    prs = Presentation(io.BytesIO(data))
+    assert [slide.shapes.title.text for slide in prs.slides] == ["Slide 1", "Slide 2", "Slide 3"]
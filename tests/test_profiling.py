@@ -0,0 +1,85 @@
+import contextvars
+import threading
+import uuid
+
+from fastapi.testclient import TestClient
+
+from backend import profiling
+from backend.main import app
+from backend.profiling import list_profiles, profile_path, profile_request, profiled_call
+
+client = TestClient(app)
+
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+
+def _profiled_request(work=lambda: _busy(10_000)):
+    request_id = uuid.uuid4().hex
+    with profile_request(request_id, requested=True, sample_rate=1.0) as profile:
+        assert profile is not None
+        profiled_call(work)
+    return request_id, profile
+
+
+def test_profile_is_saved_only_when_requested_and_sampled():
+    with profile_request(uuid.uuid4().hex, requested=False) as profile:
+        assert profile is None
+    with profile_request(uuid.uuid4().hex, requested=True, sample_rate=0.0) as profile:
+        assert profile is None
+
+    request_id, profile = _profiled_request()
+
+    assert profile.saved_path == profile_path(request_id)
+    assert request_id in [entry["request_id"] for entry in list_profiles()]
+
+
+def test_only_one_request_is_profiled_at_a_time():
+    with profile_request(uuid.uuid4().hex, requested=True, sample_rate=1.0) as first:
+        with profile_request(uuid.uuid4().hex, requested=True, sample_rate=1.0) as second:
+            assert first is not None and second is None
+
+
+def test_work_of_every_thread_is_merged():
+    def work():
+        # Pipeline stages copy the request's context into their threads the same way.
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(profiled_call, _busy, 10_000))
+        thread.start()
+        thread.join()
+
+    request_id, _ = _profiled_request(lambda: profiled_call(work))  # Nested calls are profiled once.
+
+    summary = client.get(f"/profiles/{request_id}/summary").text
+    assert "_busy" in summary
+
+
+def test_calls_left_unprofiled_are_noted_in_the_output(monkeypatch):
+    class BusyProfiler:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    request_id = uuid.uuid4().hex
+    with profile_request(request_id, requested=True, sample_rate=1.0) as profile:
+        profile.add_stats({("app.py", 1, "render"): (1, 1, 0.1, 0.1, {})})
+        monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfiler)
+        assert profiled_call(_busy, 10) == 285
+    monkeypatch.undo()
+
+    assert profile.unprofiled_calls == 1
+    entry = next(entry for entry in list_profiles() if entry["request_id"] == request_id)
+    assert any("1 call(s)" in note for note in entry["notes"])
+    assert "⚠️ 1 call(s)" in client.get(f"/profiles/{request_id}/summary").text
+
+
+def test_profile_endpoints():
+    request_id, _ = _profiled_request()
+
+    assert request_id in [entry["request_id"] for entry in client.get("/profiles").json()["profiles"]]
+    download = client.get(f"/profiles/{request_id}")
+    assert download.status_code == 200 and download.content == profile_path(request_id).read_bytes()
+    summary = client.get(f"/profiles/{request_id}/summary", params={"sort": "tottime", "limit": 5})
+    assert summary.status_code == 200 and "function calls" in summary.text
+
+    assert client.get(f"/profiles/{uuid.uuid4().hex}").status_code == 404
+    assert client.get("/profiles/not-a-request-id/summary").status_code == 404
@@ -0,0 +1,123 @@
+import threading
+import time
+
+from backend.cancellation import CancelToken, RequestCancelled, current_cancellation
+from backend.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, func, callers, cancel_tokens=None):
+    """Starts `callers` threads calling flight.do(key, func); returns their (result or error, shared)."""
+    outcomes = [None] * callers
+
+    def call(i):
+        token = cancel_tokens[i] if cancel_tokens else None
+        try:
+            outcomes[i] = flight.do(key, func, token)
+        except BaseException as e:
+            outcomes[i] = (e, None)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def _wait_for_followers(flight, followers):
+    deadline = time.monotonic() + 2
+    while flight.metrics()["waiting_followers"] < followers and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight, release, executions = SingleFlight(), threading.Event(), []
+
+    def work():
+        executions.append(1)
+        release.wait(2)
+        return {"deck": "shared"}
+
+    threads, outcomes = _run_concurrently(flight, "key", work, 4)
+    _wait_for_followers(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(executions) == 1
+    assert all(result is outcomes[0][0] for result, _ in outcomes)
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True]
+    assert flight.metrics()["coalesced_requests"] == 3
+
+
+def test_concurrent_callers_share_one_exception():
+    flight, release = SingleFlight(), threading.Event()
+    error = RuntimeError("generation failed")
+
+    def work():
+        release.wait(2)
+        raise error
+
+    threads, outcomes = _run_concurrently(flight, "key", work, 3)
+    _wait_for_followers(flight, 2)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert [outcome[0] for outcome in outcomes] == [error, error, error]
+    assert flight.metrics()["executions"] == 1
+
+
+def test_finished_calls_are_not_cached():
+    flight, calls = SingleFlight(), []
+    assert flight.do("key", lambda: calls.append(1) or len(calls)) == (1, False)
+    assert flight.do("key", lambda: calls.append(1) or len(calls)) == (2, False)
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: "a") == ("a", False)
+    assert flight.do("b", lambda: "b") == ("b", False)
+    assert flight.metrics()["executions"] == 2
+
+
+def test_cancelled_follower_stops_waiting_while_leader_continues():
+    flight, release = SingleFlight(), threading.Event()
+    leader_token, follower_token = CancelToken(), CancelToken()
+
+    def work():
+        release.wait(2)
+        return "deck"
+
+    threads, outcomes = _run_concurrently(flight, "key", work, 2, [leader_token, follower_token])
+    _wait_for_followers(flight, 1)
+    follower_token.cancel()
+    time.sleep(0.3)  # Followers poll their token every 0.2 s.
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    results = sorted(outcomes, key=lambda outcome: isinstance(outcome[0], RequestCancelled))
+    assert results[0] == ("deck", False)
+    assert isinstance(results[1][0], RequestCancelled)
+    assert flight.metrics()["abandoned_followers"] == 1
+
+
+def test_execution_is_cancelled_only_once_every_caller_cancelled():
+    flight, release, reasons = SingleFlight(), threading.Event(), []
+    tokens = [CancelToken(), CancelToken()]
+
+    def work():
+        scope = current_cancellation.get()
+        release.wait(2)
+        reasons.append(scope.reason)
+        tokens[1].cancel()
+        reasons.append(scope.reason)
+        return "deck"
+
+    threads, _ = _run_concurrently(flight, "key", work, 2, tokens)
+    _wait_for_followers(flight, 1)
+    tokens[0].cancel()
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert reasons == [None, "client disconnected"]
@@ -0,0 +1,113 @@
+"""
+Golden-output tests of the compiled text pipeline (backend/text_pipeline.py).
+
+The per-paragraph helpers it replaced in backend/format_ppt.py are kept verbatim below as the
+reference; on a fixed corpus (hand-picked edge cases plus seeded random paragraphs built from
+slide-like words and every clean-up marker) both must produce identical output.
+"""
+import random
+import re
+
+import pytest
+
+from backend import text_pipeline
+
+
+# ---------------------- 📜 LEGACY IMPLEMENTATION (golden reference) ----------------------
+def legacy_is_subheader(text):
+    subheader_keywords = ["Introduction", "Overview", "Impact", "Analysis", "Examples", "Benefits", "Challenges", "Trends", "Case Studies", "Conclusion"]
+    return any(keyword in text for keyword in subheader_keywords) or (len(text) < 50 and ":" in text)
+
+
+def legacy_apply_smart_bulleting(text):
+    text = text.strip()
+    if not text:
+        return text
+    if text.startswith("-") or text.startswith("•") or text.startswith("Numbers"):
+        return text  # Already formatted
+
+    return f"• {text}"
+
+
+def legacy_clean_slide_text(text):
+    text = re.sub(r"\b(Sure! Here's your slide:|Feel free to customize|Let's proceed with|If needed, you can).*", "", text).strip()
+    text = re.sub(r"\b(Numbers|Dots|Checkmarks)\s\b", "", text).strip()
+    text = re.sub(r"(\*\*Visual Enhancements:\*\*|➤ Suggestions:).*", "", text, flags=re.IGNORECASE).strip()
+    text = text.replace("---", "──────────")  # AI section separator
+
+    return text.strip()
+
+
+def legacy_summarize_text_if_needed(text):
+    if len(text.split()) > 50:  # ✅ Summarize if text is too long
+        text = " ".join(text.split()[:50]) + "..."  # Truncate and indicate continuation
+    return text
+
+
+def legacy_process_paragraph(text):
+    text = legacy_clean_slide_text(text)
+    text = legacy_summarize_text_if_needed(text)
+    text = legacy_apply_smart_bulleting(text)
+    return text, legacy_is_subheader(text)
+
+
+# ---------------------- 🧪 CORPUS ----------------------
+EDGE_CASES = [
+    "", "   ", "\t\n", "-", "•", "Numbers", "Numbers 1, 2, 3", "- already a bullet", "• already a bullet",
+    "Overview: why this matters", "Key points:", "A" * 49 + ":", "A" * 50 + ":", "Case Studies",
+    "case studies in lowercase", "Sure! Here's your slide: Intro to AI", "Intro. Sure! Here's your slide: x",
+    "Feel free to customize this slide", "Let's proceed with slide 2", "If needed, you can add charts",
+    "Use Numbers for the list", "Dots and Checkmarks everywhere", "Numbers Dots Checkmarks ",
+    "NumbersDots", "Checkmarks\tstyle", "**Visual Enhancements:** add an icon", "**visual enhancements:** lower",
+    "Tip ➤ Suggestions: use a chart", "➤ suggestions: lowercase", "Section --- break", "------",
+    "Line one\vLine two with Impact", "Trailing spaces   ", "   Leading spaces",
+    "Emoji 🚀 Benefits of adoption", "Ünïcödé Analysis: ok", "word " * 51, "word " * 50,
+    "Numbers ➤ Suggestions: combined", "➤ Numbers Suggestions: reordered", "x**Visual Enhancements:**y",
+]
+
+WORDS = (
+    "AI", "risk", "model", "data", "customer", "banking", "growth", "costs", "automation", "team",
+    "Overview", "Impact", "Benefits", "Challenges", "Trends", "Conclusion", "Examples", "Analysis",
+    "Introduction", "Case", "Studies", "Numbers", "Dots", "Checkmarks", "---", ":", "-", "•",
+    "Sure! Here's your slide:", "Feel free to customize", "Let's proceed with", "If needed, you can",
+    "**Visual Enhancements:**", "➤ Suggestions:", "➤ suggestions:", "\v", "  ", "\t",
+)
+
+
+def build_corpus(num_paragraphs, seed=7):
+    """The edge cases topped up with seeded random paragraphs; the same for a given seed."""
+    rng = random.Random(seed)
+    corpus = list(EDGE_CASES)
+    while len(corpus) < num_paragraphs:
+        length = rng.choice((1, 2, 3, 5, 8, 12, 20, 40, 55, 80))
+        words = [rng.choice(WORDS) for _ in range(length)]
+        text = " ".join(words) if rng.random() < 0.8 else "".join(words)
+        if rng.random() < 0.2:
+            text = f"  {text}  "
+        corpus.append(text)
+    return corpus
+
+
+CORPUS = build_corpus(2000)
+
+
+# ---------------------- ✅ GOLDEN CHECKS ----------------------
+@pytest.mark.parametrize("legacy, compiled", [
+    (legacy_clean_slide_text, text_pipeline.clean_text),
+    (legacy_summarize_text_if_needed, text_pipeline.summarize_text),
+    (legacy_apply_smart_bulleting, text_pipeline.bulletize),
+    (legacy_is_subheader, text_pipeline.is_subheader),
+    (legacy_process_paragraph, text_pipeline.process_paragraph),
+], ids=["clean_text", "summarize_text", "bulletize", "is_subheader", "process_paragraph"])
+def test_matches_legacy_helper(legacy, compiled):
+    mismatches = [(text, legacy(text), compiled(text)) for text in CORPUS if legacy(text) != compiled(text)]
+    assert not mismatches, f"{len(mismatches)} differences, first: {mismatches[0]!r}"
+
+
+def test_batch_matches_legacy_per_paragraph():
+    assert text_pipeline.process_paragraphs(CORPUS) == [legacy_process_paragraph(text) for text in CORPUS]
+
+
+def test_batch_keeps_order_of_repeated_paragraphs():
+    texts = ["Overview", "plain text", "Overview", "", "plain text"]
+    assert text_pipeline.process_paragraphs(texts) == [text_pipeline.process_paragraph(text) for text in texts]
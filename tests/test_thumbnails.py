@@ -0,0 +1,81 @@
+import time
+
+from backend import thumbnails
+from backend.config import OUTPUT_DIR, THUMBNAIL_CACHE_DIR
+from backend.thumbnails import FAILED, PENDING, READY, ThumbnailService
+
+
+def _wait_while_pending(service, deck):
+    deadline = time.monotonic() + 2
+    status = PENDING
+    while status == PENDING and time.monotonic() < deadline:
+        time.sleep(0.01)
+        status = service.lookup(deck)[0]
+    return status
+
+
+def test_failed_render_is_retried_after_backoff(tmp_path):
+    deck = tmp_path / "deck.pptx"
+    deck.write_bytes(b"deck")
+    outcomes = [RuntimeError("soffice timed out"), 3]
+
+    def convert(file_path, deck_hash):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    service = ThumbnailService(cache_dir=tmp_path / "thumbs", retry_s=0.2)
+    service._available = True
+    service._convert = convert
+    try:
+        assert service.lookup(deck)[0] == PENDING
+        assert _wait_while_pending(service, deck) == FAILED
+        assert service.lookup(deck)[0] == FAILED  # Still backing off.
+
+        time.sleep(0.25)
+        assert service.lookup(deck)[0] == PENDING
+        assert _wait_while_pending(service, deck) == READY
+        assert service.lookup(deck)[2] == 3
+    finally:
+        service.shutdown()
+
+
+def test_backoff_doubles_per_consecutive_failure(tmp_path):
+    deck = tmp_path / "deck.pptx"
+    deck.write_bytes(b"deck")
+    service = ThumbnailService(cache_dir=tmp_path / "thumbs", retry_s=10, retry_max_s=25)
+    service._convert = lambda file_path, deck_hash: 1 / 0
+
+    delays = []
+    for _ in range(3):
+        service._render(deck, "hash")
+        delays.append(round(service._failed["hash"][0] - time.monotonic()))
+    assert delays == [10, 20, 25]
+
+
+def test_cache_dir_defaults_below_the_output_directory():
+    assert THUMBNAIL_CACHE_DIR == OUTPUT_DIR / "thumbnails"
+
+
+def test_forget_drops_ready_and_failed_state(tmp_path):
+    service = ThumbnailService(cache_dir=tmp_path / "thumbs")
+    service._convert = lambda file_path, deck_hash: 1 / 0
+    service._render(tmp_path / "deck.pptx", "failed")
+    service._ready["ready"] = 2
+
+    service.forget("failed")
+    service.forget("ready")
+
+    assert service._failed == {} and service._ready == {}
+
+
+def test_tracked_decks_are_capped_oldest_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, "_MAX_TRACKED_DECKS", 2)
+    service = ThumbnailService(cache_dir=tmp_path / "thumbs")
+    service._convert = lambda file_path, deck_hash: 1
+
+    for deck_hash in ("a", "b", "c"):
+        service._render(tmp_path / "deck.pptx", deck_hash)
+
+    assert list(service._ready) == ["b", "c"]